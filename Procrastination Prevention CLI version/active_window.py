@@ -0,0 +1,86 @@
+# active_window.py
+import importlib.util
+import platform
+
+# X11 window lookup (Linux); python-xlib itself is only imported on the first lookup
+has_xlib = importlib.util.find_spec("Xlib") is not None
+
+
+class ActiveWindowLocator:
+    """Find the screen rectangle of the focused window"""
+
+    def __init__(self, margin=16):
+        self.margin = margin  # Extra pixels around the window to keep tabs/title bars
+        self.lookups = 0
+        self.fallbacks = 0
+        self._display = None
+
+    def region(self, screen_size):
+        """Return (left, top, width, height) of the active window plus margin, or None"""
+        self.lookups += 1
+        try:
+            if platform.system() == "Windows":
+                rect = self._windows_rect()
+            elif has_xlib:
+                rect = self._x11_rect()
+            else:
+                rect = None
+        except Exception:
+            rect = None
+
+        if rect is None:
+            self.fallbacks += 1
+            return None
+
+        # Grow by the margin and clamp to the visible screen
+        screen_width, screen_height = screen_size
+        left = max(0, rect[0] - self.margin)
+        top = max(0, rect[1] - self.margin)
+        right = min(screen_width, rect[0] + rect[2] + self.margin)
+        bottom = min(screen_height, rect[1] + rect[3] + self.margin)
+        if right - left < 50 or bottom - top < 50:
+            # Minimized, off-screen or a tiny tooltip-like window
+            self.fallbacks += 1
+            return None
+        return (left, top, right - left, bottom - top)
+
+    def _x11_rect(self):
+        """Geometry of _NET_ACTIVE_WINDOW including window manager decorations"""
+        from Xlib import X, display as xdisplay
+        if self._display is None:
+            self._display = xdisplay.Display()
+        root = self._display.screen().root
+
+        active = root.get_full_property(self._display.intern_atom("_NET_ACTIVE_WINDOW"), X.AnyPropertyType)
+        if not active or not active.value or not active.value[0]:
+            return None
+        window = self._display.create_resource_object("window", active.value[0])
+
+        geometry = window.get_geometry()
+        origin = root.translate_coords(window, 0, 0)
+        x, y, width, height = origin.x, origin.y, geometry.width, geometry.height
+
+        # Include the title bar, which usually carries the page/document title
+        extents = window.get_full_property(self._display.intern_atom("_NET_FRAME_EXTENTS"), X.AnyPropertyType)
+        if extents and len(extents.value) == 4:
+            left, right, top, bottom = extents.value
+            x, y = x - left, y - top
+            width, height = width + left + right, height + top + bottom
+        return (x, y, width, height)
+
+    def _windows_rect(self):
+        """Geometry of the foreground window via the Win32 API"""
+        import ctypes
+        from ctypes import wintypes
+
+        user32 = ctypes.windll.user32
+        hwnd = user32.GetForegroundWindow()
+        if not hwnd:
+            return None
+        rect = wintypes.RECT()
+        if not user32.GetWindowRect(hwnd, ctypes.byref(rect)):
+            return None
+        return (rect.left, rect.top, rect.right - rect.left, rect.bottom - rect.top)
+
+    def stats(self):
+        return {"lookups": self.lookups, "fallbacks": self.fallbacks}
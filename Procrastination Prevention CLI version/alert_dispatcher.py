@@ -0,0 +1,137 @@
+# alert_dispatcher.py
+import queue
+import threading
+import time
+
+from verdict_cache import normalize_text
+
+SEVERITIES = ("low", "medium", "high")
+
+# Minimum seconds between two deliveries on a channel
+DEFAULT_RATE_LIMITS = {
+    "console": 0,
+    "sound": 5,
+    "popup": 5,
+    "notification": 30
+}
+
+
+class AlertDispatcher:
+    """Alert stage that runs off the monitoring loop
+
+    Repeats of the same activity and reason within the window are coalesced.
+    Every escalate_after repeats bump the severity one level, and only that
+    escalation is re-delivered, plus one reminder per window while the
+    distraction lasts. Each channel then has its own rate limit, so a burst
+    can't fire a stack of sounds or notifications.
+    """
+
+    def __init__(self, channels, window=60.0, escalate_after=3, rate_limits=None, clock=time.monotonic,
+                 metrics=None):
+        self.channels = channels  # name -> callable(alert), called in order
+        self.metrics = metrics    # MetricsRegistry timing each channel as alert_<name>
+        self.window = window
+        self.escalate_after = escalate_after
+        self.rate_limits = dict(DEFAULT_RATE_LIMITS, **(rate_limits or {}))
+        self.clock = clock
+        self.recent = {}  # (activity, reason) -> repeat state, pruned once the window passes
+        self.last_delivery = {}
+        self.received = 0
+        self.coalesced = 0
+        self.escalated = 0
+        self.delivered = {name: 0 for name in channels}
+        self.suppressed = {name: 0 for name in channels}
+        self._queue = queue.SimpleQueue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def remove_channel(self, name):
+        """Drop a channel turned off for the session, e.g. --no-sound, so it isn't counted"""
+        for table in (self.channels, self.delivered, self.suppressed):
+            table.pop(name, None)
+
+    def submit(self, result, activity):
+        """Hand an alert to the dispatcher thread; returns immediately"""
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="alerts", daemon=True)
+                self._thread.start()
+        self._queue.put((result, activity))
+
+    def close(self, timeout=2.0):
+        """Deliver what's already queued, then stop the thread"""
+        with self._lock:
+            thread = self._thread
+        if thread is None:
+            return
+        self._queue.put(None)
+        thread.join(timeout)
+
+    def _run(self):
+        while True:
+            event = self._queue.get()
+            if event is None:
+                return
+            try:
+                self.handle(*event)
+            except Exception as e:
+                print(f"Alert error: {str(e)}")
+
+    def handle(self, result, activity):
+        """Coalesce, escalate and rate-limit one alert; returns the alert delivered, or None"""
+        now = self.clock()
+        self.received += 1
+        self._prune(now)
+
+        key = (normalize_text(activity.get("name")), normalize_text(result.get("reason")))
+        base_level = SEVERITIES.index(result.get("severity")) if result.get("severity") in SEVERITIES else 1
+        state = self.recent.get(key)
+        if state is None:
+            state = self.recent[key] = {"count": 0, "level": base_level, "since": now, "alerted": now}
+        state["count"] += 1
+        state["last"] = now
+
+        if state["count"] > 1:
+            level = min(base_level + (state["count"] - 1) // self.escalate_after, len(SEVERITIES) - 1)
+            if level > state["level"]:
+                state["level"] = level
+                self.escalated += 1
+            elif now - state["alerted"] < self.window:
+                self.coalesced += 1
+                return None
+            state["alerted"] = now
+
+        alert = dict(result, severity=SEVERITIES[state["level"]], repeats=state["count"],
+                     repeat_seconds=round(now - state["since"]))
+        self.deliver(alert, now)
+        return alert
+
+    def deliver(self, alert, now):
+        for name, channel in self.channels.items():
+            last = self.last_delivery.get(name)
+            if last is not None and now - last < self.rate_limits.get(name, 0):
+                self.suppressed[name] += 1
+                continue
+            self.last_delivery[name] = now
+            started = time.perf_counter()
+            try:
+                channel(alert)
+                self.delivered[name] += 1
+            except Exception as e:
+                print(f"Alert channel {name} error: {str(e)}")
+            if self.metrics:
+                self.metrics.observe(f"alert_{name}", time.perf_counter() - started)
+
+    def _prune(self, now):
+        expired = [key for key, state in self.recent.items() if now - state["last"] > self.window]
+        for key in expired:
+            del self.recent[key]
+
+    def stats(self):
+        return {
+            "received": self.received,
+            "coalesced": self.coalesced,
+            "escalated": self.escalated,
+            "delivered": dict(self.delivered),
+            "suppressed": dict(self.suppressed)
+        }
@@ -0,0 +1,148 @@
+# alert_sound.py
+import io
+import os
+import queue
+import threading
+import wave
+
+import numpy as np
+
+SAMPLE_RATE = 44100
+
+# Different frequencies based on severity
+FREQUENCIES = {
+    "low": 440,     # A4 note
+    "medium": 880,  # A5 note
+    "high": 1760    # A6 note
+}
+
+
+def synthesize_tone(frequency, duration=0.5, sample_rate=SAMPLE_RATE, volume=0.5, fade=0.01):
+    """16-bit mono PCM sine wave with short linear fades so it starts and stops without a click"""
+    t = np.arange(int(duration * sample_rate)) / sample_rate
+    samples = np.sin(2 * np.pi * frequency * t) * volume
+    fade_samples = min(int(fade * sample_rate), len(samples) // 2)
+    if fade_samples:
+        ramp = np.linspace(0.0, 1.0, fade_samples)
+        samples[:fade_samples] *= ramp
+        samples[-fade_samples:] *= ramp[::-1]
+    return (samples * 32767).astype("<i2").tobytes()
+
+
+def wav_bytes(pcm, sample_rate=SAMPLE_RATE):
+    """Wrap raw PCM in a WAV container"""
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(sample_rate)
+        f.writeframes(pcm)
+    return buffer.getvalue()
+
+
+class WinsoundBackend:
+    name = "winsound"
+
+    def __init__(self, winsound, tones):
+        self.winsound = winsound
+        self.wavs = {severity: wav_bytes(pcm) for severity, pcm in tones.items()}
+
+    def play(self, severity):
+        self.winsound.PlaySound(self.wavs[severity], self.winsound.SND_MEMORY)
+
+
+class PydubBackend:
+    name = "pydub"
+
+    def __init__(self, pydub, tones):
+        self.play_segment = pydub.playback.play
+        self.segments = {severity: pydub.AudioSegment(data=pcm, sample_width=2, frame_rate=SAMPLE_RATE, channels=1)
+                         for severity, pcm in tones.items()}
+
+    def play(self, severity):
+        self.play_segment(self.segments[severity])
+
+
+class WavFileBackend:
+    """Writes every played tone to a numbered .wav file, for checking alerts on a headless machine"""
+
+    name = "wav"
+
+    def __init__(self, directory, tones):
+        self.directory = directory
+        self.wavs = {severity: wav_bytes(pcm) for severity, pcm in tones.items()}
+        self.count = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def play(self, severity):
+        self.count += 1
+        with open(os.path.join(self.directory, f"alert_{self.count:04d}_{severity}.wav"), "wb") as f:
+            f.write(self.wavs[severity])
+
+
+class BellBackend:
+    """Fallback for Unix-like systems using the terminal bell"""
+
+    name = "bell"
+
+    def play(self, severity):
+        print('\a', end="", flush=True)
+
+
+class AudioWorker:
+    """Plays tones on a background thread so alerts never hold up the monitoring loop"""
+
+    def __init__(self, backend, max_pending=2):
+        self.backend = backend
+        self.played = 0
+        self.dropped = 0
+        self.errors = 0
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._thread = threading.Thread(target=self._run, name="audio", daemon=True)
+        self._thread.start()
+
+    def play(self, severity="medium"):
+        """Queue a tone; if tones are already backed up, this one is dropped rather than queued"""
+        if severity not in FREQUENCIES:
+            severity = "medium"
+        try:
+            self._queue.put_nowait(severity)
+        except queue.Full:
+            self.dropped += 1
+
+    def _run(self):
+        while True:
+            severity = self._queue.get()
+            if severity is None:
+                return
+            try:
+                self.backend.play(severity)
+                self.played += 1
+            except Exception as e:
+                self.errors += 1
+                print(f"Sound error: {str(e)}")
+
+    def close(self, timeout=2.0):
+        """Let queued tones finish, then stop the thread"""
+        try:
+            self._queue.put(None, timeout=timeout)
+        except queue.Full:
+            return
+        self._thread.join(timeout)
+
+    def stats(self):
+        return {"backend": self.backend.name, "played": self.played,
+                "dropped": self.dropped, "errors": self.errors}
+
+
+def create_backend(wav_dir=None, winsound=None, pydub=None):
+    """Pick the output: a WAV directory if given, else winsound, pydub or the terminal bell"""
+    if not wav_dir and not winsound and not pydub:
+        return BellBackend()
+    # Synthesized once; every alert after this only replays a buffer
+    tones = {severity: synthesize_tone(frequency) for severity, frequency in FREQUENCIES.items()}
+    if wav_dir:
+        return WavFileBackend(wav_dir, tones)
+    if winsound:
+        return WinsoundBackend(winsound, tones)
+    return PydubBackend(pydub, tones)
@@ -0,0 +1,127 @@
+# alert_window.py
+import queue
+import threading
+
+from tracing import NULL_TRACER
+
+# Colors based on severity
+COLORS = {
+    "low": {"bg": "#FFF3CD", "fg": "#856404", "border": "#FFEEBA"},     # Yellow (warning)
+    "medium": {"bg": "#F8D7DA", "fg": "#721C24", "border": "#F5C6CB"},  # Red (danger)
+    "high": {"bg": "#CC0000", "fg": "#FFFFFF", "border": "#990000"}     # Bright Red (severe)
+}
+
+
+class AlertWindow:
+    """One long-lived Tk alert window on its own thread, fed by a queue and updated in place
+
+    Tk isn't thread-safe, so every widget is created and touched on the window
+    thread; other threads only put alerts on the queue. Alerts that pile up
+    between polls collapse into the newest one.
+    """
+
+    def __init__(self, tracer=NULL_TRACER, auto_close_ms=10000, poll_ms=50):
+        self.tracer = tracer
+        self.auto_close_ms = auto_close_ms
+        self.poll_ms = poll_ms
+        self.available = True
+        self.shown = 0
+        self.coalesced = 0
+        self._queue = queue.SimpleQueue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def show(self, title, message, severity="medium"):
+        """Queue an alert for the window; safe to call from any thread"""
+        if not self.available:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="popup", daemon=True)
+                self._thread.start()
+        self._queue.put((title, message, severity))
+
+    def close(self, timeout=1.0):
+        with self._lock:
+            thread = self._thread
+        if thread is None:
+            return
+        self._queue.put(None)
+        thread.join(timeout)
+
+    def _run(self):
+        try:
+            import tkinter as tk
+            from tkinter import font as tkFont
+            self.root = tk.Tk()
+        except Exception as e:
+            # No tkinter or no display: popups stay off rather than failing on every alert
+            self.available = False
+            print(f"Popup alerts unavailable: {str(e)}")
+            return
+
+        root = self.root
+        root.title("Focus Guardian Alert")
+        root.attributes("-topmost", True)  # Keep window on top
+        root.overrideredirect(True)  # Remove window decorations
+
+        # Set window size and position (top right corner)
+        window_width = 350
+        window_height = 200
+        x_position = root.winfo_screenwidth() - window_width - 20
+        root.geometry(f"{window_width}x{window_height}+{x_position}+40")
+
+        self.frame = tk.Frame(root, padx=3, pady=3)
+        self.frame.pack(fill="both", expand=True)
+        self.inner_frame = tk.Frame(self.frame, padx=10, pady=10)
+        self.inner_frame.pack(fill="both", expand=True)
+
+        self.title_label = tk.Label(self.inner_frame, font=tkFont.Font(family="Arial", size=14, weight="bold"))
+        self.title_label.pack(pady=(10, 5))
+        self.message_label = tk.Label(self.inner_frame, font=tkFont.Font(family="Arial", size=12),
+                                      wraplength=320, justify="center")
+        self.message_label.pack(pady=10)
+        tk.Button(self.inner_frame, text="I'll Focus Now", font=tkFont.Font(family="Arial", size=10, weight="bold"),
+                  command=root.withdraw, bg="#007BFF", fg="white",
+                  activebackground="#0069D9", activeforeground="white",
+                  padx=15, pady=5, border=0).pack(pady=10)
+
+        root.withdraw()
+        self._hide_job = None
+        root.after(self.poll_ms, self._poll)
+        root.mainloop()
+
+    def _poll(self):
+        latest = None
+        try:
+            while True:
+                item = self._queue.get_nowait()
+                if item is None:
+                    self.root.destroy()
+                    return
+                if latest is not None:
+                    self.coalesced += 1
+                latest = item
+        except queue.Empty:
+            pass
+        if latest is not None:
+            self._update(*latest)
+        self.root.after(self.poll_ms, self._poll)
+
+    def _update(self, title, message, severity):
+        """Restyle and refill the existing widgets, then bring the window up"""
+        with self.tracer.span("popup_update", severity=severity):
+            color_scheme = COLORS.get(severity, COLORS["medium"])
+            self.root.configure(bg=color_scheme["bg"])
+            self.frame.configure(bg=color_scheme["border"])
+            self.inner_frame.configure(bg=color_scheme["bg"])
+            self.title_label.configure(text=title, bg=color_scheme["bg"], fg=color_scheme["fg"])
+            self.message_label.configure(text=message, bg=color_scheme["bg"], fg=color_scheme["fg"])
+            self.root.deiconify()
+            self.root.lift()
+
+            # Auto-close a while after the latest alert
+            if self._hide_job:
+                self.root.after_cancel(self._hide_job)
+            self._hide_job = self.root.after(self.auto_close_ms, self.root.withdraw)
+            self.shown += 1
@@ -0,0 +1,49 @@
+# async_pipeline.py
+import asyncio
+
+
+class LatestFrameQueue:
+    """Bounded asyncio queue where a new item replaces the oldest one once full"""
+
+    def __init__(self, maxsize=1):
+        self._queue = asyncio.Queue(maxsize)
+
+    def put(self, item):
+        """Enqueue an item without waiting; returns True if a stale item was dropped"""
+        dropped = False
+        if self._queue.full():
+            self._queue.get_nowait()
+            dropped = True
+        self._queue.put_nowait(item)
+        return dropped
+
+    async def get(self):
+        return await self._queue.get()
+
+
+class PipelineStats:
+    """Frame drop and verdict freshness counters for the async monitor"""
+
+    def __init__(self):
+        self.frames_captured = 0
+        self.frames_dropped = 0    # Frames replaced before the vision stage saw them
+        self.results_dropped = 0   # Vision results replaced before validation saw them
+        self.verdicts = 0
+        self.total_verdict_age = 0.0
+        self.max_verdict_age = 0.0
+
+    def record_verdict_age(self, age):
+        """Track time from screen capture to handled verdict"""
+        self.verdicts += 1
+        self.total_verdict_age += age
+        self.max_verdict_age = max(self.max_verdict_age, age)
+
+    def summary(self):
+        avg_age = self.total_verdict_age / self.verdicts if self.verdicts else 0.0
+        return {
+            "frames_captured": self.frames_captured,
+            "frames_dropped": self.frames_dropped + self.results_dropped,
+            "verdicts": self.verdicts,
+            "avg_verdict_age_seconds": round(avg_age, 2),
+            "max_verdict_age_seconds": round(self.max_verdict_age, 2)
+        }
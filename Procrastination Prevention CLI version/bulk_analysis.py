@@ -0,0 +1,277 @@
+# bulk_analysis.py
+import concurrent.futures
+import datetime
+import glob
+import json
+import os
+
+import numpy as np
+
+from session_journal import JournalReplay, TIME_FORMAT
+
+CACHE_NAME = ".focus_analyze_cache.json"
+CACHE_VERSION = 3
+DAYS = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
+HEAT_LEVELS = " .:-=+*#%@"
+
+
+def find_session_files(target):
+    """Session analyses and journals in a directory, or the files matching a glob"""
+    if os.path.isdir(target):
+        paths = glob.glob(os.path.join(target, "focus_session_*.json")) + \
+                glob.glob(os.path.join(target, "focus_session_*.jsonl"))
+    else:
+        paths = glob.glob(target)
+    return sorted(os.path.abspath(p) for p in paths if os.path.isfile(p))
+
+
+def hour_of_week(epoch):
+    moment = datetime.datetime.fromtimestamp(epoch)
+    return moment.weekday() * 24 + moment.hour
+
+
+def summarize_file(path):
+    """Compact per-file summary; the unit that gets cached and aggregated"""
+    if path.endswith(".jsonl"):
+        analysis = JournalReplay(path).analysis()
+    else:
+        with open(path, "r") as f:
+            analysis = json.load(f)
+
+    summary = analysis["session_summary"]
+    dist = analysis["time_distribution"]
+    start = datetime.datetime.strptime(summary["start_time"], TIME_FORMAT).timestamp()
+    hours = analysis.get("distraction_hours_of_week")
+    if hours is None:
+        # Older analyses only know when the session started, so their
+        # distractions are attributed to that hour
+        hours = {str(hour_of_week(start)): summary["distraction_count"]} if summary["distraction_count"] else {}
+    return {
+        "start": start,
+        "goal": summary["goal"],
+        "journal": path.endswith(".jsonl"),
+        "duration_minutes": summary["duration_minutes"],
+        "productive_minutes": dist["productive_minutes"],
+        "distracted_minutes": dist["distracted_minutes"],
+        "distraction_count": summary["distraction_count"],
+        "distraction_hours": hours,
+        "top_distractions": {d["name"]: d["duration_minutes"] for d in analysis.get("top_distractions", [])}
+    }
+
+
+def _summarize_or_error(path):
+    try:
+        return path, summarize_file(path), None
+    except Exception as e:
+        return path, None, str(e)
+
+
+class SummaryCache:
+    """Per-file summaries keyed by path, invalidated by mtime and size, so re-runs only parse new files"""
+
+    def __init__(self, path):
+        self.path = path
+        self.entries = {}
+        self.dirty = False
+        try:
+            with open(path, "r") as f:
+                data = json.load(f)
+            if data.get("version") == CACHE_VERSION:
+                self.entries = data.get("files", {})
+        except (OSError, ValueError):
+            pass
+
+    def get(self, path):
+        entry = self.entries.get(path)
+        if entry is None:
+            return None
+        stat = os.stat(path)
+        if entry["mtime_ns"] != stat.st_mtime_ns or entry["size"] != stat.st_size:
+            return None
+        return entry["summary"]
+
+    def put(self, path, summary):
+        stat = os.stat(path)
+        self.entries[path] = {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "summary": summary}
+        self.dirty = True
+
+    def prune(self, paths):
+        """Forget files that no longer exist or no longer match"""
+        keep = set(paths)
+        stale = [p for p in self.entries if p not in keep]
+        for p in stale:
+            del self.entries[p]
+        self.dirty = self.dirty or bool(stale)
+
+    def save(self):
+        if not self.dirty:
+            return
+        temp_path = self.path + ".tmp"
+        try:
+            with open(temp_path, "w") as f:
+                json.dump({"version": CACHE_VERSION, "files": self.entries}, f)
+            os.replace(temp_path, self.path)
+            self.dirty = False
+        except OSError as e:
+            print(f"Analysis cache save error: {str(e)}")
+
+
+def load_summaries(paths, cache=None, workers=None):
+    """Summaries for every path: cached ones reused, the rest parsed in parallel worker processes"""
+    summaries, errors, pending = [], {}, []
+    for path in paths:
+        summary = cache.get(path) if cache else None
+        if summary is None:
+            pending.append(path)
+        else:
+            summaries.append(summary)
+
+    if pending:
+        if len(pending) < 32:
+            results = map(_summarize_or_error, pending)  # Not worth spawning processes
+            executor = None
+        else:
+            executor = concurrent.futures.ProcessPoolExecutor(max_workers=workers)
+            results = executor.map(_summarize_or_error, pending, chunksize=64)
+        try:
+            for path, summary, error in results:
+                if error:
+                    errors[path] = error
+                    continue
+                summaries.append(summary)
+                if cache:
+                    cache.put(path, summary)
+        finally:
+            if executor:
+                executor.shutdown()
+
+    return summaries, errors, len(paths) - len(pending)
+
+
+def unique_sessions(summaries):
+    """Drop journals of finished sessions: those also left an analysis file,
+    matched here on start time and goal, which is counted instead"""
+    analyzed = {(s["start"], s["goal"]) for s in summaries if not s["journal"]}
+    return [s for s in summaries if not (s["journal"] and (s["start"], s["goal"]) in analyzed)]
+
+
+def aggregate(summaries, top_n=10):
+    """Cross-session aggregates computed on NumPy columns"""
+    starts = np.array([s["start"] for s in summaries], dtype=np.float64)
+    duration = np.array([s["duration_minutes"] for s in summaries], dtype=np.float64)
+    productive = np.array([s["productive_minutes"] for s in summaries], dtype=np.float64)
+    distracted = np.array([s["distracted_minutes"] for s in summaries], dtype=np.float64)
+    counts = np.array([s["distraction_count"] for s in summaries], dtype=np.int64)
+
+    # Distractions by hour of week (Mon 00:00 = 0)
+    hours = np.fromiter((int(h) for s in summaries for h in s["distraction_hours"]), dtype=np.int64)
+    hour_counts = np.fromiter((c for s in summaries for c in s["distraction_hours"].values()), dtype=np.int64)
+    heatmap = np.bincount(hours, weights=hour_counts, minlength=168)[:168].astype(np.int64).reshape(7, 24)
+
+    # Weekly productivity trend, weeks starting Monday, on local dates like the heatmap
+    days = np.fromiter((datetime.date.fromtimestamp(s).toordinal() for s in starts), dtype=np.int64, count=len(starts))
+    weeks = (days - 1) // 7  # Ordinal day 1 was a Monday
+    week_ids, week_index = np.unique(weeks, return_inverse=True)
+    week_productive = np.bincount(week_index, weights=productive, minlength=len(week_ids))
+    week_duration = np.bincount(week_index, weights=duration, minlength=len(week_ids))
+    week_rate = np.divide(week_productive * 100, week_duration,
+                          out=np.zeros_like(week_productive), where=week_duration > 0)
+    trend = [{
+        "week_start": datetime.date.fromordinal(int(w) * 7 + 1).isoformat(),
+        "sessions": int(n),
+        "hours": round(float(d) / 60, 1),
+        "productivity_rate": round(float(r), 1)
+    } for w, n, d, r in zip(week_ids, np.bincount(week_index), week_duration, week_rate)]
+
+    # Top distracting resources across sessions
+    names = [name for s in summaries for name in s["top_distractions"]]
+    minutes = np.fromiter((m for s in summaries for m in s["top_distractions"].values()), dtype=np.float64)
+    top = []
+    if names:
+        unique_names, name_index = np.unique(np.array(names, dtype=object), return_inverse=True)
+        totals = np.bincount(name_index, weights=minutes)
+        for i in np.argsort(totals)[::-1][:top_n]:
+            top.append({"name": str(unique_names[i]), "duration_minutes": round(float(totals[i]), 1)})
+
+    total_duration = float(duration.sum())
+    return {
+        "sessions": len(summaries),
+        "first_session": datetime.datetime.fromtimestamp(starts.min()).strftime(TIME_FORMAT) if len(starts) else None,
+        "last_session": datetime.datetime.fromtimestamp(starts.max()).strftime(TIME_FORMAT) if len(starts) else None,
+        "total_hours": round(total_duration / 60, 1),
+        "productive_hours": round(float(productive.sum()) / 60, 1),
+        "distracted_hours": round(float(distracted.sum()) / 60, 1),
+        "productivity_rate": round(float(productive.sum()) / total_duration * 100, 1) if total_duration else 0.0,
+        "median_session_minutes": round(float(np.median(duration)), 1) if len(duration) else 0.0,
+        "distractions": int(counts.sum()),
+        "distractions_per_hour": round(float(counts.sum()) / total_duration * 60, 2) if total_duration else 0.0,
+        "heatmap": heatmap.tolist(),
+        "weekly_trend": trend,
+        "top_distractions": top
+    }
+
+
+def analyze_many(target, cache_path=None, workers=None):
+    """Load, cache and aggregate every session file under a directory or glob"""
+    paths = find_session_files(target)
+    if cache_path is None:
+        cache_path = os.path.join(target if os.path.isdir(target) else os.getcwd(), CACHE_NAME)
+    cache = SummaryCache(cache_path)
+    summaries, errors, cached = load_summaries(paths, cache, workers)
+    if os.path.isdir(target):
+        cache.prune(paths)
+    cache.save()
+    sessions = unique_sessions(summaries)
+    result = aggregate(sessions)
+    result["files"] = {"matched": len(paths), "cached": cached, "errors": len(errors),
+                       "duplicates": len(summaries) - len(sessions)}
+    return result, errors
+
+
+def print_bulk_analysis(result, errors=None):
+    """Print cross-session aggregates in the same style as a single session analysis"""
+    print("\n" + "="*60)
+    print("\033[1m\033[95m📊 MULTI-SESSION ANALYSIS 📊\033[0m")
+    print("="*60)
+
+    files = result["files"]
+    print(f"\033[1m\033[96m📁 Sessions:\033[0m {result['sessions']} "
+          f"({files['matched']} files: {files['cached']} from cache, {files['errors']} unreadable, "
+          f"{files['duplicates']} journals of analyzed sessions)")
+    if result["first_session"]:
+        print(f"\033[1m\033[96m📅 Range:\033[0m {result['first_session']} → {result['last_session']}")
+    print(f"\033[1m\033[96m⏱️ Tracked:\033[0m {result['total_hours']} hours "
+          f"(median session {result['median_session_minutes']} min)")
+    print(f"\033[1m\033[96m📈 Productivity Rate:\033[0m {result['productivity_rate']}%")
+
+    print("\n\033[1m\033[96m⏰ TIME DISTRIBUTION\033[0m")
+    print(f"  Productive Time: {result['productive_hours']} hours")
+    print(f"  Distracted Time: {result['distracted_hours']} hours")
+    print(f"  Distractions: {result['distractions']} ({result['distractions_per_hour']}/hour)")
+
+    print("\n\033[1m\033[96m📉 WEEKLY TREND\033[0m")
+    for week in result["weekly_trend"][-12:]:
+        bar = "█" * int(week["productivity_rate"] / 5)
+        print(f"  {week['week_start']}  {week['productivity_rate']:5.1f}% {bar}  "
+              f"({week['sessions']} sessions, {week['hours']}h)")
+
+    print("\n\033[1m\033[96m🔥 DISTRACTION HEATMAP (hour of week)\033[0m")
+    heatmap = np.array(result["heatmap"])
+    peak = heatmap.max()
+    print("       " + "".join(f"{h:<3}" for h in range(0, 24, 3)).rstrip())
+    for day, row in zip(DAYS, heatmap):
+        levels = (row * (len(HEAT_LEVELS) - 1) // peak) if peak else row
+        print(f"  {day}  " + "".join(HEAT_LEVELS[level] for level in levels))
+    if peak:
+        day, hour = divmod(int(heatmap.argmax()), 24)
+        print(f"  Peak: {DAYS[day]} {hour:02d}:00 ({peak} distractions)")
+
+    if result["top_distractions"]:
+        print("\n\033[1m\033[96m⚠️ TOP DISTRACTIONS\033[0m")
+        for idx, item in enumerate(result["top_distractions"], 1):
+            print(f"  {idx}. {item['name']}: {item['duration_minutes']} min")
+
+    for path, error in list((errors or {}).items())[:5]:
+        print(f"\033[93m  Skipped {os.path.basename(path)}: {error}\033[0m")
+
+    print("\n" + "="*60 + "\n")
@@ -0,0 +1,110 @@
+# goal_library.py
+import hashlib
+import json
+import os
+import time
+
+from rule_engine import RuleEngine
+from verdict_cache import normalize_text
+
+
+def save_json(path, data):
+    """Atomically replace a JSON file so a crash never leaves half of it"""
+    temp_path = path + ".tmp"
+    with open(temp_path, "w") as f:
+        json.dump(data, f, indent=2)
+    os.replace(temp_path, path)
+
+
+class GoalRulesCache:
+    """dynamic_rules persisted per normalized goal and model, so a goal run every day skips the LLM call"""
+
+    def __init__(self, path="goal_rules_cache.json", max_entries=200):
+        self.path = path
+        self.max_entries = max_entries
+        self.entries = {}
+        self.hits = 0
+        self.misses = 0
+        if path and os.path.exists(path):
+            try:
+                with open(path, "r") as f:
+                    self.entries = json.load(f).get("entries", {})
+            except (OSError, ValueError) as e:
+                print(f"Goal cache load error: {str(e)}")
+
+    @staticmethod
+    def key(goal, model):
+        # Case and spacing don't change what a goal means
+        return hashlib.sha1(f"{model}\n{normalize_text(goal)}".encode("utf-8")).hexdigest()[:16]
+
+    def get(self, goal, model):
+        entry = self.entries.get(self.key(goal, model))
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        entry["used"] = round(time.time())
+        return entry["rules"]
+
+    def put(self, goal, model, rules):
+        now = round(time.time())
+        self.entries[self.key(goal, model)] = {"goal": goal, "model": model, "rules": rules,
+                                               "created": now, "used": now}
+        if len(self.entries) > self.max_entries:
+            # Least recently used goals go first
+            for key, _ in sorted(self.entries.items(), key=lambda item: item[1]["used"])[:len(self.entries) - self.max_entries]:
+                del self.entries[key]
+        self.save()
+
+    def save(self):
+        if not self.path:
+            return
+        try:
+            save_json(self.path, {"entries": self.entries})
+        except OSError as e:
+            print(f"Goal cache save error: {str(e)}")
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self.entries)}
+
+
+class GoalProfiles:
+    """Named goals with their rules, loaded and compiled up front so switching goals needs no LLM call
+
+    The file maps names to {"goal", "dynamic_rules"}; --save-profile adds to it.
+    """
+
+    def __init__(self, path="goal_profiles.json"):
+        self.path = path
+        self.profiles = {}
+        self.engines = {}
+        if path and os.path.exists(path):
+            try:
+                with open(path, "r") as f:
+                    profiles = json.load(f).get("profiles", {})
+            except (OSError, ValueError) as e:
+                print(f"Goal profiles load error: {str(e)}")
+                profiles = {}
+            for name, profile in profiles.items():
+                self._add(name, profile["goal"], profile.get("dynamic_rules") or {})
+
+    def _add(self, name, goal, rules):
+        self.profiles[name] = {"goal": goal, "dynamic_rules": rules}
+        self.engines[name] = RuleEngine(rules)
+
+    def names(self):
+        return sorted(self.profiles)
+
+    def get(self, name):
+        """(goal, dynamic_rules, compiled RuleEngine) for a profile, or None"""
+        profile = self.profiles.get(name)
+        if profile is None:
+            return None
+        return profile["goal"], profile["dynamic_rules"], self.engines[name]
+
+    def save_profile(self, name, goal, rules):
+        self._add(name, goal, rules)
+        try:
+            save_json(self.path, {"profiles": self.profiles})
+        except OSError as e:
+            print(f"Goal profiles save error: {str(e)}")
@@ -0,0 +1,284 @@
+# groq_standin.py
+"""Local stand-in for the Groq chat-completions API.
+
+Serves the endpoints used by ProcrastinationPreventer and the UI GroqClient
+with scripted or canned responses, configurable latency and injected
+faults (429s, 500s and hung requests), so the monitoring loop can be
+load-tested offline:
+
+    python groq_standin.py --port 8089 --latency lognormal:-1.5,0.5 --rate-limit-rate 0.05
+    python procrastination_preventer.py "Code in VS Code" --base-url http://127.0.0.1:8089
+"""
+import argparse
+import itertools
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+CHAT_PATHS = ("/openai/v1/chat/completions", "/v1/chat/completions")
+
+
+def parse_latency(spec):
+    """Turn "fixed:0.2", "uniform:0.1,0.5", "normal:0.3,0.1" or "lognormal:mu,sigma" into a sampler"""
+    kind, _, args = spec.partition(":")
+    values = [float(v) for v in args.split(",")] if args else []
+    if kind == "fixed":
+        return lambda: values[0]
+    if kind == "uniform":
+        return lambda: random.uniform(values[0], values[1])
+    if kind == "normal":
+        return lambda: max(0.0, random.gauss(values[0], values[1]))
+    if kind == "lognormal":
+        return lambda: random.lognormvariate(values[0], values[1])
+    raise ValueError(f"Unknown latency distribution: {spec}")
+
+
+def message_text(messages):
+    """Concatenate the text parts of a chat request"""
+    parts = []
+    for message in messages:
+        content = message.get("content")
+        if isinstance(content, str):
+            parts.append(content)
+        elif isinstance(content, list):
+            parts.extend(p.get("text", "") for p in content if p.get("type") == "text")
+    return "\n".join(parts)
+
+
+def has_image(messages):
+    return any(isinstance(m.get("content"), list)
+               and any(p.get("type") == "image_url" for p in m["content"])
+               for m in messages)
+
+
+def canned_response(text, image):
+    """Plausible default answers for each prompt the clients send"""
+    if "enforcement rules" in text:
+        return json.dumps({
+            "allowed_resources": ["code.visualstudio.com", "VS Code", "github.com", "stackoverflow.com"],
+            "allowed_purposes": {"github.com": "source code and pull requests"},
+            "content_rules": {"stackoverflow.com": "programming questions"},
+            "blocked_resources": ["netflix.com", "reddit.com"],
+            "strictness": 3
+        })
+    if image and "activities" in text:
+        return json.dumps({"activities": [random.choice([
+            {"name": "VS Code", "type": "work", "content": "procrastination_preventer.py", "confidence": 92},
+            {"name": "youtube.com", "type": "entertainment", "content": "Funny cat compilation", "confidence": 88},
+            {"name": "github.com", "type": "work", "content": "Pull request #42", "confidence": 85}
+        ])]})
+    if image:
+        # UI domain extraction / description
+        return random.choice(["", "", "youtube.com"])
+    if '"verdicts"' in text:
+        match = re.search(r"Activities: (\[.*\])", text)
+        activities = json.loads(match.group(1)) if match else []
+        return json.dumps({"verdicts": [
+            {"index": a.get("index", i), "allowed": a.get("type") != "entertainment",
+             "reason": "Stand-in verdict", "suggestion": "Stay on task", "severity": "medium"}
+            for i, a in enumerate(activities)
+        ]})
+    if '"allowed"' in text:
+        return json.dumps({"allowed": "entertainment" not in text, "reason": "Stand-in verdict",
+                           "suggestion": "Stay on task", "severity": "medium"})
+    if "DISTRACTION" in text:
+        return "DISTRACTION youtube.com" if "youtube" in text.lower() else "ALIGNED"
+    return "0"
+
+
+class StandinState:
+    """Script, fault configuration and latency records shared by handler threads"""
+
+    def __init__(self, args):
+        self.latency = parse_latency(args.latency)
+        self.vision_latency = parse_latency(args.vision_latency) if args.vision_latency else self.latency
+        self.rate_limit_rate = args.rate_limit_rate
+        self.retry_after = args.retry_after
+        self.error_rate = args.error_rate
+        self.timeout_rate = args.timeout_rate
+        self.hang_seconds = args.hang_seconds
+
+        self.rules = []
+        if args.script:
+            with open(args.script, "r") as f:
+                for rule in json.load(f).get("rules", []):
+                    rule["_cycle"] = itertools.cycle(rule.get("responses") or [rule.get("content", "")])
+                    self.rules.append(rule)
+
+        self.lock = threading.Lock()
+        self.started = time.monotonic()
+        self.latencies = []
+        self.status_counts = {}
+
+    def scripted(self, text, model):
+        """First script rule whose match/model filters apply, as (status, content)"""
+        for rule in self.rules:
+            if rule.get("model") and rule["model"] != model:
+                continue
+            if rule.get("match") and rule["match"].lower() not in text.lower():
+                continue
+            with self.lock:
+                content = next(rule["_cycle"])
+            if not isinstance(content, str):
+                content = json.dumps(content)
+            return rule.get("status", 200), content
+        return None
+
+    def record(self, status, elapsed):
+        with self.lock:
+            self.latencies.append(elapsed)
+            self.status_counts[status] = self.status_counts.get(status, 0) + 1
+
+    def report(self):
+        """Throughput and latency percentiles observed so far"""
+        with self.lock:
+            latencies = sorted(self.latencies)
+            counts = dict(self.status_counts)
+        duration = time.monotonic() - self.started
+
+        def percentile(p):
+            if not latencies:
+                return 0.0
+            return round(latencies[min(len(latencies) - 1, int(p / 100 * len(latencies)))] * 1000, 1)
+
+        return {
+            "requests": len(latencies),
+            "requests_per_second": round(len(latencies) / duration, 2) if duration else 0.0,
+            "status_counts": counts,
+            "p50_ms": percentile(50),
+            "p95_ms": percentile(95),
+            "p99_ms": percentile(99),
+            "max_ms": round(latencies[-1] * 1000, 1) if latencies else 0.0
+        }
+
+
+class StandinHandler(BaseHTTPRequestHandler):
+    server_version = "GroqStandin/1.0"
+
+    def log_message(self, format, *args):
+        pass  # Keep the console quiet under load
+
+    def send_json(self, status, payload, headers=None):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == "/stats":
+            self.send_json(200, self.server.state.report())
+        else:
+            self.send_json(404, {"error": {"message": "Not found"}})
+
+    def do_POST(self):
+        state = self.server.state
+        started = time.monotonic()
+
+        if self.path not in CHAT_PATHS:
+            self.send_json(404, {"error": {"message": "Not found"}})
+            return
+
+        length = int(self.headers.get("Content-Length", 0))
+        request = json.loads(self.rfile.read(length) or b"{}")
+        messages = request.get("messages", [])
+        model = request.get("model", "")
+        text = message_text(messages)
+        image = has_image(messages)
+
+        # Fault injection happens before any simulated work
+        roll = random.random()
+        if roll < state.timeout_rate:
+            time.sleep(state.hang_seconds)
+            state.record(0, time.monotonic() - started)
+            return
+        roll -= state.timeout_rate
+        if roll < state.rate_limit_rate:
+            self.send_json(429, {"error": {"message": "Rate limit reached", "type": "rate_limit_exceeded"}},
+                           {"Retry-After": str(state.retry_after)})
+            state.record(429, time.monotonic() - started)
+            return
+        roll -= state.rate_limit_rate
+        if roll < state.error_rate:
+            self.send_json(500, {"error": {"message": "Injected server error", "type": "internal_error"}})
+            state.record(500, time.monotonic() - started)
+            return
+
+        time.sleep((state.vision_latency if image else state.latency)())
+
+        scripted = state.scripted(text, model)
+        status, content = scripted if scripted else (200, canned_response(text, image))
+        if status != 200:
+            self.send_json(status, {"error": {"message": content}})
+            state.record(status, time.monotonic() - started)
+            return
+
+        prompt_tokens = len(text) // 4 + (800 if image else 0)
+        completion_tokens = len(content) // 4 + 1
+        self.send_json(200, {
+            "id": f"chatcmpl-{uuid.uuid4().hex[:24]}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop"
+            }],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens
+            }
+        })
+        state.record(200, time.monotonic() - started)
+
+
+def serve(args):
+    """Run the stand-in until interrupted, then print the latency report"""
+    server = ThreadingHTTPServer((args.host, args.port), StandinHandler)
+    server.daemon_threads = True
+    server.state = StandinState(args)
+    print(f"Groq stand-in listening on http://{args.host}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(json.dumps(server.state.report(), indent=2))
+    return server
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Local Groq chat-completions stand-in")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--script", type=str,
+                        help="JSON file of scripted responses: {\"rules\": [{\"match\", \"model\", \"responses\", \"status\"}]}")
+    parser.add_argument("--latency", default="fixed:0.05",
+                        help="Latency distribution: fixed:S, uniform:A,B, normal:MEAN,SD or lognormal:MU,SIGMA")
+    parser.add_argument("--vision-latency", type=str,
+                        help="Separate latency distribution for image requests")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0,
+                        help="Fraction of requests answered with 429")
+    parser.add_argument("--retry-after", type=float, default=1.0,
+                        help="Retry-After seconds sent with 429 responses")
+    parser.add_argument("--error-rate", type=float, default=0.0,
+                        help="Fraction of requests answered with 500")
+    parser.add_argument("--timeout-rate", type=float, default=0.0,
+                        help="Fraction of requests that hang without a response")
+    parser.add_argument("--hang-seconds", type=float, default=120.0,
+                        help="How long hung requests stall before the connection drops")
+    return parser
+
+
+if __name__ == "__main__":
+    serve(build_parser().parse_args())
@@ -1,240 +1,201 @@
 # procrastination_preventer.py
 import argparse
+import importlib
 import time
 import json
-import base64
 import os
 import platform
-import pyautogui
+import sys
 import threading
 import datetime
-from PIL import Image
-from groq import Groq
-try:
-    from plyer import notification
-except ImportError:
-    notification = None
-
-# Add imports for sound functionality
-try:
-    import winsound  # For Windows
-except ImportError:
-    winsound = None
-
-try:
-    from pydub import AudioSegment
-    from pydub.playback import play
-    has_pydub = True
-except ImportError:
-    has_pydub = False
-
-# Add imports for GUI popup window
-try:
-    import tkinter as tk
-    from tkinter import font as tkFont
-    has_tkinter = True
-except ImportError:
-    has_tkinter = False
+
+# Modules shared with the UI version (transport, scheduler, budget, ...) live in ../shared
+SHARED_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "shared")
+if SHARED_DIR not in sys.path:
+    sys.path.insert(0, SHARED_DIR)
+
+from budget import StageBudget, BudgetExceeded, remaining_budget
+from session_journal import LogEntry, SessionTotals, SessionJournal, JournalReplay
+from frame_hash import FrameDeduplicator
+from verdict_cache import VerdictCache, activity_signature
+from screen_encoder import ScreenEncoder, crop_box
+from active_window import ActiveWindowLocator
+from rule_engine import RuleEngine
+from scheduler import AdaptiveScheduler, TickScheduler
+from metrics import MetricsRegistry, MetricsExporter
+from tracing import Tracer, NULL_TRACER
+from alert_window import AlertWindow
+from alert_dispatcher import AlertDispatcher
+from goal_library import GoalRulesCache, GoalProfiles
+
+# Model that turns a goal into dynamic_rules; part of the goal cache key
+GOAL_MODEL = "llama3-70b-8192"
+
+# pyautogui, groq, PIL and asyncio (only --async uses it) are imported where
+# they're first needed, and the alert backends (plyer, winsound, pydub, tkinter)
+# on the first alert, so --analyze and startup don't pay for them
+_optional_modules = {}
+
+
+def optional_import(name):
+    """Import an optional dependency on first use; None if it isn't installed"""
+    if name not in _optional_modules:
+        try:
+            _optional_modules[name] = importlib.import_module(name)
+        except ImportError:
+            _optional_modules[name] = None
+    return _optional_modules[name]
+
+
+def format_channels(counts):
+    """'sound 2, popup 1' from per-channel alert counts"""
+    return ", ".join(f"{name} {count}" for name, count in counts.items() if count) or "none"
 
 class ProcrastinationPreventer:
-    def __init__(self, api_key_path="api.txt"):
-        self.client = self.initialize_groq_client(api_key_path)
+    def __init__(self, api_key_path="api.txt", base_url=None, api_timeout=20, max_retries=3):
+        self.base_url = base_url  # Point at a local stand-in (groq_standin.py) for offline runs
+        self.transport = self.initialize_groq_client(api_key_path, api_timeout, max_retries)
+        self.client = self.transport.client
+        self.was_degraded = False
         self.user_goal = ""
         self.dynamic_rules = {}
+        self.goal_rules_source = "none"  # Where dynamic_rules came from: cache, llm, profile, journal or none
+        self.goal_cache = None  # GoalRulesCache
+        self.refresh_goal_rules = False  # Skip the cache read but still store the new rules
+        self.goal_profiles = None  # GoalProfiles
+        self.profile_name = None
+        self.pending_profile = None  # Set from the command thread, applied between ticks
+        self.profile_switches = 0
         self.sfm_mode = False
         self.distraction_count = 0
         self.interval = 10
+        self.next_interval = 10
+        self.scheduler = None  # AdaptiveScheduler when --adaptive is used
+        self.tick_scheduler = None
         self.running = True
         self.blocked = False
         self.sound_enabled = True  # Enable sound by default
+        self.audio = None  # AudioWorker, started by start_audio
         self.popup_enabled = True  # Enable popup by default
         
         # Session analytics data
         self.session_start_time = datetime.datetime.now()
-        self.session_log = []
-        self.productive_time = 0
-        self.distraction_time = 0
-        self.current_activity = None
-        self.current_activity_start = None
+        self.session_totals = SessionTotals()  # Closed log entries live in the journal, not in memory
+        self.paused_seconds = 0.0
+        self.journal = None
+        self.current_entry = None  # Open LogEntry for the activity on screen
         
-        # Store active popup windows
-        self.active_popups = []
+        # One alert window for the whole session, fed from any thread
+        self.alert_window = None
+
+        # Alerts leave the monitoring loop here, in the order they are delivered
+        self.alert_dispatcher = AlertDispatcher({
+            "sound": self.alert_sound,
+            "popup": self.alert_popup,
+            "notification": self.alert_notification,
+            "console": self.alert_console
+        })
+
+        # Skip vision calls while the screen is unchanged
+        self.frame_dedup = FrameDeduplicator()
+
+        # Reuse verdicts for activities that were already validated
+        self.verdict_cache = VerdictCache()
+
+        # Local fast path compiled from dynamic_rules
+        self.local_rules_enabled = True
+        self.rule_engine = RuleEngine()
+
+        # Capture only the focused window when capture_mode is "window"
+        self.capture_mode = "screen"
+        self.window_locator = ActiveWindowLocator()
+
+        # In-memory screenshot encoding
+        self.encoder = ScreenEncoder()
+
+        # Batched validation counters
+        self.batch_requests = 0
+        self.batch_fallback_items = 0
 
-    def initialize_groq_client(self, api_key_path):
-        """Initialize Groq client with API key"""
+        # Per-tick stage budgets; overruns fall back to the last verdicts, marked stale
+        self.stage_budget = StageBudget({"vision": 15, "validation": 10})
+        self.last_tick = None
+        self.stale_ticks = 0
+
+        # Per-stage latency histograms and counters, exported only with --metrics-port/--metrics-file
+        self.metrics = MetricsRegistry()
+        self.metrics.add_collector(self.metric_counters)
+        self.alert_dispatcher.metrics = self.metrics
+        self.metrics_exporter = None
+        self.tracer = NULL_TRACER  # Chrome trace-event spans with --trace
+
+        # Stats, created only when the pipelined monitor runs
+        self.pipeline_stats = None
+
+    def initialize_groq_client(self, api_key_path, timeout=20, max_retries=3):
+        """Initialize the shared Groq transport with API key"""
         try:
+            from transport import GroqTransport  # Pulls in groq and httpx
             with open(api_key_path, "r") as f:
-                api_key = f.read().strip()
-            return Groq(api_key=api_key)
+                self.api_key = f.read().strip()
+            return GroqTransport(api_key=self.api_key, base_url=self.base_url,
+                                 timeout=timeout, max_retries=max_retries)
         except Exception as e:
             print(f"Error initializing Groq client: {str(e)}")
             exit(1)
 
+    def start_audio(self, wav_dir=None):
+        """Synthesize the alert tones once and start the thread that plays them"""
+        from alert_sound import AudioWorker, create_backend  # NumPy only loads when sound is on
+        pydub = optional_import("pydub")
+        backend = create_backend(wav_dir, optional_import("winsound"),
+                                 pydub if pydub and optional_import("pydub.playback") else None)
+        self.audio = AudioWorker(backend)
+
     def play_warning_sound(self, severity="medium"):
-        """Play a warning sound based on severity level"""
-        if not self.sound_enabled:
+        """Queue the warning tone for this severity; it plays on the audio thread"""
+        if not self.sound_enabled or self.audio is None:
             return
-            
-        try:
-            # Windows implementation
-            if winsound:
-                # Different frequencies based on severity
-                frequencies = {
-                    "low": 440,    # A4 note
-                    "medium": 880,  # A5 note
-                    "high": 1760   # A6 note
-                }
-                duration = 500  # milliseconds
-                
-                frequency = frequencies.get(severity, frequencies["medium"])
-                winsound.Beep(frequency, duration)
-                return
-                
-            # Cross-platform implementation using pydub
-            if has_pydub:
-                # Generate different tones based on severity
-                duration = 500  # milliseconds
-                
-                # Different frequencies based on severity
-                frequencies = {
-                    "low": 440,    # A4 note
-                    "medium": 880,  # A5 note
-                    "high": 1760   # A6 note
-                }
-                
-                frequency = frequencies.get(severity, frequencies["medium"])
-                
-                # Generate a sine wave tone
-                sample_rate = 44100
-                sine_wave = AudioSegment.silent(duration=duration)
-                
-                # This is a simple way to generate a tone - in a real implementation
-                # you would use numpy to generate proper sine waves
-                sine_wave = sine_wave.set_frame_rate(sample_rate)
-                
-                # Play the sound
-                play(sine_wave)
-                return
-                
-            # Fallback for Unix-like systems using system bell
-            print('\a')
-            
-        except Exception as e:
-            print(f"Sound error: {str(e)}")
+        self.audio.play(severity)
 
     def show_warning_popup(self, title, message, severity="medium"):
-        """Display a warning popup window"""
-        if not self.popup_enabled or not has_tkinter:
+        """Show the warning in the alert window, created on the first popup and reused after that"""
+        if not self.popup_enabled:
             return
-            
-        # Define colors based on severity
-        colors = {
-            "low": {"bg": "#FFF3CD", "fg": "#856404", "border": "#FFEEBA"},     # Yellow (warning)
-            "medium": {"bg": "#F8D7DA", "fg": "#721C24", "border": "#F5C6CB"},  # Red (danger)
-            "high": {"bg": "#CC0000", "fg": "#FFFFFF", "border": "#990000"}     # Bright Red (severe)
-        }
-        
-        color_scheme = colors.get(severity, colors["medium"])
-        
-        # Create popup window in a separate thread to not block main app
-        def create_popup():
-            # Create the popup window
-            popup = tk.Tk()
-            popup.title("Focus Guardian Alert")
-            popup.attributes("-topmost", True)  # Keep window on top
-            
-            # Get screen width and height
-            screen_width = popup.winfo_screenwidth()
-            screen_height = popup.winfo_screenheight()
-            
-            # Set window size and position (top right corner)
-            window_width = 350
-            window_height = 200
-            x_position = screen_width - window_width - 20
-            y_position = 40
-            
-            # Position the window
-            popup.geometry(f"{window_width}x{window_height}+{x_position}+{y_position}")
-            
-            # Configure the window
-            popup.configure(bg=color_scheme["bg"])
-            popup.overrideredirect(True)  # Remove window decorations
-            
-            # Add a border
-            frame = tk.Frame(popup, bg=color_scheme["border"], padx=3, pady=3)
-            frame.pack(fill="both", expand=True)
-            
-            inner_frame = tk.Frame(frame, bg=color_scheme["bg"], padx=10, pady=10)
-            inner_frame.pack(fill="both", expand=True)
-            
-            # Add title
-            title_font = tkFont.Font(family="Arial", size=14, weight="bold")
-            title_label = tk.Label(inner_frame, text=title, font=title_font, 
-                                 bg=color_scheme["bg"], fg=color_scheme["fg"])
-            title_label.pack(pady=(10, 5))
-            
-            # Add message
-            message_font = tkFont.Font(family="Arial", size=12)
-            message_label = tk.Label(inner_frame, text=message, font=message_font, 
-                                   bg=color_scheme["bg"], fg=color_scheme["fg"],
-                                   wraplength=320, justify="center")
-            message_label.pack(pady=10)
-            
-            # Add dismiss button
-            button_font = tkFont.Font(family="Arial", size=10, weight="bold")
-            dismiss_button = tk.Button(inner_frame, text="I'll Focus Now", font=button_font,
-                                     command=popup.destroy, bg="#007BFF", fg="white",
-                                     activebackground="#0069D9", activeforeground="white",
-                                     padx=15, pady=5, border=0)
-            dismiss_button.pack(pady=10)
-            
-            # Store reference to popup
-            self.active_popups.append(popup)
-            
-            # Auto-close after 10 seconds
-            popup.after(10000, lambda: self.close_popup(popup))
-            
-            # Start popup
-            popup.mainloop()
-            
-        # Create and start popup thread
-        popup_thread = threading.Thread(target=create_popup)
-        popup_thread.daemon = True
-        popup_thread.start()
-        
-    def close_popup(self, popup):
-        """Safely close a popup window"""
-        if popup in self.active_popups:
-            try:
-                popup.destroy()
-                self.active_popups.remove(popup)
-            except Exception:
-                pass
+        if self.alert_window is None:
+            self.alert_window = AlertWindow(self.tracer)
+        self.alert_window.show(title, message, severity)
 
     def close_all_popups(self):
-        """Close all active popup windows"""
-        for popup in self.active_popups[:]:  # Create a copy of the list to iterate over
-            self.close_popup(popup)
-
-    def show_progress_bar(self, seconds):
-        """Display animated progress bar"""
-        for i in range(seconds):
-            if not self.running:
-                break
-            progress = (i + 1) / seconds
-            bar_length = 40
+        """Shut down the alert window and its thread"""
+        if self.alert_window:
+            self.alert_window.close()
+
+    def show_progress_bar(self, refresh=0.25):
+        """Display animated progress toward the next tick until monitoring stops"""
+        bar_length = 40
+        while self.running and self.tick_scheduler and not self.tick_scheduler.stopped:
+            progress = self.tick_scheduler.progress()
             filled = int(round(bar_length * progress))
             bar = '█' * filled + '-' * (bar_length - filled)
-            print(f'\r\033[94mScanning: [{bar}] {int(progress*100)}%\033[0m', end='', flush=True)
-            time.sleep(1)
+            with self.tracer.span("progress_render"):
+                print(f'\r\033[94mScanning: [{bar}] {int(progress*100)}%\033[0m', end='', flush=True)
+            time.sleep(refresh)
         print('\r' + ' ' * 60 + '\r', end='')
 
     def parse_user_goal(self, goal_text):
-        """Dynamically generate rules from user goal using LLM"""
+        """Rules for the goal from the on-disk cache, or generated by the LLM and cached"""
         self.user_goal = goal_text
+        use_cache = self.goal_cache and not self.refresh_goal_rules
+        cached = self.goal_cache.get(goal_text, GOAL_MODEL) if use_cache else None
+        if cached is not None:
+            self.dynamic_rules = cached
+            self.rule_engine = RuleEngine(self.dynamic_rules)
+            self.goal_rules_source = "cache"
+            return
         try:
-            response = self.client.chat.completions.create(
-                model="llama3-70b-8192",
+            response = self.transport.chat(
+                model=GOAL_MODEL,
                 messages=[{
                     "role": "user",
                     "content": f"""Analyze this productivity goal and create enforcement rules:
@@ -244,6 +205,7 @@ class ProcrastinationPreventer:
                     - allowed_resources: list of allowed apps/websites
                     - allowed_purposes: specific usage purposes
                     - content_rules: content validation criteria
+                    - blocked_resources: apps/websites that are clearly distractions for this goal
                     - strictness: level of enforcement (1-5)
                     
                     Example response for "Study ML on YouTube":
@@ -255,6 +217,7 @@ class ProcrastinationPreventer:
                         "content_rules": {{
                             "youtube.com": "Video titles must contain ML/AI keywords"
                         }},
+                        "blocked_resources": ["netflix.com", "instagram.com"],
                         "strictness": 4
                     }}"""
                 }],
@@ -263,25 +226,89 @@ class ProcrastinationPreventer:
                 response_format={"type": "json_object"}
             )
             self.dynamic_rules = json.loads(response.choices[0].message.content)
+            self.goal_rules_source = "llm"
+            if self.goal_cache:
+                self.goal_cache.put(goal_text, GOAL_MODEL, self.dynamic_rules)
         except Exception as e:
-            print(f"Goal parsing error: {str(e)}")
-            exit(1)
+            # Without generated rules every activity goes to the LLM validator, which
+            # allows activities while the API is down, so the session can still start
+            print(f"Goal parsing error: {str(e)} - starting without generated rules")
+            self.dynamic_rules = {}
+            self.goal_rules_source = "none"
+        self.rule_engine = RuleEngine(self.dynamic_rules)
 
-    def capture_and_analyze(self):
-        """Capture screen and analyze activities with improved vision prompt"""
-        temp_path = "temp_screen.png"
-        try:
-            # Capture and crop screenshot
+    def use_profile(self, name):
+        """Take the goal and precompiled rules of a preloaded profile, without an LLM call"""
+        profile = self.goal_profiles.get(name) if self.goal_profiles else None
+        if profile is None:
+            return False
+        self.user_goal, self.dynamic_rules, engine = profile
+        self.rule_engine = engine.take_counters(self.rule_engine)
+        self.profile_name = name
+        self.goal_rules_source = "profile"
+        return True
+
+    def apply_pending_profile(self):
+        """Hot-swap to a profile requested on stdin; runs on the monitoring thread between ticks"""
+        name, self.pending_profile = self.pending_profile, None
+        if name is None:
+            return
+        # Time so far counts under the old goal
+        if self.current_entry:
+            self.close_log_entry(time.time(), time.monotonic())
+        if not self.use_profile(name):
+            print(f"\n\033[91mUnknown profile '{name}' (available: {', '.join(self.goal_profiles.names())})\033[0m")
+            return
+        # Cached vision results were described against the previous goal
+        self.frame_dedup.reset()
+        self.profile_switches += 1
+        if self.journal:
+            self.journal.write("goal", goal=self.user_goal, dynamic_rules=self.dynamic_rules, profile=name)
+        print(f"\n\033[92mSwitched to profile '{name}': {self.user_goal}\033[0m")
+
+    def start_command_listener(self):
+        """Read 'profile NAME' lines from the terminal to switch goals mid-session"""
+        if not self.goal_profiles or not self.goal_profiles.names() or not sys.stdin.isatty():
+            return
+        print(f"Profiles: {', '.join(self.goal_profiles.names())} (type 'profile NAME' and Enter to switch)")
+
+        def listen():
+            for line in sys.stdin:
+                command, _, argument = line.strip().partition(" ")
+                if command in ("profile", "p") and argument.strip():
+                    self.pending_profile = argument.strip()
+
+        threading.Thread(target=listen, name="commands", daemon=True).start()
+
+    def capture_screen(self):
+        """Capture the active window, or the screen; returns (screenshot, box to analyze or None)
+
+        Full-screen captures come with a box leaving out the bottom 5% (taskbar), which the
+        hash and the encoder read through instead of a cropped copy of the frame.
+        """
+        import pyautogui
+        if self.capture_mode == "window":
+            region = self.window_locator.region(pyautogui.size())
+            if region:
+                with self.tracer.span("screenshot", mode="window"):
+                    return pyautogui.screenshot(region=region), None
+        with self.tracer.span("screenshot", mode="screen"):
             screenshot = pyautogui.screenshot()
-            width, height = screenshot.size
-            crop_height = int(height * 0.95)
-            screenshot = screenshot.crop((0, 0, width, crop_height))
-            screenshot.save(temp_path)
+        return screenshot, crop_box(screenshot.size)
+
+    def encode_screenshot(self, screenshot, box=None):
+        """Encode a screenshot, or the part of it inside box, in memory as a data URL"""
+        with self.tracer.span("encode", format=self.encoder.image_format):
+            return self.encoder.encode(screenshot, box)
 
-            with open(temp_path, "rb") as f:
-                base64_image = base64.b64encode(f.read()).decode("utf-8")
+    def parse_json(self, response):
+        """Decode a JSON chat completion"""
+        with self.tracer.span("parse_json"):
+            return json.loads(response.choices[0].message.content)
 
-            vision_prompt = """Analyze ONLY the active window and Identify primary application
+    def vision_request(self, image_url):
+        """Build the chat completion arguments for the vision model"""
+        vision_prompt = """Analyze ONLY the active window and Identify primary application
             
             Return JSON with confidence scores (1-100):
             {
@@ -295,43 +322,76 @@ class ProcrastinationPreventer:
                 ]
             }"""
 
-            response = self.client.chat.completions.create(
-                model="llama-3.2-11b-vision-preview",
-                messages=[
-                    {
-                        "role": "user",
-                        "content": [
-                            {"type": "text", "text": vision_prompt},
-                            {
-                                "type": "image_url",
-                                "image_url": {"url": f"data:image/png;base64,{base64_image}"}
-                            }
-                        ]
-                    }
-                ],
-                temperature=0.1,
-                max_tokens=500,
-                response_format={"type": "json_object"}
-            )
-            
-            data = json.loads(response.choices[0].message.content)
-            # Filter low-confidence detections
-            return {
-                "activities": [
-                    a for a in data.get("activities", [])
-                    if a.get("confidence", 0) > 65
-                ]
-            }
-        except Exception as e:
-            return {"activities": []}
-        finally:
-            if os.path.exists(temp_path):
-                os.remove(temp_path)
+        return {
+            "model": "llama-3.2-11b-vision-preview",
+            "messages": [
+                {
+                    "role": "user",
+                    "content": [
+                        {"type": "text", "text": vision_prompt},
+                        {
+                            "type": "image_url",
+                            "image_url": {"url": image_url}
+                        }
+                    ]
+                }
+            ],
+            "temperature": 0.1,
+            "max_tokens": 500,
+            "response_format": {"type": "json_object"}
+        }
 
-    def validate_activity(self, activity):
-        """Context-aware validation using LLM"""
-        try:
-            prompt = f"""Verify if this activity aligns with the user's goal:
+    def parse_vision_response(self, response, frame_key):
+        """Parse vision output, keeping only confident detections"""
+        data = self.parse_json(response)
+        # Filter low-confidence detections
+        result = {
+            "activities": [
+                a for a in data.get("activities", [])
+                if a.get("confidence", 0) > 65
+            ]
+        }
+        self.frame_dedup.store(result, frame_key)
+        return result
+
+    def reuse_frame_result(self, screenshot, box=None):
+        """Return (the previous activities if the screen hasn't changed, else None, frame key)"""
+        cached, frame_key = self.frame_dedup.lookup(screenshot, box)
+        if cached is None:
+            return None, frame_key
+        return {"activities": [a.copy() for a in cached["activities"]]}, frame_key
+
+    def analyze_screen(self):
+        """Capture and analyze the screen, raising on failure"""
+        with self.metrics.time("capture"):
+            screenshot, box = self.capture_screen()
+
+        cached, frame_key = self.reuse_frame_result(screenshot, box)
+        if cached is not None:
+            return cached
+
+        with self.metrics.time("encode"):
+            image_url = self.encode_screenshot(screenshot, box)
+        with self.metrics.time("vision"):
+            response = self.transport.chat(deadline=remaining_budget(), **self.vision_request(image_url))
+        return self.parse_vision_response(response, frame_key)
+
+    async def analyze_frame_async(self, screenshot, box=None):
+        """Async vision analysis of an already captured frame, raising on failure"""
+        import asyncio
+        cached, frame_key = self.reuse_frame_result(screenshot, box)
+        if cached is not None:
+            return cached
+
+        with self.metrics.time("encode"):
+            image_url = await asyncio.to_thread(self.encode_screenshot, screenshot, box)
+        with self.metrics.time("vision"):
+            response = await self.transport.achat(**self.vision_request(image_url))
+        return self.parse_vision_response(response, frame_key)
+
+    def validation_request(self, activity):
+        """Build the chat completion arguments for validating one activity"""
+        prompt = f"""Verify if this activity aligns with the user's goal:
             User Goal: "{self.user_goal}"
             Activity: {json.dumps(activity)}
             Rules: {json.dumps(self.dynamic_rules)}
@@ -350,98 +410,362 @@ class ProcrastinationPreventer:
                 "severity": "low|medium|high"
             }}"""
 
-            response = self.client.chat.completions.create(
-                model="llama3-70b-8192",
-                messages=[{"role": "user", "content": prompt}],
-                temperature=0.1,
-                max_tokens=300,
-                response_format={"type": "json_object"}
-            )
-            return json.loads(response.choices[0].message.content)
+        return {
+            "model": "llama3-70b-8192",
+            "messages": [{"role": "user", "content": prompt}],
+            "temperature": 0.1,
+            "max_tokens": 300,
+            "response_format": {"type": "json_object"}
+        }
+
+    def cached_verdict(self, activity):
+        """Look up a local or cached verdict, returning (cache_key, verdict or None)"""
+        # Clear-cut activities are decided by the compiled rules in microseconds
+        if self.local_rules_enabled:
+            local = self.rule_engine.decide(activity)
+            if local is not None:
+                return None, local
+
+        # Identical activities under the same goal and rules get the same verdict
+        cache_key = self.verdict_cache.make_key(activity, self.user_goal, self.dynamic_rules)
+        cached = self.verdict_cache.get(cache_key)
+        if cached is not None:
+            cached["cached"] = True
+        return cache_key, cached
+
+    def batch_validation_request(self, activities):
+        """Build one chat completion that validates every activity from a frame"""
+        indexed = [{"index": i, **activity} for i, activity in enumerate(activities)]
+        prompt = f"""Verify if each of these activities aligns with the user's goal:
+            User Goal: "{self.user_goal}"
+            Activities: {json.dumps(indexed)}
+            Rules: {json.dumps(self.dynamic_rules)}
+            
+            Consider for each activity:
+            1. Resource allowlist
+            2. Purpose matching
+            3. Content relevance
+            4. Current context
+            
+            Return JSON response with exactly one verdict per activity, using its index:
+            {{
+                "verdicts": [
+                    {{
+                        "index": 0,
+                        "allowed": boolean,
+                        "reason": "explanation",
+                        "suggestion": "productivity tip",
+                        "severity": "low|medium|high"
+                    }}
+                ]
+            }}"""
+
+        return {
+            "model": "llama3-70b-8192",
+            "messages": [{"role": "user", "content": prompt}],
+            "temperature": 0.1,
+            "max_tokens": min(150 * len(activities) + 100, 2048),
+            "response_format": {"type": "json_object"}
+        }
+
+    def parse_batch_verdicts(self, response, count):
+        """Map a batch response to verdicts by index, None where an entry is malformed"""
+        verdicts = [None] * count
+        try:
+            data = self.parse_json(response)
+            entries = data.get("verdicts", [])
+        except Exception:
+            return verdicts
+
+        for entry in entries if isinstance(entries, list) else []:
+            if not isinstance(entry, dict):
+                continue
+            index = entry.get("index")
+            if (isinstance(index, int) and 0 <= index < count
+                    and verdicts[index] is None and isinstance(entry.get("allowed"), bool)):
+                verdicts[index] = {k: v for k, v in entry.items() if k != "index"}
+        return verdicts
+
+    def split_cached_verdicts(self, activities):
+        """Fill verdicts from the cache, returning (verdicts, pending indexes, cache keys)"""
+        verdicts = [None] * len(activities)
+        pending = []
+        keys = {}
+        for i, activity in enumerate(activities):
+            cache_key, cached = self.cached_verdict(activity)
+            if cached is not None:
+                verdicts[i] = cached
+            else:
+                pending.append(i)
+                keys[i] = cache_key
+        return verdicts, pending, keys
+
+    def store_batch_verdicts(self, verdicts, pending, keys, batch, elapsed):
+        """Record well-formed batch verdicts; returns indexes that still need a verdict"""
+        self.batch_requests += 1
+        per_item = elapsed / len(pending)
+        for slot, verdict in zip(pending, batch):
+            if verdict is not None:
+                self.verdict_cache.put(keys[slot], verdict, per_item)
+                verdicts[slot] = verdict
+        missing = [slot for slot in pending if verdicts[slot] is None]
+        self.batch_fallback_items += len(missing)
+        return missing
+
+    def request_verdict(self, activity, cache_key):
+        """Validate a single activity with the LLM"""
+        try:
+            started = time.monotonic()
+            response = self.transport.chat(deadline=remaining_budget(), **self.validation_request(activity))
+            verdict = self.parse_json(response)
+            self.verdict_cache.put(cache_key, verdict, time.monotonic() - started)
+            return verdict
         except Exception as e:
-            return {"allowed": True, "reason": "Validation failed"}
+            return self.fallback_verdict()
+
+    async def request_verdict_async(self, activity, cache_key):
+        """Async variant of request_verdict for the pipelined monitor"""
+        try:
+            started = time.monotonic()
+            response = await self.transport.achat(**self.validation_request(activity))
+            verdict = self.parse_json(response)
+            self.verdict_cache.put(cache_key, verdict, time.monotonic() - started)
+            return verdict
+        except Exception as e:
+            return self.fallback_verdict()
+
+    def run_tick(self):
+        """Vision and validation under their budgets, returning (activities, verdicts)"""
+        try:
+            with self.tracer.span("vision_stage"):
+                activities = self.stage_budget.run("vision", self.analyze_screen).get("activities", [])
+            with self.metrics.time("validation"), self.tracer.span("validation_stage", activities=len(activities)):
+                verdicts = self.stage_budget.run("validation", self.validate_activities, activities)
+        except BudgetExceeded as e:
+            return self.stale_tick(e)
+        self.last_tick = (activities, verdicts)
+        return activities, verdicts
+
+    def stale_tick(self, reason):
+        """Reuse the most recent verdicts, marked stale, instead of reporting no activities"""
+        self.stale_ticks += 1
+        self.tracer.instant("stale_tick", reason=str(reason))
+        print(f"\n\033[93m⏳ {reason} - keeping the previous verdict\033[0m")
+        if self.last_tick is None:
+            return [], []
+        activities, verdicts = self.last_tick
+        return activities, [dict(v, stale=True) for v in verdicts]
+
+    def fallback_verdict(self):
+        """Fail open when the API can't answer; the verdict is marked degraded"""
+        return {"allowed": True, "reason": "Validation failed", "degraded": True}
+
+    def fail_open(self, verdicts, pending):
+        """Fill the pending slots with fallback verdicts"""
+        for slot in pending:
+            verdicts[slot] = self.fallback_verdict()
+        return verdicts
+
+    def metric_counters(self):
+        """Counters kept by the transport and caches, read when metrics are exported"""
+        api = self.transport.stats()
+        return {
+            "api_calls": api["calls"],
+            "api_retries": api["retries"],
+            "api_errors": api["failures"],
+            "api_tokens": api["prompt_tokens"] + api["completion_tokens"],
+            "vision_cache_hits": self.frame_dedup.hits,
+            "verdict_cache_hits": self.verdict_cache.hits,
+            "local_decisions": self.rule_engine.local_allows + self.rule_engine.local_denies,
+            "stale_ticks": self.stale_ticks,
+            "alerts_delivered": sum(self.alert_dispatcher.delivered.values()),
+            "alerts_suppressed": self.alert_dispatcher.coalesced + sum(self.alert_dispatcher.suppressed.values())
+        }
+
+    def start_trace(self, path):
+        """Record Chrome trace-event spans for every stage to path (open it in Perfetto)"""
+        self.tracer = Tracer(path)
+        self.transport.tracer = self.tracer
+        print(f"Tracing to {path}")
+
+    def start_metrics(self, port=None, path=None):
+        """Expose the metrics on localhost:port/metrics and/or rewrite them to path every few seconds"""
+        if port is None and not path:
+            return
+        self.metrics_exporter = MetricsExporter(self.metrics, port=port, path=path).start()
+        if port is not None:
+            print(f"Metrics: http://127.0.0.1:{port}/metrics")
+
+    def report_transport_state(self):
+        """Announce transitions into and out of the degraded (circuit open) state"""
+        degraded = self.transport.degraded
+        if degraded and not self.was_degraded:
+            print(f"\n\033[91m⚠️ Groq API degraded - pausing requests, activities are allowed until it recovers\033[0m")
+        elif self.was_degraded and not degraded:
+            print(f"\n\033[92m✅ Groq API recovered\033[0m")
+        self.was_degraded = degraded
+
+    def validate_activities(self, activities):
+        """Validate all activities from one frame in a single LLM request"""
+        verdicts, pending, keys = self.split_cached_verdicts(activities)
+
+        if len(pending) > 1:
+            started = time.monotonic()
+            try:
+                response = self.transport.chat(
+                    deadline=remaining_budget(), **self.batch_validation_request([activities[i] for i in pending]))
+            except Exception as e:
+                # The API didn't answer; one call per item would only add load during an outage
+                return self.fail_open(verdicts, pending)
+            batch = self.parse_batch_verdicts(response, len(pending))
+            pending = self.store_batch_verdicts(verdicts, pending, keys, batch, time.monotonic() - started)
+
+        # Per-item calls only for activities the batch didn't answer cleanly
+        for slot in pending:
+            verdicts[slot] = self.request_verdict(activities[slot], keys[slot])
+        return verdicts
+
+    async def validate_activities_async(self, activities):
+        """Async variant of validate_activities for the pipelined monitor"""
+        import asyncio
+        verdicts, pending, keys = self.split_cached_verdicts(activities)
+
+        if len(pending) > 1:
+            started = time.monotonic()
+            try:
+                response = await self.transport.achat(
+                    **self.batch_validation_request([activities[i] for i in pending]))
+            except Exception as e:
+                return self.fail_open(verdicts, pending)
+            batch = self.parse_batch_verdicts(response, len(pending))
+            pending = self.store_batch_verdicts(verdicts, pending, keys, batch, time.monotonic() - started)
+
+        fallback = await asyncio.gather(
+            *(self.request_verdict_async(activities[slot], keys[slot]) for slot in pending)
+        )
+        for slot, verdict in zip(pending, fallback):
+            verdicts[slot] = verdict
+        return verdicts
+
+    def start_journal(self, path):
+        """Open a fresh session journal and record what's needed to resume it"""
+        self.journal = SessionJournal(path)
+        self.journal.write("start", goal=self.user_goal, dynamic_rules=self.dynamic_rules,
+                           start_time=self.session_start_time.strftime("%Y-%m-%d %H:%M:%S"))
+
+    def resume_session(self, path):
+        """Rebuild an interrupted session from its journal and keep appending to it"""
+        replay = JournalReplay(path)
+        self.user_goal = replay.goal
+        self.dynamic_rules = replay.dynamic_rules
+        self.rule_engine = RuleEngine(self.dynamic_rules)
+        self.goal_rules_source = "journal"
+        self.session_start_time = replay.start_time
+        self.session_totals = replay.totals
+        self.paused_seconds = replay.paused_seconds
+        if replay.last_record_time is not None:
+            # The downtime since the crash isn't in the journal yet; it ends with the resume record below
+            self.paused_seconds += max(0.0, time.time() - replay.last_record_time)
+        self.blocked = replay.blocked
+        self.journal = SessionJournal(path)
+        self.journal.write("resume")
+        print(f"\033[92mResumed session from {path}: {replay.totals.entries} log entries "
+              f"since {replay.start_time.strftime('%Y-%m-%d %H:%M:%S')}\033[0m")
+
+    def close_log_entry(self, now, now_mono):
+        """Close the ongoing activity into the running totals and the journal"""
+        entry = self.current_entry.close(now, now_mono)
+        self.current_entry = None
+        self.session_totals.add(entry)
+        if self.journal:
+            self.journal.write("entry", entry=entry.to_record())
 
     def update_session_analytics(self, activity, validation_result):
         """Update session analytics with current activity"""
-        now = datetime.datetime.now()
+        now, now_mono = time.time(), time.monotonic()
         
         # If there's an ongoing activity, log it
-        if self.current_activity and self.current_activity_start:
-            duration = (now - self.current_activity_start).total_seconds()
-            
-            log_entry = {
-                "activity": self.current_activity,
-                "start_time": self.current_activity_start.strftime("%H:%M:%S"),
-                "end_time": now.strftime("%H:%M:%S"),
-                "duration_seconds": duration,
-                "productive": self.current_activity.get("is_productive", False)
-            }
-            
-            self.session_log.append(log_entry)
-            
-            # Update productivity counters
-            if log_entry["productive"]:
-                self.productive_time += duration
-            else:
-                self.distraction_time += duration
+        if self.current_entry:
+            self.close_log_entry(now, now_mono)
         
         # Set the new current activity
         if activity:
-            activity_copy = activity.copy()
-            activity_copy["is_productive"] = validation_result.get("allowed", True)
-            self.current_activity = activity_copy
-            self.current_activity_start = now
+            self.current_entry = LogEntry(activity.get("name"), activity.get("type"), now, now_mono,
+                                          productive=validation_result.get("allowed", True),
+                                          stale=bool(validation_result.get("stale")))
+
+    def traced_validation_result(self, result, activity):
+        with self.tracer.span("handle_validation_result", activity=activity.get("name")):
+            self.handle_validation_result(result, activity)
 
     def handle_validation_result(self, result, activity):
         """Handle validation results with dynamic responses"""
         # Update session analytics
         self.update_session_analytics(activity, result)
+
+        # A stale verdict keeps time accounting going but never re-alerts
+        if result.get("stale"):
+            return
         
         if not result.get("allowed", True):
-            # Build warning message
-            warning_msg = f"\033[91m⚠️ {result.get('reason', 'Unproductive activity detected')}\033[0m"
-            if "suggestion" in result:
-                warning_msg += f"\n\033[93m💡 {result['suggestion']}\033[0m"
-            
-            # Get severity level for sound and popup
-            severity = result.get("severity", "medium")
-            
-            # Play warning sound
-            self.play_warning_sound(severity)
-            
-            # Show popup window with warning
-            title = "⚠️ Focus Alert"
-            if severity == "high":
-                title = "🚨 URGENT FOCUS ALERT"
-            elif severity == "low":
-                title = "⚠️ Mild Focus Alert"
-                
-            popup_message = f"{result.get('reason', 'Potential distraction detected')}"
-            if "suggestion" in result:
-                popup_message += f"\n\n💡 {result['suggestion']}"
-                
-            self.show_warning_popup(title, popup_message, severity)
-            
-            # Show system notification as a backup
-            if notification:
-                try:
-                    notification.notify(
-                        title="Focus Alert",
-                        message=result.get("reason", "Potential distraction detected"),
-                        timeout=10
-                    )
-                except Exception as e:
-                    pass
-            
-            print(warning_msg)
-            
+            self.metrics.inc("distractions")
+            # Sound, popup, notification and console run on the dispatcher thread,
+            # which coalesces repeats, rate-limits each channel and times each delivery
+            self.alert_dispatcher.submit(result, activity)
+
             # Handle SFM mode
             if self.sfm_mode:
+                # With adaptive scheduling a strike only counts once the burst confirms it
+                if self.scheduler and not self.scheduler.distraction_confirmed:
+                    print("SFM: confirming distraction before counting a warning")
+                    return
                 self.distraction_count += 1
                 print(f"SFM Warnings: {self.distraction_count}/3")
                 if self.distraction_count >= 3:
                     self.block_distraction(result.get("reason", "Repeated distractions"))
 
+    def alert_sound(self, alert):
+        with self.tracer.span("sound", severity=alert["severity"]):
+            self.play_warning_sound(alert["severity"])
+
+    def alert_popup(self, alert):
+        severity = alert["severity"]
+        title = "⚠️ Focus Alert"
+        if severity == "high":
+            title = "🚨 URGENT FOCUS ALERT"
+        elif severity == "low":
+            title = "⚠️ Mild Focus Alert"
+            
+        popup_message = f"{alert.get('reason', 'Potential distraction detected')}"
+        if "suggestion" in alert:
+            popup_message += f"\n\n💡 {alert['suggestion']}"
+        if alert["repeats"] > 1:
+            popup_message += f"\n\n(seen {alert['repeats']} times in {alert['repeat_seconds']}s)"
+            
+        with self.tracer.span("popup", severity=severity):
+            self.show_warning_popup(title, popup_message, severity)
+
+    def alert_notification(self, alert):
+        """System notification as a backup"""
+        plyer = optional_import("plyer")
+        if plyer:
+            try:
+                plyer.notification.notify(
+                    title="Focus Alert",
+                    message=alert.get("reason", "Potential distraction detected"),
+                    timeout=10
+                )
+            except Exception as e:
+                pass
+
+    def alert_console(self, alert):
+        warning_msg = f"\033[91m⚠️ {alert.get('reason', 'Unproductive activity detected')}\033[0m"
+        if alert["repeats"] > 1:
+            warning_msg += f" \033[90m(x{alert['repeats']} in {alert['repeat_seconds']}s, {alert['severity']})\033[0m"
+        if "suggestion" in alert:
+            warning_msg += f"\n\033[93m💡 {alert['suggestion']}\033[0m"
+        print(warning_msg)
+
     def block_distraction(self, reason):
         """Take action against distractions"""
         try:
@@ -460,106 +784,58 @@ class ProcrastinationPreventer:
                                   "high")
             
             self.blocked = True
+            if self.journal:
+                self.journal.write("block", reason=reason)
         except Exception as e:
             print(f"Blocking error: {str(e)}")
 
     def generate_session_analysis(self):
         """Generate an analysis of the focus session"""
         # Finalize the current activity if there is one
-        if self.current_activity and self.current_activity_start:
-            now = datetime.datetime.now()
-            duration = (now - self.current_activity_start).total_seconds()
-            
-            log_entry = {
-                "activity": self.current_activity,
-                "start_time": self.current_activity_start.strftime("%H:%M:%S"),
-                "end_time": now.strftime("%H:%M:%S"),
-                "duration_seconds": duration,
-                "productive": self.current_activity.get("is_productive", False)
-            }
-            
-            self.session_log.append(log_entry)
-            
-            # Update productivity counters
-            if log_entry["productive"]:
-                self.productive_time += duration
-            else:
-                self.distraction_time += duration
-        
-        # Calculate session statistics
-        session_duration = (datetime.datetime.now() - self.session_start_time).total_seconds()
-        productive_percentage = (self.productive_time / session_duration * 100) if session_duration > 0 else 0
-        
-        # Get most common activities
-        activity_counts = {}
-        for entry in self.session_log:
-            activity_name = entry["activity"].get("name", "Unknown")
-            if activity_name in activity_counts:
-                activity_counts[activity_name] += entry["duration_seconds"]
-            else:
-                activity_counts[activity_name] = entry["duration_seconds"]
-        
-        # Sort activities by time spent
-        sorted_activities = sorted(activity_counts.items(), key=lambda x: x[1], reverse=True)
-        
-        # Generate activity distribution
-        top_activities = []
-        for activity, duration in sorted_activities[:5]:  # Top 5 activities
-            percentage = (duration / session_duration * 100) if session_duration > 0 else 0
-            top_activities.append({
-                "name": activity,
-                "duration_minutes": round(duration / 60, 1),
-                "percentage": round(percentage, 1)
-            })
-        
-        # Count distractions
-        distraction_entries = [entry for entry in self.session_log if not entry["productive"]]
+        now = datetime.datetime.now()
+        if self.current_entry:
+            self.close_log_entry(now.timestamp(), time.monotonic())
         
-        # Format results
-        analysis = {
-            "session_summary": {
-                "goal": self.user_goal,
-                "start_time": self.session_start_time.strftime("%Y-%m-%d %H:%M:%S"),
-                "end_time": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                "duration_minutes": round(session_duration / 60, 1),
-                "productivity_rate": round(productive_percentage, 1),
-                "distraction_count": len(distraction_entries),
-                "blocks_triggered": 1 if self.blocked else 0
-            },
-            "time_distribution": {
-                "productive_minutes": round(self.productive_time / 60, 1),
-                "distracted_minutes": round(self.distraction_time / 60, 1),
-                "productivity_percentage": round(productive_percentage, 1)
+        # Downtime between a crash and --resume doesn't count toward the session
+        session_duration = (now - self.session_start_time).total_seconds() - self.paused_seconds
+        analysis = self.session_totals.analysis(self.user_goal, self.session_start_time, now,
+                                                session_duration, self.blocked)
+        analysis.update({
+            "vision_cache": self.frame_dedup.stats(),
+            "image_encoding": self.encoder.stats(),
+            "transport": self.transport.stats(),
+            "budget": dict(stale_ticks=self.stale_ticks, **self.stage_budget.stats()),
+            "capture": dict(mode=self.capture_mode, **self.window_locator.stats()),
+            "verdict_cache": self.verdict_cache.stats(),
+            "local_rules": self.rule_engine.stats(),
+            "alerts": self.alert_dispatcher.stats(),
+            "goal_rules": {
+                "source": self.goal_rules_source,
+                "profile": self.profile_name,
+                "profile_switches": self.profile_switches,
+                **({"cache": self.goal_cache.stats()} if self.goal_cache else {})
             },
-            "top_activities": top_activities,
-            "distraction_patterns": {}
-        }
-        
-        # If we have enough data, let's analyze patterns
-        if len(distraction_entries) > 2:
-            # Simplified pattern detection using time-of-day
-            morning_distractions = 0
-            afternoon_distractions = 0
-            evening_distractions = 0
-            
-            for entry in distraction_entries:
-                hour = int(entry["start_time"].split(":")[0])
-                if 5 <= hour < 12:
-                    morning_distractions += 1
-                elif 12 <= hour < 18:
-                    afternoon_distractions += 1
-                else:
-                    evening_distractions += 1
-            
-            analysis["distraction_patterns"] = {
-                "morning_count": morning_distractions,
-                "afternoon_count": afternoon_distractions,
-                "evening_count": evening_distractions,
-                "peak_time": "Morning" if morning_distractions > afternoon_distractions and morning_distractions > evening_distractions else
-                            "Afternoon" if afternoon_distractions > morning_distractions and afternoon_distractions > evening_distractions else
-                            "Evening"
+            "batch_validation": {
+                "batched_requests": self.batch_requests,
+                "fallback_items": self.batch_fallback_items
             }
-        
+        })
+
+        if self.journal:
+            analysis["journal"] = self.journal.stats()
+
+        if self.audio:
+            analysis["audio"] = self.audio.stats()
+
+        if self.pipeline_stats:
+            analysis["pipeline"] = self.pipeline_stats.summary()
+
+        if self.scheduler:
+            analysis["schedule"] = self.scheduler.stats()
+
+        if self.tick_scheduler:
+            analysis["ticks"] = self.tick_scheduler.stats()
+
         return analysis
 
     def print_session_analysis(self):
@@ -603,63 +879,307 @@ class ProcrastinationPreventer:
             print(f"  Peak Distraction Time: {analysis['distraction_patterns']['peak_time']}")
         
         print(f"  Blocks Triggered: {summary['blocks_triggered']}")
+        alerts = analysis["alerts"]
+        print(f"  Alerts: {alerts['received']} raised, {alerts['coalesced']} coalesced, {alerts['escalated']} escalated")
+        print(f"  Delivered: {format_channels(alerts['delivered'])}  Rate-limited: {format_channels(alerts['suppressed'])}")
+        if "audio" in analysis:
+            audio = analysis["audio"]
+            print(f"  Alert Tones: {audio['played']} played ({audio['backend']}), {audio['dropped']} dropped")
+        if "journal" in analysis:
+            print(f"  Journal: {analysis['journal']['path']}")
+
+        goal_rules = analysis["goal_rules"]
+        print(f"  Goal Rules: {goal_rules['source']}  Profile Switches: {goal_rules['profile_switches']}")
+
+        # API reliability
+        api = analysis["transport"]
+        print("\n\033[1m\033[96m🌐 API\033[0m")
+        print(f"  Calls: {api['calls']}  Retries: {api['retries']}  Failures: {api['failures']}  Short-circuited: {api['short_circuits']}  "
+              f"Cut by Budget: {api['deadline_cuts']}")
+        budget = analysis["budget"]
+        print(f"  Stale Ticks: {budget['stale_ticks']}  Budget Overruns: {budget['overruns'] or 'none'}")
         
+        # Vision call savings from frame deduplication
+        cache = analysis["vision_cache"]
+        print("\n\033[1m\033[96m🖼️ VISION CACHE\033[0m")
+        print(f"  Reused Frames: {cache['hits']}  Vision Calls: {cache['misses']}  Hit Rate: {cache['hit_rate']}%")
+
+        # Upload payload per vision call
+        encoding = analysis["image_encoding"]
+        print(f"  Payload: {encoding['avg_payload_kb']} KB avg ({encoding['format']})  Encode: {encoding['avg_encode_ms']} ms avg")
+
+        # Validation calls answered from the verdict cache
+        verdicts = analysis["verdict_cache"]
+        print("\n\033[1m\033[96m🧠 VERDICT CACHE\033[0m")
+        print(f"  Cached Verdicts: {verdicts['hits']}  LLM Validations: {verdicts['misses']}  Hit Rate: {verdicts['hit_rate']}%")
+        print(f"  Latency Saved: ~{verdicts['latency_saved_seconds']}s")
+        local = analysis["local_rules"]
+        print(f"  Local Decisions: {local['local_ratio']}% ({local['local_allows']} allowed, {local['local_denies']} denied, {local['escalated']} escalated)")
+
+        # Cycles that overran their period
+        if "ticks" in analysis:
+            ticks = analysis["ticks"]
+            print("\n\033[1m\033[96m⏱️ TICKS\033[0m")
+            print(f"  Total: {ticks['ticks']}  Late: {ticks['late_ticks']}  Skipped: {ticks['skipped_ticks']}  Max Lateness: {ticks['max_lateness_seconds']}s")
+
+        # Capture cadence chosen by the adaptive scheduler
+        if "schedule" in analysis:
+            schedule = analysis["schedule"]
+            print("\n\033[1m\033[96m⏲️ ADAPTIVE SCHEDULE\033[0m")
+            print(f"  Captures: {schedule['ticks']}  Avg Interval: {schedule['avg_interval_seconds']}s")
+
+        # Frame freshness in the async pipeline
+        if "pipeline" in analysis:
+            pipeline = analysis["pipeline"]
+            print("\n\033[1m\033[96m⚙️ PIPELINE\033[0m")
+            print(f"  Frames Captured: {pipeline['frames_captured']}  Dropped: {pipeline['frames_dropped']}")
+            print(f"  Verdict Age: avg {pipeline['avg_verdict_age_seconds']}s, max {pipeline['max_verdict_age_seconds']}s")
+
         # Final output
         print("\n" + "="*60)
         print(f"\033[1m\033[92m💾 Full analysis saved to: {filename}\033[0m")
         print("="*60 + "\n")
 
-    def monitor(self, interval):
-        """Main monitoring loop"""
+    def schedule_next(self, activities, verdicts):
+        """Let the adaptive scheduler pick the delay before the next capture"""
+        # Stale verdicts say nothing new about the screen, keep the current cadence
+        if not self.scheduler or any(v.get("stale") for v in verdicts):
+            return
+        signature = tuple(sorted(activity_signature(a) for a in activities))
+        distracted = any(not v.get("allowed", True) for v in verdicts)
+        self.next_interval = self.scheduler.observe(signature, distracted)
+
+    def print_monitor_banner(self):
+        """Print the monitoring configuration"""
         print(f"\n\033[92mStarting Focus Guardian\033[0m")
         print(f"User Goal: {self.user_goal}")
         print(f"SFM Mode: {'ENABLED (3-strike rule)' if self.sfm_mode else 'DISABLED'}")
         print(f"Sound Alerts: {'ENABLED' if self.sound_enabled else 'DISABLED'}")
         print(f"Popup Alerts: {'ENABLED' if self.popup_enabled else 'DISABLED'}")
+        print(f"Goal Rules: {self.goal_rules_source}{f' (profile {self.profile_name})' if self.profile_name else ''}")
+        if self.scheduler:
+            print(f"Adaptive Interval: {self.scheduler.base_interval}-{self.scheduler.max_interval}s")
+
+    def stop_monitoring(self):
+        """Shut down monitoring and report the session"""
+        self.running = False
+        print("\n\033[93mMonitoring stopped\033[0m")
+        # Deliver pending alerts, then close all popup windows on exit
+        self.alert_dispatcher.close()
+        self.close_all_popups()
+        if self.audio:
+            self.audio.close()
+        if self.tick_scheduler:
+            self.tick_scheduler.stop()
+        # Keep cached verdicts warm for the next session
+        self.verdict_cache.save()
+        if self.metrics_exporter:
+            self.metrics_exporter.stop()
+        self.tracer.close()
+        # Show session analysis on exit
+        self.print_session_analysis()
+        if self.journal:
+            self.journal.write("end")
+            self.journal.close()
+
+    def monitor(self, interval):
+        """Main monitoring loop"""
+        self.print_monitor_banner()
+        self.start_command_listener()
+        self.next_interval = interval
+        self.tick_scheduler = TickScheduler(interval)
+
+        # One long-lived renderer instead of a progress thread per tick
+        progress_thread = threading.Thread(target=self.show_progress_bar, name="progress", daemon=True)
+        progress_thread.start()
         
         try:
-            while self.running:
-                progress_thread = threading.Thread(target=self.show_progress_bar, args=(interval,))
-                progress_thread.start()
-                
-                # Capture and analyze screen
-                activities = self.capture_and_analyze().get("activities", [])
-                
-                # Validate each activity
-                for activity in activities:
-                    validation = self.validate_activity(activity)
-                    self.handle_validation_result(validation, activity)
-                
-                progress_thread.join()
+            while self.running and self.tick_scheduler.wait(self.next_interval):
+                self.apply_pending_profile()
+                with self.tracer.span("tick", tick=self.tick_scheduler.ticks):
+                    # Capture, analyze and validate every activity within the tick budget
+                    activities, verdicts = self.run_tick()
+                    self.report_transport_state()
+                    self.schedule_next(activities, verdicts)
+                    for activity, validation in zip(activities, verdicts):
+                        self.traced_validation_result(validation, activity)
                 
         except KeyboardInterrupt:
-            self.running = False
-            print("\n\033[93mMonitoring stopped\033[0m")
-            # Close all popup windows on exit
-            self.close_all_popups()
-            # Show session analysis on exit
-            self.print_session_analysis()
+            self.stop_monitoring()
+
+    def monitor_async(self, interval):
+        """Pipelined monitoring loop that overlaps capture, vision and validation"""
+        self.print_monitor_banner()
+        print("Pipeline: ASYNC (latest frame wins)")
+        self.start_command_listener()
+        import asyncio
+
+        try:
+            asyncio.run(self.run_pipeline(interval))
+        except KeyboardInterrupt:
+            self.stop_monitoring()
+
+    async def run_pipeline(self, interval):
+        """Run the capture, vision and validation stages concurrently"""
+        import asyncio
+        from async_pipeline import LatestFrameQueue, PipelineStats
+        self.pipeline_stats = PipelineStats()
+        self.next_interval = interval
+        self.tick_scheduler = TickScheduler(interval)
+        frames = LatestFrameQueue()
+        results = LatestFrameQueue()
+
+        async def capture_stage():
+            while self.running:
+                await asyncio.sleep(self.tick_scheduler.next_delay(self.next_interval))
+                try:
+                    with self.metrics.time("capture"):
+                        screenshot, box = await asyncio.to_thread(self.capture_screen)
+                    self.pipeline_stats.frames_captured += 1
+                    if frames.put((time.monotonic(), screenshot, box)):
+                        self.pipeline_stats.frames_dropped += 1
+                except Exception as e:
+                    print(f"Capture error: {str(e)}")
+
+        async def vision_stage():
+            while self.running:
+                captured_at, screenshot, box = await frames.get()
+                try:
+                    with self.tracer.span("vision_stage"):
+                        result = await self.stage_budget.run_async("vision", self.analyze_frame_async(screenshot, box))
+                    activities = result.get("activities", [])
+                except BudgetExceeded as e:
+                    activities = e  # The validation stage falls back to the stale verdict
+                if results.put((captured_at, activities)):
+                    self.pipeline_stats.results_dropped += 1
+
+        async def validation_stage():
+            while self.running:
+                captured_at, activities = await results.get()
+                self.apply_pending_profile()
+                try:
+                    if isinstance(activities, BudgetExceeded):
+                        raise activities
+                    with self.metrics.time("validation"), self.tracer.span("validation_stage"):
+                        verdicts = await self.stage_budget.run_async(
+                            "validation", self.validate_activities_async(activities))
+                    self.last_tick = (activities, verdicts)
+                except BudgetExceeded as e:
+                    activities, verdicts = self.stale_tick(e)
+                self.report_transport_state()
+                self.schedule_next(activities, verdicts)
+                for activity, validation in zip(activities, verdicts):
+                    # Alerts can block (sounds, notifications), keep them off the event loop
+                    await asyncio.to_thread(self.traced_validation_result, validation, activity)
+                self.pipeline_stats.record_verdict_age(time.monotonic() - captured_at)
+
+        await asyncio.gather(capture_stage(), vision_stage(), validation_stage())
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="AI-Powered Focus Guardian")
     parser.add_argument("goal", type=str, help="Your work goal in natural language", nargs='?')
+    parser.add_argument("--profile", type=str,
+                       help="Start with a saved goal profile instead of a goal (no LLM call); switch mid-session with 'profile NAME'")
+    parser.add_argument("--save-profile", type=str, metavar="NAME",
+                       help="Save this session's goal and generated rules as a named profile")
+    parser.add_argument("--profiles", type=str, default="goal_profiles.json",
+                       help="Goal profile library (default: goal_profiles.json)")
+    parser.add_argument("--goal-cache", type=str, default="goal_rules_cache.json",
+                       help="On-disk cache of rules generated per goal (default: goal_rules_cache.json)")
+    parser.add_argument("--no-goal-cache", action="store_true",
+                       help="Ask the LLM for fresh goal rules, replacing the cached ones")
     parser.add_argument("--sfm", action="store_true", 
                        help="Enable Super Focus Mode (3 warnings then block)")
     parser.add_argument("--interval", type=int, default=10,
                        help="Monitoring interval in seconds (default: 10)")
+    parser.add_argument("--adaptive", action="store_true",
+                       help="Back off while the screen is stable and speed up on changes or distractions")
+    parser.add_argument("--max-interval", type=int,
+                       help="Longest adaptive interval in seconds (default: 6x --interval)")
+    parser.add_argument("--schedule-log", type=str,
+                       help="Append adaptive scheduling decisions to this JSONL file")
     parser.add_argument("--no-sound", action="store_true",
                        help="Disable warning sounds")
+    parser.add_argument("--sound-wav-dir", type=str,
+                       help="Write alert tones to numbered .wav files in this directory instead of playing them")
+    parser.add_argument("--alert-window", type=int, default=60,
+                       help="Seconds within which repeats of the same distraction are coalesced (default: 60)")
+    parser.add_argument("--alert-escalate-after", type=int, default=3,
+                       help="Repeats of a coalesced distraction before its severity goes up a level (default: 3)")
     parser.add_argument("--no-popup", action="store_true",
                        help="Disable popup warnings")
     parser.add_argument("--analyze", type=str,
-                       help="Analyze a previous session JSON file")
+                       help="Analyze a previous session JSON file or session journal (.jsonl), "
+                            "or aggregate every session in a directory or glob")
+    parser.add_argument("--analyze-workers", type=int,
+                       help="Worker processes for parsing session files in bulk (default: CPU count)")
+    parser.add_argument("--analyze-cache", type=str,
+                       help="Per-file summary cache for bulk analysis (default: .focus_analyze_cache.json)")
+    parser.add_argument("--journal", type=str,
+                       help="Session journal to stream log entries to (default: focus_session_<timestamp>.jsonl)")
+    parser.add_argument("--resume", type=str, metavar="JOURNAL",
+                       help="Resume an interrupted session from its journal")
+    parser.add_argument("--async", dest="use_async", action="store_true",
+                       help="Overlap capture, vision and validation in an asyncio pipeline")
+    parser.add_argument("--capture", choices=["screen", "window"], default="screen",
+                       help="Capture the full screen or only the focused window (default: screen)")
+    parser.add_argument("--image-format", type=str.upper, default="JPEG", choices=["PNG", "JPEG", "WEBP"],
+                       help="Screenshot upload format (default: JPEG)")
+    parser.add_argument("--image-quality", type=int, default=80,
+                       help="JPEG/WebP quality 1-100 (default: 80)")
+    parser.add_argument("--max-image-edge", type=int, default=1600,
+                       help="Downscale screenshots so the long edge fits, 0 for full resolution (default: 1600)")
+    parser.add_argument("--base-url", type=str, default=os.environ.get("GROQ_BASE_URL"),
+                       help="Groq-compatible API base URL, e.g. a local groq_standin.py (default: $GROQ_BASE_URL)")
+    parser.add_argument("--api-timeout", type=float, default=20,
+                       help="Per-request API timeout in seconds (default: 20)")
+    parser.add_argument("--max-retries", type=int, default=3,
+                       help="Retries for timeouts, 429s and 5xx errors, with jittered backoff (default: 3)")
+    parser.add_argument("--vision-budget", type=float, default=15,
+                       help="Seconds the vision stage may take per tick before the previous verdict is reused (default: 15, 0 = unbounded)")
+    parser.add_argument("--validation-budget", type=float, default=10,
+                       help="Seconds the validation stage may take per tick (default: 10, 0 = unbounded)")
+    parser.add_argument("--metrics-port", type=int,
+                       help="Serve Prometheus metrics (per-stage latency histograms, API/cache counters) on 127.0.0.1:PORT/metrics")
+    parser.add_argument("--metrics-file", type=str,
+                       help="Rewrite the same metrics to this file every 5 seconds (e.g. for node_exporter's textfile collector)")
+    parser.add_argument("--trace", type=str, metavar="FILE",
+                       help="Record per-stage spans of every cycle as Chrome trace-event JSON (open in Perfetto)")
+    parser.add_argument("--no-dedup", action="store_true",
+                       help="Send every frame to the vision model, even if the screen is unchanged")
+    parser.add_argument("--dedup-threshold", type=int, default=5,
+                       help="Max perceptual-hash distance treated as an unchanged screen (default: 5)")
+    parser.add_argument("--dedup-max-age", type=int, default=120,
+                       help="Seconds a reused vision result stays valid (default: 120)")
+    parser.add_argument("--no-local-rules", action="store_true",
+                       help="Send every activity to the LLM instead of deciding clear-cut cases locally")
+    parser.add_argument("--verdict-cache-size", type=int, default=512,
+                       help="Max cached validation verdicts, 0 to disable (default: 512)")
+    parser.add_argument("--verdict-cache-ttl", type=int, default=3600,
+                       help="Seconds a cached verdict stays valid (default: 3600)")
+    parser.add_argument("--verdict-cache-file", type=str,
+                       help="Persist cached verdicts to this JSON file across sessions")
     args = parser.parse_args()
     
     # Check if we're just analyzing a previous session
+    if args.analyze and (os.path.isdir(args.analyze) or any(c in args.analyze for c in "*?[")):
+        try:
+            from bulk_analysis import analyze_many, print_bulk_analysis
+            result, errors = analyze_many(args.analyze, args.analyze_cache, args.analyze_workers)
+            print_bulk_analysis(result, errors)
+            exit(0)
+        except Exception as e:
+            print(f"Error analyzing sessions: {str(e)}")
+            exit(1)
+
     if args.analyze:
         try:
-            with open(args.analyze, "r") as f:
-                analysis_data = json.load(f)
+            if args.analyze.endswith(".jsonl"):
+                # Journals survive crashes; rebuild the analysis from the durable log entries
+                analysis_data = JournalReplay(args.analyze).analysis()
+            else:
+                with open(args.analyze, "r") as f:
+                    analysis_data = json.load(f)
             
             # Print analysis header
             print("\n" + "="*60)
@@ -691,7 +1211,69 @@ if __name__ == "__main__":
                 print(f"  Peak Distraction Time: {analysis_data['distraction_patterns']['peak_time']}")
             
             print(f"  Blocks Triggered: {summary['blocks_triggered']}")
+
+            if "alerts" in analysis_data:
+                alerts = analysis_data["alerts"]
+                print(f"  Alerts: {alerts['received']} raised, {alerts['coalesced']} coalesced, {alerts['escalated']} escalated")
+                print(f"  Delivered: {format_channels(alerts['delivered'])}  Rate-limited: {format_channels(alerts['suppressed'])}")
+
+            if "audio" in analysis_data:
+                audio = analysis_data["audio"]
+                print(f"  Alert Tones: {audio['played']} played ({audio['backend']}), {audio['dropped']} dropped")
+
+            if analysis_data.get("journal", {}).get("interrupted"):
+                print(f"  Interrupted session rebuilt from {analysis_data['journal']['entries']} journal entries "
+                      f"(resume with --resume {args.analyze})")
             
+            if "goal_rules" in analysis_data:
+                goal_rules = analysis_data["goal_rules"]
+                print(f"  Goal Rules: {goal_rules['source']}  Profile Switches: {goal_rules['profile_switches']}")
+
+            if "transport" in analysis_data:
+                api = analysis_data["transport"]
+                print("\n\033[1m\033[96m🌐 API\033[0m")
+                print(f"  Calls: {api['calls']}  Retries: {api['retries']}  Failures: {api['failures']}  Short-circuited: {api['short_circuits']}  "
+                      f"Cut by Budget: {api.get('deadline_cuts', 0)}")
+
+            if "budget" in analysis_data:
+                budget = analysis_data["budget"]
+                print(f"  Stale Ticks: {budget['stale_ticks']}  Budget Overruns: {budget['overruns'] or 'none'}")
+
+            if "vision_cache" in analysis_data:
+                cache = analysis_data["vision_cache"]
+                print("\n\033[1m\033[96m🖼️ VISION CACHE\033[0m")
+                print(f"  Reused Frames: {cache['hits']}  Vision Calls: {cache['misses']}  Hit Rate: {cache['hit_rate']}%")
+
+            if "image_encoding" in analysis_data:
+                encoding = analysis_data["image_encoding"]
+                print(f"  Payload: {encoding['avg_payload_kb']} KB avg ({encoding['format']})  Encode: {encoding['avg_encode_ms']} ms avg")
+
+            if "verdict_cache" in analysis_data:
+                verdicts = analysis_data["verdict_cache"]
+                print("\n\033[1m\033[96m🧠 VERDICT CACHE\033[0m")
+                print(f"  Cached Verdicts: {verdicts['hits']}  LLM Validations: {verdicts['misses']}  Hit Rate: {verdicts['hit_rate']}%")
+                print(f"  Latency Saved: ~{verdicts['latency_saved_seconds']}s")
+
+            if "local_rules" in analysis_data:
+                local = analysis_data["local_rules"]
+                print(f"  Local Decisions: {local['local_ratio']}% ({local['local_allows']} allowed, {local['local_denies']} denied, {local['escalated']} escalated)")
+
+            if "ticks" in analysis_data:
+                ticks = analysis_data["ticks"]
+                print("\n\033[1m\033[96m⏱️ TICKS\033[0m")
+                print(f"  Total: {ticks['ticks']}  Late: {ticks['late_ticks']}  Skipped: {ticks['skipped_ticks']}  Max Lateness: {ticks['max_lateness_seconds']}s")
+
+            if "schedule" in analysis_data:
+                schedule = analysis_data["schedule"]
+                print("\n\033[1m\033[96m⏲️ ADAPTIVE SCHEDULE\033[0m")
+                print(f"  Captures: {schedule['ticks']}  Avg Interval: {schedule['avg_interval_seconds']}s")
+
+            if "pipeline" in analysis_data:
+                pipeline = analysis_data["pipeline"]
+                print("\n\033[1m\033[96m⚙️ PIPELINE\033[0m")
+                print(f"  Frames Captured: {pipeline['frames_captured']}  Dropped: {pipeline['frames_dropped']}")
+                print(f"  Verdict Age: avg {pipeline['avg_verdict_age_seconds']}s, max {pipeline['max_verdict_age_seconds']}s")
+
             print("\n" + "="*60 + "\n")
             exit(0)
         except Exception as e:
@@ -699,14 +1281,59 @@ if __name__ == "__main__":
             exit(1)
     
     # Check if we have a goal
-    if not args.goal:
+    if not args.goal and not args.resume and not args.profile:
         print("Error: Please provide a work goal or use --analyze to review a previous session")
         print("Example: python procrastination_preventer.py 'Work on my thesis for 2 hours'")
         exit(1)
 
-    guardian = ProcrastinationPreventer()
-    guardian.parse_user_goal(args.goal)
+    guardian = ProcrastinationPreventer(base_url=args.base_url, api_timeout=args.api_timeout,
+                                        max_retries=args.max_retries)
+    guardian.verdict_cache = VerdictCache(max_entries=args.verdict_cache_size,
+                                          ttl=args.verdict_cache_ttl,
+                                          path=args.verdict_cache_file)
+    guardian.goal_profiles = GoalProfiles(args.profiles)
+    if args.resume:
+        guardian.resume_session(args.resume)
+    else:
+        guardian.goal_cache = GoalRulesCache(args.goal_cache)
+        guardian.refresh_goal_rules = args.no_goal_cache
+        if args.profile:
+            if not guardian.use_profile(args.profile):
+                print(f"Error: No profile named '{args.profile}' in {args.profiles}")
+                exit(1)
+        else:
+            guardian.parse_user_goal(args.goal)
+        if args.save_profile and guardian.goal_rules_source == "none":
+            print(f"Not saving profile '{args.save_profile}': no rules were generated for this goal")
+        elif args.save_profile:
+            guardian.goal_profiles.save_profile(args.save_profile, guardian.user_goal, guardian.dynamic_rules)
+            print(f"Saved goal profile '{args.save_profile}' to {args.profiles}")
+        guardian.start_journal(args.journal or
+                               f"focus_session_{guardian.session_start_time.strftime('%Y%m%d_%H%M%S')}.jsonl")
     guardian.sfm_mode = args.sfm
     guardian.sound_enabled = not args.no_sound
+    if guardian.sound_enabled:
+        guardian.start_audio(args.sound_wav_dir)
     guardian.popup_enabled = not args.no_popup
-    guardian.monitor(args.interval)
+    guardian.alert_dispatcher.window = args.alert_window
+    if args.no_sound:
+        guardian.alert_dispatcher.remove_channel("sound")
+    if args.no_popup:
+        guardian.alert_dispatcher.remove_channel("popup")
+    guardian.alert_dispatcher.escalate_after = max(1, args.alert_escalate_after)
+    guardian.capture_mode = args.capture
+    guardian.stage_budget = StageBudget({"vision": args.vision_budget, "validation": args.validation_budget})
+    if args.adaptive:
+        guardian.scheduler = AdaptiveScheduler(args.interval, args.max_interval, log_path=args.schedule_log)
+    guardian.local_rules_enabled = not args.no_local_rules
+    guardian.encoder = ScreenEncoder(args.image_format, args.image_quality, args.max_image_edge)
+    guardian.frame_dedup.enabled = not args.no_dedup
+    guardian.frame_dedup.threshold = args.dedup_threshold
+    guardian.frame_dedup.max_reuse_age = args.dedup_max_age
+    guardian.start_metrics(args.metrics_port, args.metrics_file)
+    if args.trace:
+        guardian.start_trace(args.trace)
+    if args.use_async:
+        guardian.monitor_async(args.interval)
+    else:
+        guardian.monitor(args.interval)
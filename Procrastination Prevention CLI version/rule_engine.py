@@ -0,0 +1,181 @@
+# rule_engine.py
+import re
+
+STOPWORDS = {
+    "the", "and", "for", "with", "must", "should", "only", "that", "this", "from",
+    "into", "about", "contain", "contains", "related", "content", "titles", "title",
+    "video", "videos", "page", "pages", "usage", "use", "using", "keywords", "allowed",
+    "are", "not", "any", "all", "etc", "such", "like"
+}
+
+# Second-level labels skipped when naming a domain, as in bbc.co.uk
+GENERIC_LABELS = {"co", "com", "org", "net", "gov", "edu", "ac"}
+
+DOMAIN_PATTERN = re.compile(r"[a-z0-9-]+(?:\.[a-z0-9-]+)*\.[a-z]{2,}")
+WORD_PATTERN = re.compile(r"[a-z0-9+#]+")
+
+
+def extract_domain(name):
+    """Pull a bare domain out of an activity name or URL, or None for app names"""
+    # Only the leading token counts, so "VS Code - main.py" stays an app name
+    text = re.sub(r"^[a-z]+://", "", name.strip().lower())
+    token = re.split(r"[\s/:?#]", text, maxsplit=1)[0]
+    if not DOMAIN_PATTERN.fullmatch(token):
+        return None
+    return token[4:] if token.startswith("www.") else token
+
+
+def compact_name(name):
+    """Normalize an app name so "VS Code" and "vscode" compare equal"""
+    return re.sub(r"[^a-z0-9]", "", name.lower())
+
+
+def domain_stem(domain):
+    """The name part of a domain, e.g. "twitter" for mobile.twitter.com or "bbc" for bbc.co.uk"""
+    labels = domain.split(".")[:-1]
+    while len(labels) > 1 and labels[-1] in GENERIC_LABELS:
+        labels.pop()
+    return compact_name(labels[-1]) if labels else ""
+
+
+def singular(word):
+    # "tutorials" in a purpose should match "tutorial" in a title
+    return word[:-1] if len(word) > 3 and word.endswith("s") and not word.endswith("ss") else word
+
+
+def keywords(text):
+    """Significant words from a purpose or content rule"""
+    return {singular(w) for w in WORD_PATTERN.findall(str(text).lower()) if len(w) > 1 and w not in STOPWORDS}
+
+
+class DomainTrie:
+    """Suffix trie over domain labels so a rule for youtube.com covers m.youtube.com"""
+
+    def __init__(self):
+        self._root = {}
+
+    def insert(self, domain, value):
+        node = self._root
+        for label in reversed(domain.split(".")):
+            node = node.setdefault(label, {})
+        node[None] = value
+
+    def match(self, domain):
+        """Return the value of the longest registered suffix of domain, or None"""
+        node = self._root
+        found = None
+        for label in reversed(domain.split(".")):
+            node = node.get(label)
+            if node is None:
+                break
+            found = node.get(None, found)
+        return found
+
+
+class RuleEngine:
+    """Local matcher compiled from dynamic_rules for clear-cut allow/deny decisions"""
+
+    def __init__(self, dynamic_rules=None):
+        self.local_allows = 0
+        self.local_denies = 0
+        self.escalations = 0
+        self.compile(dynamic_rules or {})
+
+    def compile(self, dynamic_rules):
+        """Build tries and keyword sets from the generated rules"""
+        self.strictness = dynamic_rules.get("strictness", 3)
+        if not isinstance(self.strictness, int):
+            self.strictness = 3
+
+        self.allowed_domains = DomainTrie()
+        self.allowed_apps = {}
+        self.resource_keywords = {}
+
+        purposes = dynamic_rules.get("allowed_purposes") or {}
+        content_rules = dynamic_rules.get("content_rules") or {}
+        for resource in dynamic_rules.get("allowed_resources") or []:
+            resource = str(resource)
+            words = set()
+            if isinstance(purposes, dict):
+                words |= keywords(purposes.get(resource, ""))
+            if isinstance(content_rules, dict):
+                words |= keywords(content_rules.get(resource, ""))
+            self.resource_keywords[resource] = words
+
+            domain = extract_domain(resource)
+            if domain:
+                self.allowed_domains.insert(domain, resource)
+            else:
+                self.allowed_apps[compact_name(resource)] = resource
+
+        # Only the goal's own rules deny locally; anything else is left to the LLM
+        self.denied_domains = DomainTrie()
+        self.denied_apps = set()
+        for resource in dynamic_rules.get("blocked_resources") or []:
+            domain = extract_domain(str(resource))
+            if domain:
+                self.denied_domains.insert(domain, domain)
+            else:
+                self.denied_apps.add(compact_name(str(resource)))
+
+    def take_counters(self, other):
+        """Carry decision counts over from the engine this one replaces mid-session"""
+        self.local_allows = other.local_allows
+        self.local_denies = other.local_denies
+        self.escalations = other.escalations
+        return self
+
+    def decide(self, activity):
+        """Return a verdict for clear-cut activities, or None to escalate to the LLM"""
+        name = str(activity.get("name", ""))
+        domain = extract_domain(name)
+
+        if domain:
+            # An app-name resource like "Twitter" also allows twitter.com
+            resource = self.allowed_domains.match(domain) or self.allowed_apps.get(domain_stem(domain))
+        else:
+            resource = self.allowed_apps.get(compact_name(name))
+
+        if resource is not None:
+            required = self.resource_keywords.get(resource)
+            content = keywords(activity.get("content", ""))
+            # Lenient goals accept any use of an allowed resource
+            if not required or self.strictness <= 2 or len(required & content) >= self.matches_needed(required):
+                self.local_allows += 1
+                return {
+                    "allowed": True,
+                    "reason": f"{name} is an allowed resource for your goal",
+                    "local": True
+                }
+        elif self.is_blocked(name, domain):
+            self.local_denies += 1
+            return {
+                "allowed": False,
+                "reason": f"{name} is not part of your goal",
+                "suggestion": "Close it and get back to your planned work",
+                "severity": "high" if self.strictness >= 4 else "medium",
+                "local": True
+            }
+
+        self.escalations += 1
+        return None
+
+    def matches_needed(self, required):
+        """Shared keywords needed to allow content locally; one common word like "learning" isn't enough"""
+        return min(len(required), 2 if self.strictness <= 3 else 3)
+
+    def is_blocked(self, name, domain):
+        if domain:
+            return self.denied_domains.match(domain) is not None or domain_stem(domain) in self.denied_apps
+        return compact_name(name) in self.denied_apps
+
+    def stats(self):
+        """Local vs LLM decision counts for session reporting"""
+        local = self.local_allows + self.local_denies
+        total = local + self.escalations
+        return {
+            "local_allows": self.local_allows,
+            "local_denies": self.local_denies,
+            "escalated": self.escalations,
+            "local_ratio": round(local / total * 100, 1) if total else 0.0
+        }
@@ -0,0 +1,264 @@
+# session_journal.py
+import datetime
+import json
+import os
+import sys
+import time
+
+TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+class LogEntry:
+    """One activity span: interned name, epoch times for the calendar and monotonic times for the duration"""
+
+    __slots__ = ("name", "kind", "start", "end", "start_mono", "end_mono", "productive", "stale")
+
+    def __init__(self, name, kind="", start=None, start_mono=None, productive=True, stale=False):
+        # A long session sees the same few apps over and over; intern so entries share the strings
+        self.name = sys.intern(str(name or "Unknown"))
+        self.kind = sys.intern(str(kind or ""))
+        self.start = time.time() if start is None else start
+        self.start_mono = time.monotonic() if start_mono is None else start_mono
+        self.end = None
+        self.end_mono = None
+        self.productive = productive
+        self.stale = stale
+
+    def close(self, end=None, end_mono=None):
+        self.end = time.time() if end is None else end
+        self.end_mono = time.monotonic() if end_mono is None else end_mono
+        return self
+
+    @property
+    def duration(self):
+        # Monotonic, so clock changes and DST can't produce negative or inflated spans
+        return max(0.0, self.end_mono - self.start_mono)
+
+    @property
+    def hour_of_week(self):
+        """Local hour of week the entry started in (Monday 00:00 = 0), correct across midnight"""
+        local = time.localtime(self.start)
+        return local.tm_wday * 24 + local.tm_hour
+
+    def to_record(self):
+        record = {"name": self.name, "kind": self.kind, "start": round(self.start, 3),
+                  "end": round(self.end, 3), "duration": round(self.duration, 3),
+                  "productive": self.productive}
+        if self.stale:
+            record["stale"] = True
+        return record
+
+    @classmethod
+    def from_record(cls, record):
+        """Rebuild from a journal record"""
+        entry = cls(record["name"], record.get("kind"), record["start"], 0.0,
+                    record["productive"], record.get("stale", False))
+        # The monotonic span only matters as a duration once replayed
+        return entry.close(record["end"], record["duration"])
+
+
+class SessionTotals:
+    """Running totals over closed session log entries, so analysis never needs the whole log"""
+
+    def __init__(self):
+        self.entries = 0
+        self.productive_time = 0.0
+        self.distraction_time = 0.0
+        self.activity_durations = {}  # activity name -> seconds, bounded by distinct names
+        self.distraction_durations = {}
+        self.distraction_count = 0
+        self.distraction_hours = [0] * 168  # Distractions per local hour of week
+
+    def add(self, entry):
+        """Fold one closed LogEntry into the totals"""
+        duration = entry.duration
+        self.entries += 1
+        self.activity_durations[entry.name] = self.activity_durations.get(entry.name, 0.0) + duration
+
+        if entry.productive:
+            self.productive_time += duration
+            return
+
+        self.distraction_time += duration
+        self.distraction_count += 1
+        self.distraction_durations[entry.name] = self.distraction_durations.get(entry.name, 0.0) + duration
+        self.distraction_hours[entry.hour_of_week] += 1
+
+    @property
+    def distractions_by_period(self):
+        """Distraction counts for morning (5-12), afternoon (12-18) and evening, from the hour-of-week bins"""
+        periods = {"morning": 0, "afternoon": 0, "evening": 0}
+        for how, count in enumerate(self.distraction_hours):
+            hour = how % 24
+            period = "morning" if 5 <= hour < 12 else "afternoon" if 12 <= hour < 18 else "evening"
+            periods[period] += count
+        return periods
+
+    def analysis(self, goal, start_time, end_time, session_duration, blocked=False):
+        """Summary, time distribution, top activities and distraction patterns"""
+        productive_percentage = (self.productive_time / session_duration * 100) if session_duration > 0 else 0
+
+        top_activities = []
+        ranked = sorted(self.activity_durations.items(), key=lambda x: x[1], reverse=True)
+        for name, duration in ranked[:5]:  # Top 5 activities
+            percentage = (duration / session_duration * 100) if session_duration > 0 else 0
+            top_activities.append({
+                "name": name,
+                "duration_minutes": round(duration / 60, 1),
+                "percentage": round(percentage, 1)
+            })
+
+        analysis = {
+            "session_summary": {
+                "goal": goal,
+                "start_time": start_time.strftime(TIME_FORMAT),
+                "end_time": end_time.strftime(TIME_FORMAT),
+                "duration_minutes": round(session_duration / 60, 1),
+                "productivity_rate": round(productive_percentage, 1),
+                "distraction_count": self.distraction_count,
+                "blocks_triggered": 1 if blocked else 0
+            },
+            "time_distribution": {
+                "productive_minutes": round(self.productive_time / 60, 1),
+                "distracted_minutes": round(self.distraction_time / 60, 1),
+                "productivity_percentage": round(productive_percentage, 1)
+            },
+            "top_activities": top_activities,
+            "top_distractions": [
+                {"name": name, "duration_minutes": round(duration / 60, 1)}
+                for name, duration in sorted(self.distraction_durations.items(), key=lambda x: x[1], reverse=True)[:10]
+            ],
+            "distraction_patterns": {}
+        }
+
+        if self.distraction_count:
+            analysis["distraction_hours_of_week"] = {
+                str(how): count for how, count in enumerate(self.distraction_hours) if count
+            }
+
+        # If we have enough data, report when distractions peak
+        if self.distraction_count > 2:
+            periods = self.distractions_by_period
+            morning, afternoon, evening = periods["morning"], periods["afternoon"], periods["evening"]
+            analysis["distraction_patterns"] = {
+                "morning_count": morning,
+                "afternoon_count": afternoon,
+                "evening_count": evening,
+                "peak_time": "Morning" if morning > afternoon and morning > evening else
+                             "Afternoon" if afternoon > morning and afternoon > evening else
+                             "Evening"
+            }
+
+        return analysis
+
+
+class SessionJournal:
+    """Append-only JSONL journal of a session, fsynced periodically so a crash loses seconds, not the session"""
+
+    def __init__(self, path, fsync_interval=5.0):
+        self.path = path
+        self.fsync_interval = fsync_interval
+        self._file = open(path, "a", encoding="utf-8")
+        self._terminate_torn_record()
+        self._last_sync = time.monotonic()
+        self.records = 0
+        self.syncs = 0
+
+    def _terminate_torn_record(self):
+        """After a crash mid-write, start on a fresh line so the torn record stays isolated"""
+        if self._file.tell() == 0:
+            return
+        with open(self.path, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b"\n":
+                self._file.write("\n")
+
+    def write(self, record_type, **fields):
+        """Append one record; flushed immediately, fsynced at most every fsync_interval seconds"""
+        record = {"type": record_type, "t": round(time.time(), 3), **fields}
+        self._file.write(json.dumps(record) + "\n")
+        self._file.flush()
+        self.records += 1
+        if time.monotonic() - self._last_sync >= self.fsync_interval:
+            self.sync()
+
+    def sync(self):
+        try:
+            os.fsync(self._file.fileno())
+            self.syncs += 1
+        except OSError as e:
+            print(f"Journal sync error: {str(e)}")
+        self._last_sync = time.monotonic()
+
+    def close(self):
+        if self._file.closed:
+            return
+        self.sync()
+        self._file.close()
+
+    def stats(self):
+        return {"path": self.path, "records": self.records, "fsyncs": self.syncs}
+
+
+class JournalReplay:
+    """Session state rebuilt from a journal, for --analyze and --resume"""
+
+    def __init__(self, path):
+        self.path = path
+        self.goal = ""
+        self.dynamic_rules = {}
+        self.start_time = None
+        self.end_time = None
+        self.ended = False
+        self.blocked = False
+        self.paused_seconds = 0.0  # Downtime between a crash and its resume
+        self.last_record_time = None  # Epoch time of the last durable record
+        self.totals = SessionTotals()
+        self.torn_records = 0
+
+        last_t = None
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # A crash mid-write leaves at most one torn line
+                    self.torn_records += 1
+                    continue
+                kind = record.get("type")
+                if kind == "start":
+                    self.goal = record.get("goal", "")
+                    self.dynamic_rules = record.get("dynamic_rules") or {}
+                    self.start_time = datetime.datetime.strptime(record["start_time"], TIME_FORMAT)
+                elif kind == "goal":
+                    # Profile switched mid-session; resume with the goal that was active last
+                    self.goal = record.get("goal", self.goal)
+                    self.dynamic_rules = record.get("dynamic_rules") or {}
+                elif kind == "entry":
+                    self.totals.add(LogEntry.from_record(record["entry"]))
+                elif kind == "block":
+                    self.blocked = True
+                elif kind == "resume":
+                    if last_t is not None:
+                        self.paused_seconds += max(0.0, record["t"] - last_t)
+                    self.ended = False
+                    self.end_time = None
+                elif kind == "end":
+                    self.ended = True
+                    self.end_time = datetime.datetime.fromtimestamp(record["t"])
+                last_t = record.get("t", last_t)
+
+        self.last_record_time = last_t
+        if self.start_time is None:
+            raise ValueError(f"{path} has no session start record")
+        if self.end_time is None and last_t is not None:
+            # Interrupted session: it ended with its last durable record
+            self.end_time = datetime.datetime.fromtimestamp(last_t)
+
+    def analysis(self):
+        end_time = self.end_time or self.start_time
+        duration = max(0.0, (end_time - self.start_time).total_seconds() - self.paused_seconds)
+        analysis = self.totals.analysis(self.goal, self.start_time, end_time, duration, self.blocked)
+        analysis["journal"] = {"path": self.path, "entries": self.totals.entries,
+                               "interrupted": not self.ended, "torn_records": self.torn_records}
+        return analysis
@@ -0,0 +1,214 @@
+# startup_benchmark.py
+"""Cold-start benchmark for both entry points.
+
+Measures, in fresh interpreters, how long importing the CLI and the UI takes,
+how long `--analyze` takes end to end, and the UI's time to first window.
+It also checks which heavy dependencies each path loads. `--analyze` runs
+with groq, httpx and pyautogui blocked and without an api.txt, so it fails
+if the analysis path ever touches the API key or the network again:
+
+    python startup_benchmark.py --save startup_baseline.json
+    python startup_benchmark.py --baseline startup_baseline.json --tolerance 0.25
+"""
+import argparse
+import datetime
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+CLI_DIR = os.path.dirname(os.path.abspath(__file__))
+UI_DIR = os.path.join(os.path.dirname(CLI_DIR), "Procrastination Prevention UI version")
+
+# Dependencies that should only load on the code paths that use them
+HEAVY_MODULES = ("groq", "httpx", "PIL", "pyautogui", "numpy", "matplotlib", "tkinter", "plyer", "pydub")
+
+LOADED_HEAVY = f"import sys; print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+
+# Runs --analyze with the network stack unavailable and no api.txt in the working directory
+BLOCKED_ANALYZE = """
+import runpy, sys
+sys.modules.update(dict.fromkeys(["groq", "httpx", "pyautogui"]))
+sys.argv = [sys.argv[1], "--analyze", sys.argv[2]]
+runpy.run_path(sys.argv[0], run_name="__main__")
+"""
+
+# Prints seconds from the parent's timestamp until the main window is mapped
+FIRST_WINDOW = """
+import sys, time
+started = float(sys.argv[1])
+import main
+app = main.FocusApp()
+def mapped(event):
+    if event.widget is app:
+        print(time.time() - started)
+        app.after(0, app.destroy)
+app.bind("<Map>", mapped)
+app.after(30000, app.destroy)
+app.mainloop()
+"""
+
+
+def sample_session(path):
+    """Write a small session analysis file for --analyze to read"""
+    start = datetime.datetime(2024, 1, 8, 9, 0, 0)
+    analysis = {
+        "session_summary": {"goal": "Benchmark", "start_time": start.strftime("%Y-%m-%d %H:%M:%S"),
+                            "end_time": (start + datetime.timedelta(hours=1)).strftime("%Y-%m-%d %H:%M:%S"),
+                            "duration_minutes": 60.0, "productivity_rate": 75.0,
+                            "distraction_count": 3, "blocks_triggered": 0},
+        "time_distribution": {"productive_minutes": 45.0, "distracted_minutes": 15.0,
+                              "productivity_percentage": 75.0},
+        "top_activities": [{"name": "VS Code", "duration_minutes": 45.0, "percentage": 75.0}],
+        "top_distractions": [{"name": "youtube.com", "duration_minutes": 15.0}],
+        "distraction_patterns": {}
+    }
+    with open(path, "w") as f:
+        json.dump(analysis, f)
+
+
+def run(args, cwd, extra_path=None, timeout=60):
+    env = dict(os.environ)
+    if extra_path:
+        env["PYTHONPATH"] = os.pathsep.join(p for p in (extra_path, env.get("PYTHONPATH")) if p)
+    return subprocess.run([sys.executable] + args, cwd=cwd, env=env, capture_output=True,
+                          text=True, timeout=timeout)
+
+
+def timed(args, cwd, runs, extra_path=None):
+    """Median wall time of a fresh interpreter running args, or the error of the first failing run"""
+    times = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        result = run(args, cwd, extra_path)
+        elapsed = time.perf_counter() - started
+        if result.returncode != 0:
+            return None, (result.stderr or result.stdout).strip().splitlines()[-1:]
+        times.append(elapsed)
+    return statistics.median(times), None
+
+
+def slowest_imports(module, directory, top=8):
+    """The module's direct imports by cumulative time, from python -X importtime"""
+    result = run(["-X", "importtime", "-c", f"import {module}"], directory, directory)
+    children = []
+    # importtime prints children before their parent, indented two spaces per level
+    for line in result.stderr.splitlines():
+        parts = line.split("|")
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue
+        name = parts[2].rstrip()
+        depth = (len(name) - len(name.lstrip())) // 2
+        if depth == 1:
+            children.append((int(parts[1]) / 1000, name.strip()))
+        elif depth == 0:
+            if name.strip() == module:
+                return sorted(children, reverse=True)[:top]
+            children = []
+    return []
+
+
+def benchmark(runs):
+    results = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        # The interpreter itself, so the other numbers can be read as overhead on top of it
+        results["python_startup"], _ = timed(["-c", "pass"], workdir, runs)
+
+        for name, module, directory in (("cli_import", "procrastination_preventer", CLI_DIR),
+                                        ("ui_import", "main", UI_DIR)):
+            seconds, error = timed(["-c", f"import {module}"], workdir, runs, directory)
+            results[name] = seconds
+            if error:
+                print(f"  {name}: skipped ({' '.join(error)})")
+                continue
+            loaded = run(["-c", f"import {module}; {LOADED_HEAVY}"], workdir, directory).stdout.strip()
+            results[f"{name}_heavy_modules"] = loaded.split(",") if loaded else []
+            results[f"{name}_slowest"] = slowest_imports(module, directory)
+
+        session = os.path.join(workdir, "focus_session_benchmark.json")
+        sample_session(session)
+        script = os.path.join(CLI_DIR, "procrastination_preventer.py")
+        results["cli_analyze"], error = timed(["-c", BLOCKED_ANALYZE, script, session], workdir, runs, CLI_DIR)
+        if error:
+            # A hard failure: --analyze must work without the API key and network stack
+            results["cli_analyze_error"] = " ".join(error)
+
+        if sys.platform.startswith("linux") and not os.environ.get("DISPLAY"):
+            print("  ui_first_window: skipped (no DISPLAY)")
+            results["ui_first_window"] = None
+        else:
+            samples = []
+            for _ in range(runs):
+                result = run(["-c", FIRST_WINDOW, str(time.time())], workdir, UI_DIR)
+                if result.returncode != 0 or not result.stdout.strip():
+                    print(f"  ui_first_window: skipped ({(result.stderr.strip().splitlines() or ['no window'])[-1]})")
+                    break
+                samples.append(float(result.stdout.split()[-1]))
+            results["ui_first_window"] = statistics.median(samples) if samples else None
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """Timings that got slower than the baseline by more than the tolerance, and newly loaded heavy modules"""
+    regressions = []
+    for name in ("cli_import_heavy_modules", "ui_import_heavy_modules"):
+        added = set(results.get(name, [])) - set(baseline.get(name, []))
+        if name in baseline and added:
+            regressions.append(f"{name}: now loads {', '.join(sorted(added))}")
+    for name, seconds in results.items():
+        before = baseline.get(name)
+        if not isinstance(seconds, float) or not isinstance(before, float):
+            continue
+        # Allow a few ms of jitter on the fast measurements
+        if seconds > before * (1 + tolerance) + 0.01:
+            regressions.append(f"{name}: {before * 1000:.0f} ms -> {seconds * 1000:.0f} ms")
+    return regressions
+
+
+def print_results(results):
+    print("\n" + "="*60)
+    print("\033[1m\033[95m🚀 STARTUP BENCHMARK 🚀\033[0m")
+    print("="*60)
+    for name in ("python_startup", "cli_import", "cli_analyze", "ui_import", "ui_first_window"):
+        seconds = results.get(name)
+        print(f"  {name:<16} {'n/a' if seconds is None else f'{seconds * 1000:7.0f} ms'}")
+    for name in ("cli_import", "ui_import"):
+        if f"{name}_slowest" not in results:
+            continue
+        heavy = ", ".join(results[f"{name}_heavy_modules"]) or "none"
+        print(f"\n\033[1m\033[96m{name}\033[0m  heavy modules loaded: {heavy}")
+        for ms, module in results[f"{name}_slowest"]:
+            print(f"  {ms:7.1f} ms  {module}")
+    if "cli_analyze_error" in results:
+        print(f"\n\033[91m--analyze failed without the API stack: {results['cli_analyze_error']}\033[0m")
+    print("="*60 + "\n")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Cold-start benchmark for the CLI and UI entry points")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters per measurement (median is kept)")
+    parser.add_argument("--save", type=str, help="Write the results to this JSON file, e.g. as a baseline")
+    parser.add_argument("--baseline", type=str, help="Fail if any timing regressed against this saved run")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="Allowed slowdown against the baseline as a fraction (default: 0.25)")
+    return parser
+
+
+if __name__ == "__main__":
+    args = build_parser().parse_args()
+    results = benchmark(args.runs)
+    print_results(results)
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(results, f, indent=2)
+    failed = "cli_analyze_error" in results
+    if args.baseline:
+        with open(args.baseline, "r") as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for regression in regressions:
+            print(f"\033[91mRegression: {regression}\033[0m")
+        failed = failed or bool(regressions)
+    sys.exit(1 if failed else 0)
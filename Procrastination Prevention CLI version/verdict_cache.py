@@ -0,0 +1,128 @@
+# verdict_cache.py
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict
+
+
+def normalize_text(value):
+    """Lowercase and collapse whitespace so trivial differences share a key"""
+    return " ".join(str(value or "").lower().split())
+
+
+def activity_signature(activity):
+    """Stable signature of the parts of an activity the validator looks at"""
+    return "|".join(normalize_text(activity.get(field)) for field in ("name", "type", "content"))
+
+
+def rules_fingerprint(user_goal, dynamic_rules):
+    """Hash of the goal and rules a verdict was produced under"""
+    payload = json.dumps([user_goal, dynamic_rules], sort_keys=True)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:16]
+
+
+class VerdictCache:
+    """Bounded LRU cache of validation verdicts with TTL and optional disk persistence"""
+
+    def __init__(self, max_entries=512, ttl=3600, path=None, save_every=20):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.path = path
+        self.save_every = save_every
+
+        self.hits = 0
+        self.misses = 0
+        self.llm_seconds = 0.0  # Total time spent on uncached validations
+        self.llm_calls = 0
+
+        self._entries = OrderedDict()  # key -> (stored_at, verdict)
+        self._unsaved = 0
+
+        if self.path:
+            self.load()
+
+    @property
+    def enabled(self):
+        return self.max_entries > 0
+
+    def make_key(self, activity, user_goal, dynamic_rules):
+        """Cache key for an activity under the current goal and rules"""
+        signature = hashlib.sha1(activity_signature(activity).encode("utf-8")).hexdigest()[:16]
+        return f"{rules_fingerprint(user_goal, dynamic_rules)}:{signature}"
+
+    def get(self, key):
+        """Return a cached verdict, or None if missing or expired"""
+        if not self.enabled:
+            return None
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            stored_at, verdict = entry
+            if time.time() - stored_at <= self.ttl:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return dict(verdict)
+            del self._entries[key]
+
+        self.misses += 1
+        return None
+
+    def put(self, key, verdict, elapsed=None):
+        """Store a verdict produced by the LLM"""
+        if elapsed is not None:
+            self.llm_seconds += elapsed
+            self.llm_calls += 1
+        if not self.enabled:
+            return
+
+        self._entries[key] = (time.time(), dict(verdict))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+        self._unsaved += 1
+        if self.path and self._unsaved >= self.save_every:
+            self.save()
+
+    def load(self):
+        """Warm the cache from disk, dropping expired entries"""
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r") as f:
+                stored = json.load(f)
+            now = time.time()
+            for key, stored_at, verdict in stored.get("entries", []):
+                if now - stored_at <= self.ttl:
+                    self._entries[key] = (stored_at, verdict)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        except Exception as e:
+            print(f"Verdict cache load error: {str(e)}")
+
+    def save(self):
+        """Persist the cache atomically so a crash can't leave a torn file"""
+        if not self.path:
+            return
+        try:
+            temp_path = f"{self.path}.tmp"
+            with open(temp_path, "w") as f:
+                json.dump({"entries": [[key, stored_at, verdict]
+                                       for key, (stored_at, verdict) in self._entries.items()]}, f)
+            os.replace(temp_path, self.path)
+            self._unsaved = 0
+        except Exception as e:
+            print(f"Verdict cache save error: {str(e)}")
+
+    def stats(self):
+        """Hit rate and estimated LLM latency saved, for session reporting"""
+        total = self.hits + self.misses
+        avg_latency = self.llm_seconds / self.llm_calls if self.llm_calls else 0.0
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total * 100, 1) if total else 0.0,
+            "avg_llm_latency_seconds": round(avg_latency, 3),
+            "latency_saved_seconds": round(self.hits * avg_latency, 1)
+        }
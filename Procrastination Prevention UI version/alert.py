@@ -1,46 +1,57 @@
 import customtkinter as ctk
+import queue
 import tkinter as tk
 
 class AlertSystem:
-    @staticmethod
-    def show_warning(parent, domains):
-        """Display custom warning popup with domain information"""
-        popup = ctk.CTkToplevel(parent)
-        popup.title("⚠️ Focus Alert")
-        popup.geometry("400x250")
-        popup.attributes('-topmost', True)  # Ensure the alert stays on top
+    """One reusable alert window, fed through a queue and updated in place instead of rebuilt"""
+
+    POLL_MS = 50
+    AUTO_CLOSE_MS = 15000
+
+    def __init__(self, parent):
+        self.parent = parent
+        self.queue = queue.SimpleQueue()  # Monitoring threads may post; only the Tk thread touches widgets
+        self.popup = None
+        self.hide_job = None
+        self.shown = 0
+        parent.after(self.POLL_MS, self.poll)
+
+    def show_warning(self, domains, goal=""):
+        """Queue a warning with domain information; safe to call from any thread"""
+        self.queue.put((domains, goal))
 
+    def poll(self):
+        latest = None
         try:
-            popup.bell()
-        except:
+            while True:
+                latest = self.queue.get_nowait()  # Only the newest of a burst is worth showing
+        except queue.Empty:
             pass
+        if latest is not None:
+            self.update(*latest)
+        self.parent.after(self.POLL_MS, self.poll)
+
+    def build(self):
+        """Create the popup once; later alerts only change its text"""
+        popup = ctk.CTkToplevel(self.parent)
+        popup.title("⚠️ Focus Alert")
+        popup.geometry("400x250")
+        popup.attributes('-topmost', True)  # Ensure the alert stays on top
+        popup.protocol("WM_DELETE_WINDOW", self.hide)
 
         warning_frame = ctk.CTkFrame(popup)
         warning_frame.pack(pady=20, padx=20, fill="both", expand=True)
 
-        # Format the domains string
-        if isinstance(domains, str):
-            domain_list = [d.strip() for d in domains.split(',') if d.strip()]
-            formatted_domains = ", ".join(domain_list)
-        else:
-            formatted_domains = ", ".join(domains)
-
-        # Build a dynamic warning message including the user's focus goal
-        warning_text = f"""The system detected potential distractions:
-{formatted_domains}
-
-These appear unrelated to your stated goal:
-"{parent.user_goal}" """
-
-        ctk.CTkLabel(warning_frame, 
+        ctk.CTkLabel(warning_frame,
                      text="Potential Distraction Detected:",
                      font=("Arial", 16, "bold"),
                      text_color="#ff4444").pack(pady=(10, 5))
 
-        ctk.CTkLabel(warning_frame,
-                     text=warning_text,
-                     font=("Arial", 14),
-                     text_color="#ff8888").pack(pady=5)
+        self.warning_label = ctk.CTkLabel(warning_frame,
+                                          text="",
+                                          font=("Arial", 14),
+                                          text_color="#ff8888")
+        self.warning_label.pack(pady=5)
 
         ctk.CTkLabel(warning_frame,
                      text="This activity doesn't align with your focus goal.",
@@ -52,15 +63,49 @@ These appear unrelated to your stated goal:
 
         ctk.CTkButton(button_frame,
                       text="Stay Focused",
-                      command=popup.destroy,
+                      command=self.hide,
                       fg_color="#4CAF50",
                       hover_color="#45a049").pack(side=tk.LEFT, padx=5)
 
         ctk.CTkButton(button_frame,
                       text="Dismiss Warning",
-                      command=popup.destroy,
+                      command=self.hide,
                       fg_color="#ff4444",
                       hover_color="#cc0000").pack(side=tk.LEFT, padx=5)
+        self.popup = popup
+
+    def update(self, domains, goal):
+        if self.popup is None or not self.popup.winfo_exists():
+            self.build()
+
+        # Format the domains string
+        if isinstance(domains, str):
+            domain_list = [d.strip() for d in domains.split(',') if d.strip()]
+            formatted_domains = ", ".join(domain_list)
+        else:
+            formatted_domains = ", ".join(domains)
+
+        # Build a dynamic warning message including the user's focus goal
+        warning_text = f"""The system detected potential distractions:
+{formatted_domains}
+
+These appear unrelated to your stated goal:
+"{goal}" """
+        self.warning_label.configure(text=warning_text)
+
+        self.popup.deiconify()
+        self.popup.lift()
+        try:
+            self.popup.bell()
+        except:
+            pass
+
+        # Auto-close 15 seconds after the latest warning
+        if self.hide_job:
+            self.popup.after_cancel(self.hide_job)
+        self.hide_job = self.popup.after(self.AUTO_CLOSE_MS, self.hide)
+        self.shown += 1
 
-        popup.grab_set()  # Make the popup modal
-        popup.after(15000, popup.destroy)  # Auto-close after 15 seconds
+    def hide(self):
+        if self.popup is not None and self.popup.winfo_exists():
+            self.popup.withdraw()
@@ -2,18 +2,43 @@ import customtkinter as ctk
 import tkinter as tk
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from collections import OrderedDict
 from datetime import datetime
 
+PAGE_SIZE = 200            # Sessions added to the history list per page
+TIMELINE_CACHE_SIZE = 64   # Parsed session timelines kept for quick re-selection
+MAX_PLOT_EVENTS = 300      # Distractions plotted per timeline before merging nearby ones
+TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def downsample_events(times, start, end, max_events=MAX_PLOT_EVENTS):
+    """Keep at most one distraction per 1/max_events slice of the session so dense series stay drawable"""
+    if len(times) <= max_events or end <= start:
+        return times
+    bucket = (end - start) / max_events
+    kept, last_bucket = [], None
+    for t in times:
+        index = int((t - start) / bucket)
+        if index != last_bucket:
+            kept.append(t)
+            last_bucket = index
+    return kept
+
+
 class AnalysisWindow(ctk.CTkToplevel):
-    def __init__(self, parent, session_data, achievements, longest_streak):
+    def __init__(self, parent, session_store, achievements, longest_streak):
         super().__init__(parent)
         self.title("Session Analysis")
         self.geometry("1000x600")
-        self.session_data = session_data
+        self.session_store = session_store
         self.achievements = achievements
         self.longest_streak = longest_streak
+        self.sessions = []  # Summaries of the pages loaded so far
+        self.all_loaded = False
+        self.timelines = OrderedDict()  # session id -> (times, states)
 
         self.create_widgets()
+        self.load_next_page()
         self.update_achievements_display()
 
     def create_widgets(self):
@@ -25,15 +50,18 @@ class AnalysisWindow(ctk.CTkToplevel):
         session_frame = ctk.CTkFrame(main_frame, width=300)
         session_frame.pack(side="left", fill="y", padx=5, pady=5)
 
-        ctk.CTkLabel(session_frame, text="Session History", font=("Arial", 14, "bold")).pack(pady=10)
+        total = self.session_store.count() if self.session_store else 0
+        ctk.CTkLabel(session_frame, text=f"Session History ({total})", font=("Arial", 14, "bold")).pack(pady=10)
         
-        self.session_listbox = tk.Listbox(session_frame, width=40, height=20)
-        self.session_listbox.pack(padx=10, pady=10, fill="both", expand=True)
-        
-        for idx, session in enumerate(self.session_data):
-            start_time = session["start"][11:19]
-            duration = f"{session['total_time']//3600:.0f}h {(session['total_time']%3600)//60:.0f}m"
-            self.session_listbox.insert(tk.END, f"Session {idx+1} | {start_time} | {duration}")
+        list_frame = tk.Frame(session_frame)
+        list_frame.pack(padx=10, pady=10, fill="both", expand=True)
+        scrollbar = tk.Scrollbar(list_frame, orient="vertical")
+        self.session_listbox = tk.Listbox(list_frame, width=40, height=20)
+        # Further pages are fetched only when the list is scrolled near its end
+        self.session_listbox.configure(yscrollcommand=lambda first, last: self.on_list_scroll(scrollbar, first, last))
+        scrollbar.configure(command=self.session_listbox.yview)
+        scrollbar.pack(side="right", fill="y")
+        self.session_listbox.pack(side="left", fill="both", expand=True)
 
         # Graph Frame
         graph_frame = ctk.CTkFrame(main_frame)
@@ -41,6 +69,10 @@ class AnalysisWindow(ctk.CTkToplevel):
 
         self.figure = plt.Figure(figsize=(6, 4), dpi=100)
         self.ax = self.figure.add_subplot(111)
+        self.ax.set_yticks([0, 1])
+        self.ax.set_yticklabels(["Focused", "Distracted"])
+        self.ax.set_xlabel("Time")
+        self.timeline_line = None  # Reused across selections instead of clearing the axes
         self.canvas = FigureCanvasTkAgg(self.figure, graph_frame)
         self.canvas.get_tk_widget().pack(fill="both", expand=True)
 
@@ -56,38 +88,69 @@ class AnalysisWindow(ctk.CTkToplevel):
         # Bind selection event
         self.session_listbox.bind("<<ListboxSelect>>", self.plot_session_data)
 
+    def load_next_page(self):
+        """Append the next page of session summaries to the history list"""
+        if self.all_loaded or not self.session_store:
+            self.all_loaded = True
+            return
+        page = self.session_store.session_summaries(offset=len(self.sessions), limit=PAGE_SIZE)
+        for idx, session in enumerate(page, len(self.sessions)):
+            start_time = session["start"][11:19]
+            duration = f"{session['total_time']//3600:.0f}h {(session['total_time']%3600)//60:.0f}m"
+            self.session_listbox.insert(tk.END, f"Session {idx+1} | {start_time} | {duration}")
+        self.sessions.extend(page)
+        self.all_loaded = len(page) < PAGE_SIZE
+
+    def on_list_scroll(self, scrollbar, first, last):
+        scrollbar.set(first, last)
+        if not self.all_loaded and float(last) > 0.9:
+            self.after_idle(self.load_next_page)
+
+    def session_timeline(self, session):
+        """Parsed (times, states) step series for a session, cached per session id"""
+        timeline = self.timelines.get(session["id"])
+        if timeline is not None:
+            self.timelines.move_to_end(session["id"])
+            return timeline
+
+        start = datetime.strptime(session["start"], TIME_FORMAT)
+        end = datetime.strptime(session["end"], TIME_FORMAT)
+        events = [datetime.strptime(d["time"], TIME_FORMAT)
+                  for d in self.session_store.distractions(session["id"])]
+        events = downsample_events(events, start, end)
+
+        times, states = [start], [0]
+        for dt in events:
+            times.extend((dt, dt))
+            states.extend((1, 0))
+        times.append(end)
+        states.append(0)
+
+        timeline = (times, states)
+        self.timelines[session["id"]] = timeline
+        if len(self.timelines) > TIMELINE_CACHE_SIZE:
+            self.timelines.popitem(last=False)
+        return timeline
+
     def plot_session_data(self, event):
         selection = self.session_listbox.curselection()
         if not selection:
             return
             
         session_idx = selection[0]
-        session = self.session_data[session_idx]
-        
-        self.ax.clear()
+        session = self.sessions[session_idx]
+        times, states = self.session_timeline(session)
         
         # Plot timeline with distraction points
-        start_time = datetime.strptime(session["start"], "%Y-%m-%d %H:%M:%S")
-        times = [start_time]
-        distractions = [0]
-        
-        for d in session["distractions"]:
-            dt = datetime.strptime(d["time"], "%Y-%m-%d %H:%M:%S")
-            times.append(dt)
-            distractions.append(1)
-            times.append(dt)
-            distractions.append(0)
-        
-        times.append(datetime.strptime(session["end"], "%Y-%m-%d %H:%M:%S"))
-        distractions.append(0)
-        
-        self.ax.step(times, distractions, where="post")
+        if self.timeline_line is None:
+            self.timeline_line, = self.ax.step(times, states, where="post")
+            self.figure.autofmt_xdate()
+        else:
+            self.timeline_line.set_data(times, states)
+        self.ax.set_xlim(times[0], times[-1])
+        self.ax.set_ylim(-0.1, 1.1)
         self.ax.set_title(f"Session {session_idx+1} Focus Timeline")
-        self.ax.set_yticks([0, 1])
-        self.ax.set_yticklabels(["Focused", "Distracted"])
-        self.ax.set_xlabel("Time")
-        self.figure.autofmt_xdate()
-        self.canvas.draw()
+        self.canvas.draw_idle()
 
     def update_achievements_display(self):
         self.achievements_text.delete("1.0", "end")
@@ -2,12 +2,22 @@ import customtkinter as ctk
 import threading
 import time
 import os
-import json
+import sys
 from datetime import datetime
 from tkinter import messagebox
+
+# Modules shared with the CLI version (transport, scheduler, budget, ...) live in ../shared
+SHARED_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "shared")
+if SHARED_DIR not in sys.path:
+    sys.path.insert(0, SHARED_DIR)
+
 from request import GroqClient
 from alert import AlertSystem
-from analysis import AnalysisWindow
+from scheduler import AdaptiveScheduler, TickScheduler
+from budget import StageBudget, BudgetExceeded
+from session_store import SessionStore
+from metrics import MetricsExporter
+from tracing import Tracer, NULL_TRACER
 
 class FocusApp(ctk.CTk):
     def __init__(self):
@@ -16,14 +26,23 @@ class FocusApp(ctk.CTk):
         self.geometry("600x400")
         self.configure_app()
         self.create_widgets()
-        self.groq_client = GroqClient()
-        self.session_data = []
+        self.alerts = AlertSystem(self)  # One alert window, reused for every warning
+        # Connected once the window is up, so the groq/httpx imports don't delay it
+        self.groq_client = GroqClient(connect=False)
+        self.after_idle(self.connect_groq_client)
+        self.metrics = self.groq_client.metrics
+        self.metrics.add_collector(self.metric_counters)
+        self.metrics_exporter = None
+        self.start_metrics()
+        self.session_store = None
+        self.total_focused_time = 0
+        self.longest_streak = 0
+        self.aggregates = {}  # Persisted totals behind the achievements
         self.load_sessions()
         self.current_session = None
+        self.current_session_id = None
         self.start_time = None
-        self.total_focused_time = 0
         self.current_streak = 0
-        self.longest_streak = 0
         self.achievements = {
             'no_distraction_1h': False,
             'coding_marathon': False,
@@ -38,8 +57,14 @@ class FocusApp(ctk.CTk):
         self.user_goal = ""
         self.distraction_threshold = 3
         self.focus_mode_enabled = False
-        self.last_check_time = 0
         self.check_interval = 5
+        self.adaptive_enabled = False
+        self.scheduler = None
+        self.tick_scheduler = None
+        self.next_check_interval = self.check_interval
+        self.api_degraded = False
+        self.trace_enabled = False
+        self.tracer = NULL_TRACER
         ctk.set_appearance_mode("dark")
 
     def create_widgets(self):
@@ -127,6 +152,24 @@ class FocusApp(ctk.CTk):
         )
         self.focus_mode_switch.pack(side="left", padx=10)
 
+        self.adaptive_mode = ctk.BooleanVar()
+        self.adaptive_switch = ctk.CTkSwitch(
+            toggle_frame,
+            text="Adaptive Interval",
+            variable=self.adaptive_mode,
+            command=self.toggle_adaptive_mode
+        )
+        self.adaptive_switch.pack(side="left", padx=10)
+
+        self.trace_mode = ctk.BooleanVar()
+        self.trace_switch = ctk.CTkSwitch(
+            toggle_frame,
+            text="Trace Cycles",
+            variable=self.trace_mode,
+            command=self.toggle_trace_mode
+        )
+        self.trace_switch.pack(side="left", padx=10)
+
         self.status_label = ctk.CTkLabel(
             self.main_frame,
             text="Status: Idle",
@@ -138,10 +181,22 @@ class FocusApp(ctk.CTk):
         self.log_text.pack(pady=10)
         self.log_text.insert("end", "Activity Log:\n")
 
+    def connect_groq_client(self):
+        """Create the Groq transport if it isn't up yet; False when api.txt or the client setup fails"""
+        if self.groq_client.transport is not None:
+            return True
+        try:
+            self.groq_client.initialize_client()
+            return True
+        except ConnectionError as e:
+            self.log(str(e))
+            return False
+
     def show_analysis(self):
         """Show analysis window"""
+        from analysis import AnalysisWindow  # matplotlib loads on first use, not at startup
         self.update_achievements()
-        AnalysisWindow(self, self.session_data, self.achievements, self.longest_streak)
+        AnalysisWindow(self, self.session_store, self.achievements, self.longest_streak)
 
     def update_interval(self, value):
         self.check_interval = int(value)
@@ -163,10 +218,26 @@ class FocusApp(ctk.CTk):
         status = "ON" if self.focus_mode_enabled else "OFF"
         self.log(f"Super Focus Mode {status} - Auto-block after {self.distraction_threshold} warnings")
 
+    def toggle_adaptive_mode(self):
+        self.adaptive_enabled = self.adaptive_mode.get()
+        status = "ON" if self.adaptive_enabled else "OFF"
+        self.log(f"Adaptive Interval {status} - checks slow down while the screen is stable")
+
+    def toggle_trace_mode(self):
+        self.trace_enabled = self.trace_mode.get()
+        status = "ON" if self.trace_enabled else "OFF"
+        self.log(f"Cycle Tracing {status} - takes effect on the next session")
+
+    def log_schedule_decision(self, entry):
+        self.log(f"Next check in {entry['delay']:.0f}s ({entry['reason'].replace('_', ' ')})")
+
     def start_tracking(self):
         if not self.goal_entry.get().strip():
             messagebox.showerror("Error", "Please enter your focus goal!")
             return
+        if not self.connect_groq_client():
+            messagebox.showerror("Error", "Could not connect to Groq, check api.txt")
+            return
 
         self.user_goal = self.goal_entry.get()
         self.groq_client.set_user_goal(self.user_goal)
@@ -185,12 +256,32 @@ class FocusApp(ctk.CTk):
         }
         self.start_time = datetime.now()
         self.current_streak = 0
+        self.current_session_id = None
+        if self.session_store:
+            # Inserted up front so distractions can be written as they happen
+            self.current_session_id = self.session_store.begin_session(self.current_session)
+        self.next_check_interval = self.check_interval
+        self.scheduler = None
+        self.tick_scheduler = TickScheduler(self.check_interval)
+        self.stage_budget = StageBudget({"vision": 15, "validation": 10})
+        if self.trace_enabled:
+            trace_path = f"focus_trace_{self.start_time.strftime('%Y%m%d_%H%M%S')}.json"
+            self.tracer = Tracer(trace_path)
+            self.log(f"Tracing cycles to {trace_path} (open in Perfetto)")
+        self.groq_client.set_tracer(self.tracer)
+        self.stale_checks = 0
+        if self.adaptive_enabled:
+            self.scheduler = AdaptiveScheduler(self.check_interval, log_callback=self.log_schedule_decision)
         
         tracking_thread = threading.Thread(target=self.monitor_activity, daemon=True)
         tracking_thread.start()
         self.log(f"Focus tracking started with goal: {self.user_goal}")
 
     def stop_tracking(self):
+        if self.tick_scheduler:
+            self.tick_scheduler.stop()
+        self.tracer.close()
+        self.tracer = NULL_TRACER
         if self.is_tracking and self.current_session:
             self.is_tracking = False
             end_time = datetime.now()
@@ -199,19 +290,27 @@ class FocusApp(ctk.CTk):
             # Calculate total session time in seconds
             session_duration = (end_time - self.start_time).total_seconds()
             self.current_session["total_time"] = session_duration
+            self.current_session["vision_cache"] = self.groq_client.frame_dedup.stats()
+            self.current_session["image_encoding"] = self.groq_client.encoder.stats()
+            if self.scheduler:
+                self.current_session["schedule"] = self.scheduler.stats()
+            self.current_session["ticks"] = self.tick_scheduler.stats()
+            self.current_session["api"] = self.groq_client.transport.stats()
+            self.current_session["budget"] = dict(stale_checks=self.stale_checks, **self.stage_budget.stats())
             self.total_focused_time += session_duration
             
             # Update longest streak
             self.longest_streak = max(self.longest_streak, self.current_streak)
             
             # Add to session history
-            self.session_data.append(self.current_session)
             self.save_sessions()
             
             self.start_button.configure(state="normal")
             self.stop_button.configure(state="disabled")
             self.status_label.configure(text="Status: Stopped")
             self.log(f"Focus tracking stopped. Session duration: {session_duration/60:.1f} minutes")
+            cache = self.current_session["vision_cache"]
+            self.log(f"Vision cache: {cache['hits']} reused frames, {cache['misses']} vision calls ({cache['hit_rate']}% hit rate)")
         else:
             self.is_tracking = False
             self.start_button.configure(state="normal")
@@ -221,39 +320,111 @@ class FocusApp(ctk.CTk):
 
     def monitor_activity(self):
         last_distraction_time = None
+        last_check = None  # (domains, distracted) from the last check that finished in time
         
         while self.is_tracking:
-            current_time = time.time()
-            if current_time - self.last_check_time >= self.check_interval:
-                self.last_check_time = current_time
+            interval = self.next_check_interval if self.scheduler else self.check_interval
+            # Fixed-rate wait on the monotonic clock; stop_tracking wakes it immediately
+            if not self.tick_scheduler.wait(interval):
+                break
+            try:
+                self.log("Checking current applications against focus goal...")
+                frames_encoded = self.groq_client.encoder.frames
                 try:
-                    self.log("Checking current applications against focus goal...")
-                    domains = self.groq_client.get_domains_list()
-
-                    if domains and domains.strip():
-                        self.log(f"Detected potential distractions: {domains}")
-                        if self.groq_client.is_distraction(domains):
-                            self.after(0, self.handle_distraction, domains)
-                            
-                            # Reset streak on distraction
-                            current_time = datetime.now()
-                            if last_distraction_time is not None:
-                                streak_duration = (current_time - last_distraction_time).total_seconds()
-                                self.current_streak = max(self.current_streak, streak_duration)
-                            last_distraction_time = current_time
-                        else:
-                            self.log("Aligned with focus goal - productive activity detected")
+                    with self.tracer.span("vision_stage"):
+                        domains = self.stage_budget.run("vision", self.groq_client.get_domains_list)
+                    with self.tracer.span("validation_stage"):
+                        distracted = bool(domains and domains.strip()) and \
+                            self.stage_budget.run("validation", self.groq_client.is_distraction, domains)
+                    last_check = (domains, distracted)
+                except BudgetExceeded as e:
+                    # Keep the previous verdict instead of a blank result, but don't alert on it again
+                    self.stale_checks += 1
+                    if last_check is None:
+                        self.log(f"{e} - no previous verdict to reuse")
+                    else:
+                        self.log(f"{e} - previous verdict still stands (stale): "
+                                 f"{'distracted' if last_check[1] else 'on track'}")
+                    self.update_api_status()
+                    continue
+                if self.groq_client.encoder.frames > frames_encoded:
+                    encoder = self.groq_client.encoder
+                    self.log(f"Screenshot sent: {encoder.last_payload_bytes / 1024:.0f} KB, encoded in {encoder.last_encode_seconds * 1000:.0f} ms")
+                else:
+                    self.log("Screen unchanged - reusing previous analysis")
+
+                if domains and domains.strip():
+                    self.log(f"Detected potential distractions: {domains}")
+                    if self.scheduler:
+                        self.next_check_interval = self.scheduler.observe(domains, distracted)
+                    if distracted:
+                        confirmed = self.scheduler is None or self.scheduler.distraction_confirmed
+                        self.after(0, self.handle_distraction, domains, confirmed)
+                        
+                        # Reset streak on distraction
+                        current_time = datetime.now()
+                        if last_distraction_time is not None:
+                            streak_duration = (current_time - last_distraction_time).total_seconds()
+                            self.current_streak = max(self.current_streak, streak_duration)
+                        last_distraction_time = current_time
                     else:
-                        self.log("On track - productive activity detected")
+                        self.log("Aligned with focus goal - productive activity detected")
+                else:
+                    self.log("On track - productive activity detected")
+                    if self.scheduler:
+                        self.next_check_interval = self.scheduler.observe(domains, False)
+
+            except Exception as e:
+                self.log(f"Error: {str(e)}")
+
+            self.update_api_status()
+
+    def metric_counters(self):
+        """Counters kept by the transport and vision cache, read when metrics are exported"""
+        api = self.groq_client.transport.stats()
+        return {
+            "api_calls": api["calls"],
+            "api_retries": api["retries"],
+            "api_errors": api["failures"],
+            "api_tokens": api["prompt_tokens"] + api["completion_tokens"],
+            "vision_cache_hits": self.groq_client.frame_dedup.hits
+        }
+
+    def start_metrics(self):
+        """Opt-in metrics: FOCUS_METRICS_PORT serves 127.0.0.1:PORT/metrics, FOCUS_METRICS_FILE rewrites a file"""
+        port = os.environ.get("FOCUS_METRICS_PORT")
+        path = os.environ.get("FOCUS_METRICS_FILE")
+        if not port and not path:
+            return
+        try:
+            self.metrics_exporter = MetricsExporter(self.metrics, port=int(port) if port else None,
+                                                    path=path).start()
+            self.log(f"Metrics enabled{f' on http://127.0.0.1:{port}/metrics' if port else ''}"
+                     f"{f' -> {path}' if path else ''}")
+        except Exception as e:
+            self.log(f"Error starting metrics: {str(e)}")
 
-                except Exception as e:
-                    self.log(f"Error: {str(e)}")
+    def update_api_status(self):
+        """Reflect the transport's degraded state in the status label"""
+        degraded = self.groq_client.degraded
+        if degraded == self.api_degraded:
+            return
+        self.api_degraded = degraded
+        if degraded:
+            self.log("Groq API degraded - pausing requests until it recovers")
+            self.after(0, lambda: self.status_label.configure(text="Status: Degraded (API unavailable)"))
+        else:
+            self.log("Groq API recovered")
+            self.after(0, lambda: self.status_label.configure(text="Status: Actively monitoring"))
 
-            time.sleep(1)
+    def handle_distraction(self, domains, confirmed=True):
+        with self.metrics.time("alert"), self.tracer.span("handle_distraction", domains=domains):
+            self.dispatch_distraction(domains, confirmed)
 
-    def handle_distraction(self, domains):
+    def dispatch_distraction(self, domains, confirmed):
         try:
             if domains.strip():
+                self.metrics.inc("distractions")
                 # Record the distraction in the current session
                 if self.current_session:
                     distraction_data = {
@@ -261,18 +432,25 @@ class FocusApp(ctk.CTk):
                         "domains": domains
                     }
                     self.current_session["distractions"].append(distraction_data)
+                    if self.session_store and self.current_session_id:
+                        self.session_store.add_distraction(self.current_session_id,
+                                                           distraction_data["time"], domains)
                 
-                if self.focus_mode_enabled:
+                if self.focus_mode_enabled and not confirmed:
+                    # Adaptive mode rechecks quickly before counting a strike
+                    self.log(f"[Super Focus] Confirming distraction: {domains}")
+                    self.alerts.show_warning(domains, self.user_goal)
+                elif self.focus_mode_enabled:
                     self.distraction_count += 1
                     alert_text = f"[Super Focus] Warning {self.distraction_count}/{self.distraction_threshold}"
                     self.log(f"{alert_text}: {domains}")
-                    AlertSystem.show_warning(self, domains)
+                    self.alerts.show_warning(domains, self.user_goal)
                     if self.distraction_count >= self.distraction_threshold:
                         self.close_distraction(domains)
                         self.distraction_count = 0
                 else:
                     self.log(f"[Normal Mode] Distraction detected: {domains}")
-                    AlertSystem.show_warning(self, domains)
+                    self.alerts.show_warning(domains, self.user_goal)
         except Exception as e:
             self.log(f"Error in handle_distraction: {str(e)}")
 
@@ -308,34 +486,33 @@ class FocusApp(ctk.CTk):
             self.log(f"Error closing window: {str(e)}")
 
     def save_sessions(self):
+        """Finalize the current session row; distractions were already written as they happened"""
         try:
-            with open("sessions.json", "w") as f:
-                json.dump(self.session_data, f, indent=2)
+            if self.session_store and self.current_session_id:
+                self.aggregates = self.session_store.end_session(self.current_session_id, self.current_session,
+                                                                 self.current_streak)
         except Exception as e:
             self.log(f"Error saving sessions: {str(e)}")
 
     def load_sessions(self):
+        """Open the session database, importing sessions.json the first time"""
         try:
-            if os.path.exists("sessions.json"):
-                with open("sessions.json", "r") as f:
-                    self.session_data = json.load(f)
+            self.session_store = SessionStore()
+            if self.session_store.migration_error:
+                self.log(f"Could not import sessions.json, history starts empty: {self.session_store.migration_error}")
+            elif self.session_store.migrated:
+                self.log(f"Imported {self.session_store.migrated} sessions from sessions.json")
+            self.aggregates = self.session_store.aggregates()
+            self.total_focused_time = self.aggregates["total_focused_time"]
+            self.longest_streak = self.aggregates["longest_streak"]
         except Exception as e:
             self.log(f"Error loading sessions: {str(e)}")
 
     def update_achievements(self):
-        total_focused = sum(session["total_time"] for session in self.session_data)
-        total_distractions = sum(len(session["distractions"]) for session in self.session_data)
-        
-        self.achievements['no_distraction_1h'] = any(
-            session["total_time"] >= 3600 and len(session["distractions"]) == 0 
-            for session in self.session_data
-        )
-        
-        self.achievements['coding_marathon'] = total_focused >= 5*3600
-        self.achievements['perfect_session'] = any(
-            len(session["distractions"]) == 0 and session["total_time"] >= 1800  # At least 30 minutes
-            for session in self.session_data
-        )
+        """Achievements from the running aggregates, independent of history size"""
+        self.achievements['no_distraction_1h'] = self.aggregates.get("no_distraction_1h", False)
+        self.achievements['coding_marathon'] = self.total_focused_time >= 5*3600
+        self.achievements['perfect_session'] = self.aggregates.get("perfect_session", False)
         self.achievements['streak_master'] = self.longest_streak >= 3600
 
 if __name__ == "__main__":
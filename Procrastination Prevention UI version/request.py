@@ -1,26 +1,53 @@
-import base64
 import os
-import pyautogui
-from groq import Groq
+import time
+from budget import remaining_budget
+from frame_hash import FrameDeduplicator
+from screen_encoder import ScreenEncoder, crop_box
+from metrics import MetricsRegistry
+from tracing import NULL_TRACER
 
 class GroqClient:
-    def __init__(self):
+    def __init__(self, base_url=None, connect=True):
         self.client = None
+        self.transport = None
+        # Groq-compatible endpoint override, e.g. a local stand-in for offline testing
+        self.base_url = base_url or os.environ.get("GROQ_BASE_URL")
         self.user_goal = ""
-        self.initialize_client()
+        self.frame_dedup = FrameDeduplicator()
+        self.encoder = ScreenEncoder()
+        self.metrics = MetricsRegistry()  # Per-stage latency histograms
+        self.tracer = NULL_TRACER
+        if connect:
+            self.initialize_client()
 
     def initialize_client(self):
         try:
+            from transport import GroqTransport  # groq and httpx are the slowest imports at startup
             with open("api.txt", "r") as file:
                 groq_api_key = file.read().strip()
                 os.environ["GROQ_API_KEY"] = groq_api_key
-            self.client = Groq()
+            self.transport = GroqTransport(api_key=groq_api_key, base_url=self.base_url)
+            self.client = self.transport.client
         except Exception as e:
             raise ConnectionError(f"Groq initialization failed: {str(e)}")
 
     def set_user_goal(self, goal):
         """Store the user's focus goal for context-aware detection"""
         self.user_goal = goal
+        # Cached domain lists were judged against the previous goal, and a new
+        # goal starts a new session
+        self.frame_dedup.reset(clear_stats=True)
+
+    def set_tracer(self, tracer):
+        """Record screenshot/encode and LLM request spans with this tracer"""
+        self.tracer = tracer
+        if self.transport:
+            self.transport.tracer = tracer
+
+    @property
+    def degraded(self):
+        """True while the transport's circuit breaker is keeping calls away from the API"""
+        return self.transport is not None and self.transport.degraded
 
     def generate_vision_prompt(self):
         """Generate dynamic prompt based on user goal"""
@@ -45,7 +72,9 @@ Task:
             return False
 
         try:
-            response = self.client.chat.completions.create(
+            started = time.perf_counter()
+            response = self.transport.chat(
+                deadline=remaining_budget(),
                 model="llama3-70b-8192",
                 messages=[
                     {
@@ -69,45 +98,38 @@ Should any of these trigger a warning? Respond ONLY with:
                 temperature=0.2,
                 max_tokens=100
             )
+            self.metrics.observe("validation", time.perf_counter() - started)
 
             result = response.choices[0].message.content.strip()
             return "DISTRACTION" in result.split()[0].upper()
 
         except Exception as e:
+            # Same policy as the CLI: fail open and let the degraded state surface in the UI
             print(f"LLM analysis failed: {str(e)}")
-            return True  # Fail-safe: default to warning
+            return False
 
     def get_image_description(self):
         """Capture screen and get description from vision model"""
         try:
-            # Capture full screenshot
+            import pyautogui
+            # Capture full screenshot and leave out the taskbar at any resolution
             screenshot = pyautogui.screenshot()
-            
-            # Crop the image to remove taskbar (1439x850 instead of 1439x899)
-            width, height = screenshot.size
-            cropped_screenshot = screenshot.crop((0, 0, width, 850))
-            
-            temp_path = "temp_screen.png"
-            cropped_screenshot.save(temp_path)
-
-            with open(temp_path, "rb") as image_file:
-                base64_image = base64.b64encode(image_file.read()).decode("utf-8")
+            image_url = self.encoder.encode(screenshot, crop_box(screenshot.size))
 
-            response = self.client.chat.completions.create(
+            response = self.transport.chat(
                 model="llama-3.2-11b-vision-preview",
                 messages=[
                     {
                         "role": "user",
                         "content": [
                             {"type": "text", "text": "Describe active applications/websites in detail:"},
-                            {"type": "image_url", "image_url": {"url": f"data:image/png;base64,{base64_image}"}}
+                            {"type": "image_url", "image_url": {"url": image_url}}
                         ]
                     }
                 ],
                 temperature=0.3,
                 max_tokens=512,
             )
-            os.remove(temp_path)
             return response.choices[0].message.content
 
         except Exception as e:
@@ -116,18 +138,20 @@ Should any of these trigger a warning? Respond ONLY with:
     def get_domains_list(self):
         """Capture screen and extract domain names and application names based on user goal"""
         try:
-            # Capture full screenshot
-            screenshot = pyautogui.screenshot()
-            
-            # Crop the image to remove taskbar (1439x850 instead of 1439x899)
-            width, height = screenshot.size
-            cropped_screenshot = screenshot.crop((0, 0, width, 850))
-            
-            temp_path = "temp_screen.png"
-            cropped_screenshot.save(temp_path)
+            import pyautogui
+            # Capture full screenshot and leave out the taskbar at any resolution; the hash
+            # and the encoder read through the box, so the frame is never copied
+            with self.metrics.time("capture"), self.tracer.span("screenshot"):
+                screenshot = pyautogui.screenshot()
+            box = crop_box(screenshot.size)
+
+            # Reuse the previous answer if the screen hasn't changed
+            cached, frame_key = self.frame_dedup.lookup(screenshot, box)
+            if cached is not None:
+                return cached
 
-            with open(temp_path, "rb") as image_file:
-                base64_image = base64.b64encode(image_file.read()).decode("utf-8")
+            with self.metrics.time("encode"), self.tracer.span("encode"):
+                image_url = self.encoder.encode(screenshot, box)
 
             prompt = f"""Analyze this screenshot in the context of:
     User Goal: {self.user_goal}
@@ -139,18 +163,21 @@ Should any of these trigger a warning? Respond ONLY with:
 
     Return ONLY problematic items as a comma-separated list, or empty string."""
             
-            response = self.client.chat.completions.create(
-                model="llama-3.2-11b-vision-preview",
-                messages=[{"role": "user", "content": [
-                    {"type": "text", "text": prompt},
-                    {"type": "image_url", "image_url": {"url": f"data:image/png;base64,{base64_image}"}}
-                ]}],
-                temperature=0.3,
-                max_tokens=300
-            )
-
-            os.remove(temp_path)
-            return response.choices[0].message.content.strip()
+            with self.metrics.time("vision"):
+                response = self.transport.chat(
+                    deadline=remaining_budget(),
+                    model="llama-3.2-11b-vision-preview",
+                    messages=[{"role": "user", "content": [
+                        {"type": "text", "text": prompt},
+                        {"type": "image_url", "image_url": {"url": image_url}}
+                    ]}],
+                    temperature=0.3,
+                    max_tokens=300
+                )
+
+            domains = response.choices[0].message.content.strip()
+            self.frame_dedup.store(domains, frame_key)
+            return domains
 
         except Exception as e:
             raise RuntimeError(f"Vision analysis failed: {str(e)}")
@@ -158,7 +185,7 @@ Should any of these trigger a warning? Respond ONLY with:
     def compare_activities(self, user_goal, current_activity):
         """Compare current activity with user goal"""
         try:
-            response = self.client.chat.completions.create(
+            response = self.transport.chat(
                 model="llama3-70b-8192",
                 messages=[
                     {"role": "system", "content": "You are evaluating whether current activity matches a focus goal. Be strict about social media - they are always distractions."},
@@ -0,0 +1,170 @@
+import json
+import os
+import sqlite3
+import threading
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    start TEXT NOT NULL,
+    end TEXT,
+    goal TEXT,
+    total_time REAL DEFAULT 0,
+    stats TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_sessions_start ON sessions(start);
+CREATE TABLE IF NOT EXISTS distractions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    session_id INTEGER NOT NULL REFERENCES sessions(id),
+    time TEXT NOT NULL,
+    domains TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_distractions_session ON distractions(session_id, time);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+# Achievement thresholds, in seconds
+NO_DISTRACTION_HOUR = 3600
+PERFECT_SESSION_MIN = 1800
+
+# Keys of a session record that have their own columns; everything else goes in stats
+SESSION_COLUMNS = ("start", "end", "goal", "total_time", "distractions")
+
+
+class SessionStore:
+    """SQLite session history with incremental writes, replacing the rewritten sessions.json"""
+
+    def __init__(self, path="sessions.db", legacy_path="sessions.json"):
+        self.path = path
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        with self.conn:
+            self.conn.executescript(SCHEMA)
+        # A broken sessions.json must not cost us the database; the import is retried next launch
+        self.migration_error = None
+        try:
+            self.migrated = self.migrate_json(legacy_path)
+        except (OSError, ValueError, KeyError, TypeError, AttributeError, sqlite3.Error) as e:
+            self.migrated = 0
+            self.migration_error = e
+
+    def migrate_json(self, legacy_path):
+        """One-time import of an existing sessions.json; returns the number of sessions imported"""
+        with self._lock:
+            if self.conn.execute("SELECT 1 FROM meta WHERE key = 'json_migrated'").fetchone():
+                return 0
+            sessions = []
+            if legacy_path and os.path.exists(legacy_path):
+                with open(legacy_path, "r") as f:
+                    sessions = json.load(f)
+            # One transaction, so an interrupted import is retried from scratch
+            with self.conn:
+                for session in sessions:
+                    session_id = self._insert_session(session)
+                    self.conn.executemany(
+                        "INSERT INTO distractions (session_id, time, domains) VALUES (?, ?, ?)",
+                        [(session_id, d["time"], d.get("domains", "")) for d in session.get("distractions", [])]
+                    )
+                self.conn.execute("INSERT INTO meta (key, value) VALUES ('json_migrated', ?)",
+                                  (str(len(sessions)),))
+            return len(sessions)
+
+    def _insert_session(self, session):
+        stats = {k: v for k, v in session.items() if k not in SESSION_COLUMNS and k != "id"}
+        cursor = self.conn.execute(
+            "INSERT INTO sessions (start, end, goal, total_time, stats) VALUES (?, ?, ?, ?, ?)",
+            (session["start"], session.get("end"), session.get("goal", ""),
+             session.get("total_time", 0), json.dumps(stats))
+        )
+        return cursor.lastrowid
+
+    def begin_session(self, session):
+        """Insert a session as it starts and return its id"""
+        with self._lock, self.conn:
+            return self._insert_session(session)
+
+    def add_distraction(self, session_id, time, domains):
+        """Record a distraction the moment it happens"""
+        with self._lock, self.conn:
+            self.conn.execute("INSERT INTO distractions (session_id, time, domains) VALUES (?, ?, ?)",
+                              (session_id, time, domains))
+
+    def end_session(self, session_id, session, streak=0):
+        """Write the end time, duration and stats of a finished session and fold it into the aggregates"""
+        stats = {k: v for k, v in session.items() if k not in SESSION_COLUMNS and k != "id"}
+        with self._lock, self.conn:
+            self.conn.execute("UPDATE sessions SET end = ?, total_time = ?, stats = ? WHERE id = ?",
+                              (session["end"], session["total_time"], json.dumps(stats), session_id))
+            aggregates = self._aggregates()
+            clean = not session.get("distractions")
+            aggregates["sessions"] += 1
+            aggregates["total_focused_time"] += session["total_time"]
+            aggregates["longest_streak"] = max(aggregates["longest_streak"], streak)
+            aggregates["no_distraction_1h"] |= clean and session["total_time"] >= NO_DISTRACTION_HOUR
+            aggregates["perfect_session"] |= clean and session["total_time"] >= PERFECT_SESSION_MIN
+            self._write_aggregates(aggregates)
+            return aggregates
+
+    def aggregates(self):
+        """Running totals behind the achievements, constant-time after the first call"""
+        with self._lock, self.conn:
+            return self._aggregates()
+
+    def _aggregates(self):
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'aggregates'").fetchone()
+        if row:
+            return json.loads(row["value"])
+        # First run with aggregates: backfill once from the existing history
+        count, total, no_distraction_1h, perfect = self.conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(total_time), 0), "
+            "COALESCE(MAX(total_time >= ? AND NOT EXISTS "
+            "(SELECT 1 FROM distractions WHERE session_id = sessions.id)), 0), "
+            "COALESCE(MAX(total_time >= ? AND NOT EXISTS "
+            "(SELECT 1 FROM distractions WHERE session_id = sessions.id)), 0) "
+            "FROM sessions WHERE end IS NOT NULL", (NO_DISTRACTION_HOUR, PERFECT_SESSION_MIN)
+        ).fetchone()
+        aggregates = {
+            "sessions": count,
+            "total_focused_time": total,
+            "longest_streak": 0,  # Streaks weren't persisted before
+            "no_distraction_1h": bool(no_distraction_1h),
+            "perfect_session": bool(perfect)
+        }
+        self._write_aggregates(aggregates)
+        return aggregates
+
+    def _write_aggregates(self, aggregates):
+        self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('aggregates', ?)",
+                          (json.dumps(aggregates),))
+
+    def count(self):
+        """Number of finished sessions"""
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM sessions WHERE end IS NOT NULL").fetchone()[0]
+
+    def distractions(self, session_id):
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT time, domains FROM distractions WHERE session_id = ? ORDER BY time", (session_id,)
+            ).fetchall()
+        return [{"time": row["time"], "domains": row["domains"]} for row in rows]
+
+    def session_summaries(self, offset=0, limit=-1):
+        """One page of finished sessions without their distractions, oldest first"""
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT id, start, end, total_time, "
+                "(SELECT COUNT(*) FROM distractions WHERE session_id = sessions.id) AS distraction_count "
+                "FROM sessions WHERE end IS NOT NULL ORDER BY start LIMIT ? OFFSET ?", (limit, offset)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
@@ -0,0 +1,92 @@
+# budget.py
+import concurrent.futures
+import threading
+import time
+
+# Deadline of the budgeted stage running on this thread
+_stage = threading.local()
+
+
+class BudgetExceeded(Exception):
+    """A monitor stage overran its time budget or failed"""
+
+
+def remaining_budget():
+    """Seconds left in the budget of the stage running on this thread, or None if unbounded
+
+    Pass it as the transport deadline so a call abandoned by an overrunning
+    stage gives up with it instead of retrying in the background.
+    """
+    deadline = getattr(_stage, "deadline", None)
+    if deadline is None:
+        return None
+    remaining = deadline - time.monotonic()
+    if remaining <= 0:
+        raise BudgetExceeded("stage budget already spent")
+    return remaining
+
+
+class StageBudget:
+    """Run monitor stages under per-stage time budgets, counting overruns"""
+
+    def __init__(self, budgets=None):
+        self.budgets = dict(budgets or {})  # stage -> seconds, missing/0 means unbounded
+        self.overruns = {}
+        self.errors = {}
+        self._lock = threading.Lock()
+        # Overrunning calls can't be killed, they finish in the background
+        # (bounded by remaining_budget() as the transport deadline) while the tick moves on
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=4, thread_name_prefix="stage")
+
+    def _count(self, counters, stage):
+        with self._lock:
+            counters[stage] = counters.get(stage, 0) + 1
+
+    @staticmethod
+    def _call_within(deadline, fn, args):
+        _stage.deadline = deadline
+        try:
+            return fn(*args)
+        finally:
+            _stage.deadline = None
+
+    def run(self, stage, fn, *args):
+        """Call fn(*args) within the stage budget, raising BudgetExceeded on overrun or error"""
+        budget = self.budgets.get(stage)
+        try:
+            if not budget:
+                return fn(*args)
+            future = self._executor.submit(self._call_within, time.monotonic() + budget, fn, args)
+            try:
+                return future.result(timeout=budget)
+            except concurrent.futures.TimeoutError:
+                future.cancel()
+                self._count(self.overruns, stage)
+                raise BudgetExceeded(f"{stage} exceeded its {budget}s budget")
+        except BudgetExceeded:
+            raise
+        except Exception as e:
+            self._count(self.errors, stage)
+            raise BudgetExceeded(f"{stage} failed: {str(e)}") from e
+
+    async def run_async(self, stage, coroutine):
+        """Await a coroutine within the stage budget, cancelling it on overrun"""
+        import asyncio  # Only the --async pipeline gets here
+        budget = self.budgets.get(stage) or None
+        try:
+            return await asyncio.wait_for(coroutine, budget)
+        except asyncio.TimeoutError:
+            self._count(self.overruns, stage)
+            raise BudgetExceeded(f"{stage} exceeded its {budget}s budget")
+        except Exception as e:
+            self._count(self.errors, stage)
+            raise BudgetExceeded(f"{stage} failed: {str(e)}") from e
+
+    def stats(self):
+        """Budget overruns and failures per stage for session reporting"""
+        with self._lock:
+            return {
+                "budgets_seconds": dict(self.budgets),
+                "overruns": dict(self.overruns),
+                "errors": dict(self.errors)
+            }
@@ -0,0 +1,92 @@
+# frame_hash.py
+import time
+
+
+def difference_hash(image, hash_size=8, box=None):
+    """Compute a 64-bit difference hash (dHash) of a PIL image, or of the part inside box"""
+    from PIL import Image  # Already loaded by whoever took the screenshot; keeps import of this module cheap
+    # Downscale first so the grayscale conversion only touches a handful of pixels;
+    # reducing_gap lets Pillow shrink by integer factors before the real resample
+    small = image.resize((hash_size + 1, hash_size), Image.BILINEAR, box=box, reducing_gap=2.0).convert("L")
+    pixels = small.tobytes()
+    row_width = hash_size + 1
+
+    value = 0
+    for row in range(hash_size):
+        offset = row * row_width
+        for col in range(hash_size):
+            value = (value << 1) | (pixels[offset + col] > pixels[offset + col + 1])
+    return value
+
+
+def hamming_distance(a, b):
+    """Number of differing bits between two hashes"""
+    return bin(a ^ b).count("1")
+
+
+class FrameDeduplicator:
+    """Reuse the last vision result while the screen stays effectively unchanged"""
+
+    def __init__(self, threshold=5, max_reuse_age=120, hash_size=8):
+        self.threshold = threshold          # Max Hamming distance still treated as "same screen"
+        self.max_reuse_age = max_reuse_age  # Seconds before a cached result must be refreshed
+        self.hash_size = hash_size
+        self.enabled = True
+
+        self.hits = 0
+        self.misses = 0
+
+        self._reference_hash = None
+        self._reference_time = 0
+        self._cached_result = None
+        self._generation = 0  # Bumped by reset() so answers for frames seen before it are dropped
+
+    def lookup(self, image, box=None):
+        """Return (cached result or None on a miss, frame key to pass to store())"""
+        if not self.enabled:
+            return None, None
+
+        frame_hash = difference_hash(image, self.hash_size, box)
+        age = time.monotonic() - self._reference_time
+
+        if (self._cached_result is not None
+                and age <= self.max_reuse_age
+                and hamming_distance(frame_hash, self._reference_hash) <= self.threshold):
+            self.hits += 1
+            return self._cached_result, (self._generation, frame_hash)
+
+        self.misses += 1
+        return None, (self._generation, frame_hash)
+
+    def store(self, result, frame_key):
+        """Remember the result produced for the frame whose lookup returned frame_key"""
+        if not self.enabled or frame_key is None:
+            return
+        generation, frame_hash = frame_key
+        if generation != self._generation:
+            return
+        # Compare future frames against the frame that produced the result,
+        # not the latest one, so slow drift can't extend a stale verdict. The
+        # key travels with the call, so a late answer can't be attached to a
+        # newer frame
+        self._reference_hash = frame_hash
+        self._reference_time = time.monotonic()
+        self._cached_result = result
+
+    def reset(self, clear_stats=False):
+        """Drop the cached result (e.g. when the user goal changes)"""
+        self._reference_hash = None
+        self._cached_result = None
+        self._generation += 1
+        if clear_stats:
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        """Hit/miss counters for session reporting"""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total * 100, 1) if total else 0.0
+        }
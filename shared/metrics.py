@@ -0,0 +1,147 @@
+# metrics.py
+import bisect
+import os
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Seconds; spans a cached capture (a few ms) up to a slow vision call
+STAGE_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+
+class Histogram:
+    """Cumulative-bucket latency histogram"""
+
+    def __init__(self, buckets=STAGE_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # Last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class MetricsRegistry:
+    """Per-stage latency histograms and counters for the monitoring loop"""
+
+    def __init__(self, prefix="focus"):
+        self.prefix = prefix
+        self.histograms = {}
+        self.counters = {}
+        self.collectors = []
+        self._lock = threading.Lock()
+
+    def observe(self, stage, seconds):
+        with self._lock:
+            histogram = self.histograms.get(stage)
+            if histogram is None:
+                histogram = self.histograms[stage] = Histogram()
+            histogram.observe(seconds)
+
+    @contextmanager
+    def time(self, stage):
+        """Record how long the with-block took under the given stage"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - started)
+
+    def inc(self, name, amount=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def add_collector(self, collector):
+        """Register a callable returning {name: count} for counters kept elsewhere (transport, caches)"""
+        self.collectors.append(collector)
+
+    def render(self):
+        """Prometheus text exposition format"""
+        stage_metric = f"{self.prefix}_stage_seconds"
+        lines = [f"# HELP {stage_metric} Time spent in each monitoring stage",
+                 f"# TYPE {stage_metric} histogram"]
+        with self._lock:
+            for stage, histogram in sorted(self.histograms.items()):
+                cumulative = 0
+                for bound, count in zip(histogram.buckets + ("+Inf",), histogram.counts):
+                    cumulative += count
+                    lines.append(f'{stage_metric}_bucket{{stage="{stage}",le="{bound}"}} {cumulative}')
+                lines.append(f'{stage_metric}_sum{{stage="{stage}"}} {histogram.sum:.6f}')
+                lines.append(f'{stage_metric}_count{{stage="{stage}"}} {histogram.count}')
+            counters = dict(self.counters)
+
+        for collector in self.collectors:
+            try:
+                counters.update(collector())
+            except Exception:
+                pass  # A failing collector shouldn't take the endpoint down
+        for name, value in sorted(counters.items()):
+            metric = f"{self.prefix}_{name}_total"
+            lines.append(f"# TYPE {metric} counter")
+            lines.append(f"{metric} {value}")
+        return "\n".join(lines) + "\n"
+
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        if self.path != "/metrics":
+            self.send_error(404)
+            return
+        body = self.server.registry.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class MetricsExporter:
+    """Opt-in metrics surface: a localhost /metrics endpoint and/or a periodically rewritten .prom file"""
+
+    def __init__(self, registry, port=None, path=None, interval=5.0):
+        self.registry = registry
+        self.port = port
+        self.path = path
+        self.interval = interval
+        self.server = None
+        self._stop_event = threading.Event()
+
+    def start(self):
+        if self.port is not None:
+            # Localhost only; the metrics include what's on screen
+            self.server = ThreadingHTTPServer(("127.0.0.1", self.port), MetricsHandler)
+            self.server.daemon_threads = True
+            self.server.registry = self.registry
+            threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        if self.path:
+            threading.Thread(target=self._write_loop, daemon=True).start()
+        return self
+
+    def _write_loop(self):
+        while not self._stop_event.wait(self.interval):
+            self.write_file()
+
+    def write_file(self):
+        """Atomically replace the metrics file so scrapers never read a partial one"""
+        temp_path = self.path + ".tmp"
+        try:
+            with open(temp_path, "w") as f:
+                f.write(self.registry.render())
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            print(f"Metrics file error: {str(e)}")
+
+    def stop(self):
+        self._stop_event.set()
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+        if self.path:
+            self.write_file()
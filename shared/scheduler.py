@@ -0,0 +1,161 @@
+# scheduler.py
+import json
+import threading
+import time
+
+
+class AdaptiveScheduler:
+    """Choose the delay before the next capture from screen stability and distraction history"""
+
+    def __init__(self, base_interval, max_interval=None, backoff_factor=2.0,
+                 burst_interval=2, burst_length=2, log_path=None, log_callback=None):
+        self.base_interval = base_interval
+        self.max_interval = max_interval or base_interval * 6
+        self.backoff_factor = backoff_factor
+        self.burst_interval = min(burst_interval, base_interval)
+        self.burst_length = burst_length  # Consecutive detections needed to confirm a distraction
+        self.log_path = log_path
+        self.log_callback = log_callback
+
+        self.current_interval = base_interval
+        self.distraction_streak = 0
+        self._last_signature = None
+
+        self.ticks = 0
+        self.total_delay = 0.0
+        self.reasons = {}
+
+    @property
+    def distraction_confirmed(self):
+        """True once a distraction survived the confirmation burst"""
+        return self.distraction_streak >= self.burst_length
+
+    def observe(self, signature, distracted):
+        """Record one tick's outcome and return the delay before the next capture"""
+        changed = signature != self._last_signature
+        self._last_signature = signature
+
+        if distracted:
+            self.distraction_streak += 1
+            self.current_interval = self.base_interval
+            if self.distraction_confirmed:
+                delay, reason = self.base_interval, "distraction_confirmed"
+            else:
+                delay, reason = self.burst_interval, "confirming_distraction"
+        else:
+            self.distraction_streak = 0
+            if changed:
+                # Snap back so the next transition is caught quickly
+                self.current_interval = self.base_interval
+                delay, reason = self.base_interval, "activity_changed"
+            else:
+                self.current_interval = min(self.current_interval * self.backoff_factor, self.max_interval)
+                delay, reason = self.current_interval, "stable_backoff"
+
+        self.ticks += 1
+        self.total_delay += delay
+        self.reasons[reason] = self.reasons.get(reason, 0) + 1
+        self.log_decision(delay, reason, distracted, changed)
+        return delay
+
+    def log_decision(self, delay, reason, distracted, changed):
+        """Append the decision to the schedule log for offline tuning"""
+        entry = {
+            "time": time.time(),
+            "delay": round(delay, 2),
+            "reason": reason,
+            "distracted": distracted,
+            "changed": changed,
+            "streak": self.distraction_streak
+        }
+        if self.log_callback:
+            self.log_callback(entry)
+        if self.log_path:
+            try:
+                with open(self.log_path, "a") as f:
+                    f.write(json.dumps(entry) + "\n")
+            except Exception as e:
+                print(f"Schedule log error: {str(e)}")
+
+    def stats(self):
+        """Capture cadence summary for session reporting"""
+        return {
+            "ticks": self.ticks,
+            "avg_interval_seconds": round(self.total_delay / self.ticks, 1) if self.ticks else 0.0,
+            "decisions": dict(self.reasons)
+        }
+
+
+class TickScheduler:
+    """Fixed-rate ticks on the monotonic clock with missed-deadline accounting"""
+
+    def __init__(self, interval):
+        self.interval = interval
+        self._deadline = None
+        self._period_start = None
+        self._period = interval
+        self._stop_event = threading.Event()
+
+        self.ticks = 0
+        self.late_ticks = 0       # Cycles that started after their deadline
+        self.skipped_ticks = 0    # Whole periods dropped because a cycle overran
+        self.total_lateness = 0.0
+        self.max_lateness = 0.0
+
+    def next_delay(self, interval=None):
+        """Advance to the next deadline and return how long to sleep until it"""
+        self._period = interval or self.interval
+        now = time.monotonic()
+
+        if self._deadline is None:
+            self._deadline = now
+        else:
+            # Deadlines advance from the previous deadline, not from "now",
+            # so analysis time doesn't stretch the period
+            self._deadline += self._period
+            lateness = now - self._deadline
+            if lateness > 0:
+                self.late_ticks += 1
+                self.total_lateness += lateness
+                self.max_lateness = max(self.max_lateness, lateness)
+                # Skip periods we overran entirely instead of bursting to catch up
+                missed = int(lateness // self._period)
+                if missed:
+                    self.skipped_ticks += missed
+                    self._deadline += missed * self._period
+
+        self._period_start = self._deadline - self._period
+        self.ticks += 1
+        return max(0.0, self._deadline - now)
+
+    def wait(self, interval=None):
+        """Block until the next tick; returns False if the scheduler was stopped"""
+        delay = self.next_delay(interval)
+        if delay > 0:
+            self._stop_event.wait(delay)
+        return not self._stop_event.is_set()
+
+    def stop(self):
+        """Wake any waiter and end the schedule"""
+        self._stop_event.set()
+
+    @property
+    def stopped(self):
+        return self._stop_event.is_set()
+
+    def progress(self):
+        """Fraction of the wait for the next tick that has elapsed (0-1)"""
+        if self._period_start is None:
+            return 0.0
+        elapsed = time.monotonic() - self._period_start
+        return min(1.0, max(0.0, elapsed / self._period)) if self._period else 1.0
+
+    def stats(self):
+        """Late and skipped tick counts for session reporting"""
+        return {
+            "ticks": self.ticks,
+            "late_ticks": self.late_ticks,
+            "skipped_ticks": self.skipped_ticks,
+            "avg_lateness_seconds": round(self.total_lateness / self.late_ticks, 2) if self.late_ticks else 0.0,
+            "max_lateness_seconds": round(self.max_lateness, 2)
+        }
@@ -0,0 +1,87 @@
+# screen_encoder.py
+import base64
+import io
+import time
+
+MIME_TYPES = {
+    "PNG": "image/png",
+    "JPEG": "image/jpeg",
+    "WEBP": "image/webp"
+}
+
+
+def crop_box(size, bottom_fraction=0.05):
+    """Box leaving out the bottom fraction of the screen (taskbar/dock) regardless of resolution
+
+    Passed to resize() instead of cropping, so the full-size frame is never copied.
+    """
+    width, height = size
+    return (0, 0, width, int(height * (1 - bottom_fraction)))
+
+
+class ScreenEncoder:
+    """Encode screenshots in memory as base64 data URLs for the vision model"""
+
+    def __init__(self, image_format="JPEG", quality=80, max_long_edge=1600):
+        self.image_format = image_format.upper()
+        self.quality = quality
+        self.max_long_edge = max_long_edge  # 0 disables downscaling
+
+        # Stats from the most recent encode plus running totals
+        self.last_payload_bytes = 0
+        self.last_encode_seconds = 0.0
+        self.frames = 0
+        self.total_payload_bytes = 0
+        self.total_encode_seconds = 0.0
+
+        if self.image_format not in MIME_TYPES:
+            raise ValueError(f"Unsupported image format: {image_format}")
+
+    def encode(self, image, box=None):
+        """Return a data URL for the image, or the part of it inside box, without touching the disk"""
+        from PIL import Image  # Deferred like the rest of the imaging stack
+        started = time.perf_counter()
+
+        if box is not None and tuple(box) == (0, 0) + image.size:
+            box = None
+        left, top, right, bottom = box or (0, 0) + image.size
+        width, height = right - left, bottom - top
+        # resize() reads the box straight from the frame and writes only the small image;
+        # crop() or thumbnail() would need a full-size copy first
+        if self.max_long_edge and max(width, height) > self.max_long_edge:
+            scale = self.max_long_edge / max(width, height)
+            target = (max(1, round(width * scale)), max(1, round(height * scale)))
+            image = image.resize(target, Image.BILINEAR, box=box, reducing_gap=2.0)
+        elif box is not None:
+            # Nothing to shrink, so the boxed pixels have to be copied once to be saved
+            image = image.crop(box)
+        if self.image_format == "JPEG" and image.mode != "RGB":
+            image = image.convert("RGB")
+
+        buffer = io.BytesIO()
+        if self.image_format == "PNG":
+            image.save(buffer, format="PNG", optimize=False, compress_level=1)
+        else:
+            image.save(buffer, format=self.image_format, quality=self.quality)
+
+        # Encode straight from the buffer's memory to avoid an extra bytes copy
+        with buffer.getbuffer() as view:
+            payload = base64.b64encode(view).decode("ascii")
+        self.last_payload_bytes = buffer.tell()
+        buffer.close()
+
+        self.last_encode_seconds = time.perf_counter() - started
+        self.frames += 1
+        self.total_payload_bytes += self.last_payload_bytes
+        self.total_encode_seconds += self.last_encode_seconds
+
+        return f"data:{MIME_TYPES[self.image_format]};base64,{payload}"
+
+    def stats(self):
+        """Average payload size and encode time for session reporting"""
+        return {
+            "format": self.image_format,
+            "frames_encoded": self.frames,
+            "avg_payload_kb": round(self.total_payload_bytes / self.frames / 1024, 1) if self.frames else 0.0,
+            "avg_encode_ms": round(self.total_encode_seconds / self.frames * 1000, 1) if self.frames else 0.0
+        }
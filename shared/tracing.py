@@ -0,0 +1,96 @@
+# tracing.py
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+
+class Tracer:
+    """Chrome trace-event recorder; spans from every thread land on their own track in Perfetto
+
+    Events are streamed to disk as a JSON array, so a long or crashed session
+    still leaves a loadable trace and memory stays flat. Without a path every
+    call is a no-op.
+    """
+
+    def __init__(self, path=None, flush_every=200):
+        self.path = path
+        self.enabled = bool(path)
+        self.flush_every = flush_every
+        self.events = 0
+        self._pid = os.getpid()
+        self._origin = time.perf_counter()
+        self._named_threads = set()
+        self._buffer = []
+        self._lock = threading.Lock()
+        self._file = None
+        if self.enabled:
+            self._file = open(path, "w", encoding="utf-8")
+            self._file.write("[\n")
+
+    def _now_us(self):
+        return (time.perf_counter() - self._origin) * 1_000_000
+
+    def _emit(self, event):
+        thread = threading.current_thread()
+        tid = thread.ident
+        event["pid"] = self._pid
+        event["tid"] = tid
+        with self._lock:
+            if self._file is None:
+                return
+            if tid not in self._named_threads:
+                # Metadata so tracks show "MainThread", "progress", "popup" instead of raw ids
+                self._named_threads.add(tid)
+                self._buffer.append({"name": "thread_name", "ph": "M", "pid": self._pid, "tid": tid,
+                                     "args": {"name": thread.name}})
+            self._buffer.append(event)
+            self.events += 1
+            if len(self._buffer) >= self.flush_every:
+                self._flush()
+
+    def _flush(self):
+        for event in self._buffer:
+            self._file.write(json.dumps(event) + ",\n")
+        self._buffer.clear()
+        self._file.flush()
+
+    @contextmanager
+    def span(self, name, **args):
+        """Record the with-block as a complete ("X") event on the calling thread"""
+        if not self.enabled:
+            yield
+            return
+        started = self._now_us()
+        try:
+            yield
+        finally:
+            event = {"name": name, "ph": "X", "ts": round(started, 1),
+                     "dur": round(self._now_us() - started, 1)}
+            if args:
+                event["args"] = args
+            self._emit(event)
+
+    def instant(self, name, **args):
+        """Zero-length marker, e.g. a dropped frame or a stale verdict"""
+        if not self.enabled:
+            return
+        event = {"name": name, "ph": "i", "s": "t", "ts": round(self._now_us(), 1)}
+        if args:
+            event["args"] = args
+        self._emit(event)
+
+    def close(self):
+        with self._lock:
+            if self._file is None:
+                return
+            self._flush()
+            # Perfetto accepts the trailing comma form, but close it properly for other tools
+            self._file.write(json.dumps({"name": "trace_end", "ph": "i", "s": "g", "pid": self._pid,
+                                         "tid": 0, "ts": round(self._now_us(), 1)}) + "\n]\n")
+            self._file.close()
+            self._file = None
+
+
+NULL_TRACER = Tracer()
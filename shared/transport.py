@@ -0,0 +1,251 @@
+# transport.py
+import asyncio
+import email.utils
+import random
+import threading
+import time
+
+import groq
+import httpx
+from groq import Groq, AsyncGroq
+
+from tracing import NULL_TRACER
+
+
+class TransportDegraded(Exception):
+    """Raised instead of calling the API while the circuit breaker is open"""
+
+
+class CircuitBreaker:
+    """Stop calling the API after repeated failures, probing again after a cool-down
+
+    While half-open only one probe goes out at a time; concurrent callers are
+    short-circuited until it succeeds or fails. A probe that never reports
+    back (abandoned by its caller) is replaced after another cool-down.
+    """
+
+    def __init__(self, failure_threshold=5, reset_timeout=30):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self.probe_started = None
+        self.trips = 0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        with self._lock:
+            if self.opened_at is None:
+                return "closed"
+            if time.monotonic() - self.opened_at >= self.reset_timeout:
+                return "half_open"
+            return "open"
+
+    def allow(self):
+        """True if a request may go out (closed, or the single half-open probe)"""
+        with self._lock:
+            if self.opened_at is None:
+                return True
+            now = time.monotonic()
+            if now - self.opened_at < self.reset_timeout:
+                return False
+            if self.probe_started is not None and now - self.probe_started < self.reset_timeout:
+                return False
+            self.probe_started = now
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self.probe_started = None
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self.probe_started = None
+            if self.opened_at is not None or self.failures >= self.failure_threshold:
+                # A failed half-open probe re-opens the breaker for another cool-down
+                if self.opened_at is None:
+                    self.trips += 1
+                self.opened_at = time.monotonic()
+
+
+def retry_after_seconds(error):
+    """Seconds requested by a Retry-After / retry-after-ms header, if any"""
+    response = getattr(error, "response", None)
+    if response is None:
+        return None
+    headers = response.headers
+    try:
+        if "retry-after-ms" in headers:
+            return float(headers["retry-after-ms"]) / 1000
+        if "retry-after" in headers:
+            value = headers["retry-after"]
+            try:
+                return float(value)
+            except ValueError:
+                return max(0.0, email.utils.parsedate_to_datetime(value).timestamp() - time.time())
+    except Exception:
+        return None
+    return None
+
+
+def is_retryable(error):
+    """Timeouts, connection errors, 408/429 and 5xx are worth retrying"""
+    if isinstance(error, (groq.APITimeoutError, groq.APIConnectionError)):
+        return True
+    if isinstance(error, groq.APIStatusError):
+        return error.status_code in (408, 429) or error.status_code >= 500
+    return False
+
+
+class GroqTransport:
+    """Shared Groq transport: pooled connections, deadlines, jittered retries and a circuit breaker"""
+
+    def __init__(self, api_key=None, base_url=None, timeout=20, max_retries=3,
+                 backoff_base=0.5, backoff_cap=8, breaker=None):
+        self.api_key = api_key
+        self.base_url = base_url
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.breaker = breaker or CircuitBreaker()
+        self.tracer = NULL_TRACER
+
+        # One keep-alive pool for every call; the SDK's own retries are disabled
+        self.http_client = httpx.Client(timeout=timeout,
+                                        limits=httpx.Limits(max_connections=8, max_keepalive_connections=4))
+        self.client = Groq(api_key=api_key, base_url=base_url, http_client=self.http_client,
+                           max_retries=0, timeout=timeout)
+        self._async_client = None
+
+        self.calls = 0
+        self.retries = 0
+        self.failures = 0
+        self.short_circuits = 0
+        self.deadline_cuts = 0  # Attempts our own deadline ended; not held against the API
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self._lock = threading.Lock()
+
+    @property
+    def async_client(self):
+        """AsyncGroq client on its own pooled connection, created on first use"""
+        if self._async_client is None:
+            self._async_client = AsyncGroq(
+                api_key=self.api_key, base_url=self.base_url, max_retries=0, timeout=self.timeout,
+                http_client=httpx.AsyncClient(timeout=self.timeout,
+                                              limits=httpx.Limits(max_connections=8, max_keepalive_connections=4)))
+        return self._async_client
+
+    @property
+    def degraded(self):
+        """True while the breaker is keeping calls away from the API"""
+        return self.breaker.state != "closed"
+
+    def _count(self, field):
+        with self._lock:
+            setattr(self, field, getattr(self, field) + 1)
+
+    def _record_usage(self, response):
+        usage = getattr(response, "usage", None)
+        if usage is None:
+            return
+        with self._lock:
+            self.prompt_tokens += getattr(usage, "prompt_tokens", 0) or 0
+            self.completion_tokens += getattr(usage, "completion_tokens", 0) or 0
+
+    def _before_attempt(self):
+        if not self.breaker.allow():
+            self._count("short_circuits")
+            raise TransportDegraded("Groq API unavailable (circuit open)")
+
+    def _retry_delay(self, error, attempt, deadline, cut_short=False):
+        """Backoff before the next attempt, or None to give up"""
+        if not is_retryable(error):
+            # A 4xx or bad payload means the API itself is reachable
+            self.breaker.record_success()
+            return None
+        if cut_short and isinstance(error, groq.APITimeoutError):
+            # The caller's deadline (e.g. a stage budget) ended the attempt before the
+            # full timeout; a slow but healthy API mustn't open the breaker
+            self._count("deadline_cuts")
+            return None
+        self.breaker.record_failure()
+        if attempt >= self.max_retries:
+            return None
+        # Full jitter, but never sooner than the server asked for
+        delay = random.uniform(0, min(self.backoff_cap, self.backoff_base * 2 ** attempt))
+        delay = max(delay, retry_after_seconds(error) or 0.0)
+        if time.monotonic() + delay >= deadline:
+            return None
+        self._count("retries")
+        return delay
+
+    def chat(self, timeout=None, deadline=None, **kwargs):
+        """chat.completions.create with a per-attempt timeout and an overall deadline"""
+        timeout = timeout or self.timeout
+        deadline = time.monotonic() + (deadline or timeout * (self.max_retries + 1))
+        self._count("calls")
+        attempt = 0
+        while True:
+            self._before_attempt()
+            try:
+                remaining = max(0.1, min(timeout, deadline - time.monotonic()))
+                cut_short = remaining < timeout
+                with self.tracer.span("llm_request", model=kwargs.get("model"), attempt=attempt):
+                    response = self.client.chat.completions.create(timeout=remaining, **kwargs)
+                self.breaker.record_success()
+                self._record_usage(response)
+                return response
+            except Exception as e:
+                delay = self._retry_delay(e, attempt, deadline, cut_short)
+                if delay is None:
+                    self._count("failures")
+                    raise
+                time.sleep(delay)
+                attempt += 1
+
+    async def achat(self, timeout=None, deadline=None, **kwargs):
+        """Async variant of chat on the AsyncGroq client"""
+        timeout = timeout or self.timeout
+        deadline = time.monotonic() + (deadline or timeout * (self.max_retries + 1))
+        self._count("calls")
+        attempt = 0
+        while True:
+            self._before_attempt()
+            try:
+                remaining = max(0.1, min(timeout, deadline - time.monotonic()))
+                cut_short = remaining < timeout
+                with self.tracer.span("llm_request", model=kwargs.get("model"), attempt=attempt):
+                    response = await self.async_client.chat.completions.create(timeout=remaining, **kwargs)
+                self.breaker.record_success()
+                self._record_usage(response)
+                return response
+            except Exception as e:
+                delay = self._retry_delay(e, attempt, deadline, cut_short)
+                if delay is None:
+                    self._count("failures")
+                    raise
+                await asyncio.sleep(delay)
+                attempt += 1
+
+    def stats(self):
+        """Call, retry and breaker counters for session reporting"""
+        return {
+            "calls": self.calls,
+            "retries": self.retries,
+            "failures": self.failures,
+            "short_circuits": self.short_circuits,
+            "deadline_cuts": self.deadline_cuts,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "breaker_trips": self.breaker.trips,
+            "state": self.breaker.state
+        }
+
+    def close(self):
+        self.http_client.close()
@@ -0,0 +1,21 @@
+import os
+import sys
+
+import pytest
+
+# The apps run as scripts from their own folders; make their modules importable here
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for folder in ("Procrastination Prevention CLI version", "Procrastination Prevention UI version", "shared"):
+    path = os.path.join(ROOT, folder)
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+
+@pytest.fixture
+def guardian(tmp_path, monkeypatch):
+    """A CLI ProcrastinationPreventer working in tmp_path; its transport is never called unless a test replaces it"""
+    pytest.importorskip("groq")
+    from procrastination_preventer import ProcrastinationPreventer
+    (tmp_path / "api.txt").write_text("test-key")
+    monkeypatch.chdir(tmp_path)
+    return ProcrastinationPreventer()
@@ -0,0 +1,118 @@
+import os
+import sys
+import types
+
+import pytest
+
+import active_window
+from active_window import ActiveWindowLocator
+
+
+@pytest.fixture
+def x11(monkeypatch):
+    """Route region() through the X11 lookup, whatever platform the tests run on"""
+    monkeypatch.setattr(active_window.platform, "system", lambda: "Linux")
+    monkeypatch.setattr(active_window, "has_xlib", True)
+
+
+def fake_xlib(active_id=42, origin=(100, 50), size=(800, 600), extents=None):
+    """Just enough of python-xlib for _x11_rect: a root window, one client and its properties"""
+    Value = types.SimpleNamespace
+
+    class Window:
+        def get_geometry(self):
+            return Value(width=size[0], height=size[1])
+
+        def get_full_property(self, atom, property_type):
+            if atom == "_NET_FRAME_EXTENTS" and extents is not None:
+                return Value(value=list(extents))
+            return None
+
+    class Root:
+        def get_full_property(self, atom, property_type):
+            return Value(value=[active_id]) if atom == "_NET_ACTIVE_WINDOW" else None
+
+        def translate_coords(self, window, x, y):
+            return Value(x=origin[0] + x, y=origin[1] + y)
+
+    class Display:
+        def screen(self):
+            return Value(root=Root())
+
+        def intern_atom(self, name):
+            return name
+
+        def create_resource_object(self, kind, resource_id):
+            assert (kind, resource_id) == ("window", active_id)
+            return Window()
+
+    return types.SimpleNamespace(X=Value(AnyPropertyType=0), display=Value(Display=Display))
+
+
+def test_x11_rect_reads_active_window_geometry(monkeypatch):
+    monkeypatch.setitem(sys.modules, "Xlib", fake_xlib())
+    assert ActiveWindowLocator()._x11_rect() == (100, 50, 800, 600)
+
+
+def test_x11_rect_includes_frame_extents(monkeypatch):
+    # _NET_FRAME_EXTENTS is left, right, top, bottom
+    monkeypatch.setitem(sys.modules, "Xlib", fake_xlib(extents=(2, 2, 30, 2)))
+    assert ActiveWindowLocator()._x11_rect() == (98, 20, 804, 632)
+
+
+def test_x11_rect_without_active_window(monkeypatch):
+    monkeypatch.setitem(sys.modules, "Xlib", fake_xlib(active_id=0))
+    assert ActiveWindowLocator()._x11_rect() is None
+
+
+def test_region_adds_margin(x11):
+    locator = ActiveWindowLocator(margin=16)
+    locator._x11_rect = lambda: (100, 50, 800, 600)
+    assert locator.region((1920, 1080)) == (84, 34, 832, 632)
+    assert locator.stats() == {"lookups": 1, "fallbacks": 0}
+
+
+def test_region_clamps_to_screen(x11):
+    locator = ActiveWindowLocator(margin=16)
+    locator._x11_rect = lambda: (-8, -30, 1940, 1120)  # Maximized, decorations off-screen
+    assert locator.region((1920, 1080)) == (0, 0, 1920, 1080)
+
+
+def test_region_falls_back_for_offscreen_or_tiny_windows(x11):
+    locator = ActiveWindowLocator(margin=0)
+    for rect in [(3000, 100, 400, 300), (10, 10, 20, 20), None]:
+        locator._x11_rect = lambda rect=rect: rect
+        assert locator.region((1920, 1080)) is None
+    assert locator.stats() == {"lookups": 3, "fallbacks": 3}
+
+
+def test_region_falls_back_when_lookup_fails(x11):
+    locator = ActiveWindowLocator()
+
+    def broken():
+        raise RuntimeError("display went away")
+
+    locator._x11_rect = broken
+    assert locator.region((1920, 1080)) is None
+    assert locator.fallbacks == 1
+
+
+@pytest.mark.skipif(not os.environ.get("DISPLAY") or not active_window.has_xlib,
+                    reason="needs python-xlib and an X server, e.g. xvfb-run -a pytest")
+def test_x11_rect_on_real_display():
+    from Xlib import Xatom, display
+
+    conn = display.Display()
+    screen = conn.screen()
+    window = screen.root.create_window(120, 80, 400, 300, 0, screen.root_depth)
+    window.map()
+    # Without a window manager, set _NET_ACTIVE_WINDOW the way one would
+    active = conn.intern_atom("_NET_ACTIVE_WINDOW")
+    screen.root.change_property(active, Xatom.WINDOW, 32, [window.id])
+    conn.sync()
+    try:
+        assert ActiveWindowLocator()._x11_rect() == (120, 80, 400, 300)
+    finally:
+        screen.root.delete_property(active)
+        window.destroy()
+        conn.sync()
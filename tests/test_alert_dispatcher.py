@@ -0,0 +1,90 @@
+from alert_dispatcher import AlertDispatcher
+
+DISTRACTION = {"allowed": False, "reason": "Not part of your goal", "severity": "medium"}
+REDDIT = {"name": "reddit.com"}
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def dispatcher(clock, channels=("console",), escalate_after=3, **kwargs):
+    """A dispatcher whose channels record what they receive; returns it and the records"""
+    delivered = {name: [] for name in channels}
+    alerts = AlertDispatcher({name: delivered[name].append for name in channels}, window=60,
+                             escalate_after=escalate_after, clock=clock, **kwargs)
+    return alerts, delivered
+
+
+def test_repeats_are_coalesced_and_escalated():
+    clock = Clock()
+    alerts, channels = dispatcher(clock)
+    delivered = channels["console"]
+    for _ in range(6):
+        alerts.handle(DISTRACTION, REDDIT)
+        clock.now += 5
+    # The first alert and the escalation on the 4th repeat; the rest are folded in
+    assert [(a["severity"], a["repeats"]) for a in delivered] == [("medium", 1), ("high", 4)]
+    assert delivered[1]["repeat_seconds"] == 15
+    assert (alerts.coalesced, alerts.escalated) == (4, 1)
+
+    # Same activity with different case and spacing still counts as a repeat
+    assert alerts.handle(DISTRACTION, {"name": " Reddit.com"}) is None
+
+
+def test_a_lasting_distraction_gets_one_reminder_per_window():
+    clock = Clock()
+    alerts, channels = dispatcher(clock, escalate_after=100)
+    delivered = channels["console"]
+    for _ in range(13):
+        alerts.handle(DISTRACTION, REDDIT)
+        clock.now += 10
+    assert [a["repeats"] for a in delivered] == [1, 7, 13]
+
+
+def test_state_is_forgotten_after_a_quiet_window():
+    clock = Clock()
+    alerts, channels = dispatcher(clock)
+    delivered = channels["console"]
+    alerts.handle(DISTRACTION, REDDIT)
+    clock.now += 61
+    alerts.handle(DISTRACTION, REDDIT)
+    assert [a["repeats"] for a in delivered] == [1, 1]
+
+
+def test_each_channel_has_its_own_rate_limit():
+    clock = Clock()
+    alerts, delivered = dispatcher(clock, channels=("console", "sound"), rate_limits={"sound": 5})
+    alerts.handle(DISTRACTION, REDDIT)
+    clock.now += 1
+    alerts.handle(DISTRACTION, {"name": "youtube.com"})
+    clock.now += 5
+    alerts.handle(DISTRACTION, {"name": "netflix.com"})
+    assert (len(delivered["console"]), len(delivered["sound"])) == (3, 2)
+    assert alerts.stats()["suppressed"] == {"console": 0, "sound": 1}
+
+
+def test_a_failing_channel_does_not_stop_the_others():
+    def broken(alert):
+        raise RuntimeError("no display")
+
+    delivered = []
+    alerts = AlertDispatcher({"popup": broken, "console": delivered.append}, clock=Clock())
+    alerts.handle(DISTRACTION, REDDIT)
+    assert len(delivered) == 1
+    assert alerts.stats()["delivered"] == {"popup": 0, "console": 1}
+
+
+def test_submitted_alerts_are_delivered_before_close_returns():
+    delivered = []
+    alerts = AlertDispatcher({"console": delivered.append})
+    alerts.remove_channel("sound")
+    alerts.submit(DISTRACTION, REDDIT)
+    alerts.submit(DISTRACTION, {"name": "youtube.com"})
+    alerts.close()
+    assert [a["severity"] for a in delivered] == ["medium", "medium"]
+    assert alerts.stats()["received"] == 2
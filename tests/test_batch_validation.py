@@ -0,0 +1,81 @@
+import json
+import types
+
+import pytest
+
+
+def completion(content):
+    return types.SimpleNamespace(choices=[types.SimpleNamespace(message=types.SimpleNamespace(content=content))])
+
+
+class FakeTransport:
+    """Answers chat() from a list of replies; an Exception in the list is raised instead"""
+
+    def __init__(self, *replies):
+        self.replies = list(replies)
+        self.requests = []
+
+    def chat(self, deadline=None, **kwargs):
+        self.requests.append(kwargs)
+        reply = self.replies.pop(0)
+        if isinstance(reply, Exception):
+            raise reply
+        return completion(reply)
+
+
+ACTIVITIES = [{"name": "reddit.com", "content": "r/aww"}, {"name": "news.site", "content": "Headlines"},
+              {"name": "docs.python.org", "content": "asyncio"}]
+
+
+@pytest.fixture
+def validator(guardian):
+    guardian.local_rules_enabled = False
+    guardian.user_goal = "Learn asyncio"
+    return guardian
+
+
+def test_parse_batch_verdicts_keeps_well_formed_entries_by_index(validator):
+    response = completion(json.dumps({"verdicts": [
+        {"index": 1, "allowed": False, "reason": "news"},
+        {"index": 0, "allowed": "yes"},      # Not a bool
+        {"index": 1, "allowed": True},       # Duplicate index
+        {"index": 7, "allowed": True},       # Out of range
+        "junk",
+        {"index": 2, "allowed": True, "reason": "docs"}
+    ]}))
+    assert validator.parse_batch_verdicts(response, 3) == [
+        None, {"allowed": False, "reason": "news"}, {"allowed": True, "reason": "docs"}
+    ]
+
+
+@pytest.mark.parametrize("content", ["not json", json.dumps({"verdicts": "nope"}), json.dumps({})])
+def test_parse_batch_verdicts_on_malformed_responses(validator, content):
+    assert validator.parse_batch_verdicts(completion(content), 2) == [None, None]
+
+
+def test_one_request_validates_the_whole_frame(validator):
+    verdicts = [{"index": i, "allowed": i == 2, "reason": "r"} for i in range(3)]
+    validator.transport = FakeTransport(json.dumps({"verdicts": verdicts}))
+    result = validator.validate_activities(ACTIVITIES)
+    assert [v["allowed"] for v in result] == [False, False, True]
+    assert len(validator.transport.requests) == 1
+    # Verdicts are cached, so the same frame needs no request at all
+    assert [v["allowed"] for v in validator.validate_activities(ACTIVITIES)] == [False, False, True]
+    assert len(validator.transport.requests) == 1
+
+
+def test_malformed_entries_fall_back_to_per_item_calls(validator):
+    validator.transport = FakeTransport(
+        json.dumps({"verdicts": [{"index": 0, "allowed": False}, {"index": 2, "allowed": True}]}),
+        json.dumps({"allowed": True, "reason": "per item"}))
+    result = validator.validate_activities(ACTIVITIES)
+    assert result[1] == {"allowed": True, "reason": "per item"}
+    assert len(validator.transport.requests) == 2
+    assert validator.batch_fallback_items == 1
+
+
+def test_transport_failure_fails_open_without_per_item_calls(validator):
+    validator.transport = FakeTransport(TimeoutError("read timed out"))
+    result = validator.validate_activities(ACTIVITIES)
+    assert all(v["allowed"] and v["degraded"] for v in result)
+    assert len(validator.transport.requests) == 1
@@ -0,0 +1,106 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from budget import BudgetExceeded, StageBudget, remaining_budget
+
+
+def test_unbounded_stage_runs_inline():
+    budget = StageBudget({"vision": 0})
+    assert budget.run("vision", lambda: (threading.current_thread().name, remaining_budget())) == \
+        (threading.current_thread().name, None)
+
+
+def test_remaining_budget_inside_a_stage():
+    budget = StageBudget({"vision": 5})
+    assert remaining_budget() is None
+    assert 4 < budget.run("vision", remaining_budget) <= 5
+
+
+def test_overrun_raises_and_is_counted():
+    budget = StageBudget({"vision": 0.05})
+    finished = threading.Event()
+
+    def slow():
+        time.sleep(0.2)
+        finished.set()
+
+    with pytest.raises(BudgetExceeded):
+        budget.run("vision", slow)
+    assert budget.stats()["overruns"] == {"vision": 1}
+    assert finished.wait(1)  # Abandoned, not killed
+
+
+def test_errors_are_wrapped_and_counted():
+    budget = StageBudget({"validation": 1})
+
+    def broken():
+        raise ValueError("bad json")
+
+    with pytest.raises(BudgetExceeded, match="bad json"):
+        budget.run("validation", broken)
+    assert budget.stats()["errors"] == {"validation": 1}
+
+
+def test_spent_budget_stops_further_calls():
+    budget = StageBudget({"vision": 0.05})
+    outcome = []
+
+    def late_call():
+        time.sleep(0.1)
+        try:
+            remaining_budget()
+        except BudgetExceeded:
+            outcome.append("stopped")
+
+    with pytest.raises(BudgetExceeded):
+        budget.run("vision", late_call)
+    time.sleep(0.2)
+    assert outcome == ["stopped"]
+
+
+def test_run_async_cancels_on_overrun():
+    import asyncio
+    budget = StageBudget({"vision": 0.05})
+    with pytest.raises(BudgetExceeded):
+        asyncio.run(budget.run_async("vision", asyncio.sleep(1)))
+    assert budget.stats()["overruns"] == {"vision": 1}
+
+
+class SlowHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        time.sleep(1)
+        self.send_response(500)
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def slow_api():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), SlowHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+
+
+def test_calls_cut_by_the_stage_budget_do_not_open_the_breaker(slow_api):
+    pytest.importorskip("groq")
+    from transport import CircuitBreaker, GroqTransport
+    transport = GroqTransport(api_key="test", base_url=slow_api, timeout=5,
+                              breaker=CircuitBreaker(failure_threshold=1))
+    budget = StageBudget({"vision": 0.3})
+
+    def vision():
+        return transport.chat(deadline=remaining_budget(), model="m", messages=[])
+
+    for _ in range(3):
+        with pytest.raises(BudgetExceeded):
+            budget.run("vision", vision)
+    time.sleep(0.5)
+    assert transport.deadline_cuts == 3
+    assert transport.breaker.state == "closed"
+    transport.close()
@@ -0,0 +1,70 @@
+import datetime
+import json
+import os
+
+from bulk_analysis import aggregate, analyze_many
+from session_journal import LogEntry, SessionJournal, JournalReplay, TIME_FORMAT
+
+
+def write_session(directory, start, goal="Write the report", distracted_minutes=5, finished=True):
+    """A journal like a CLI run leaves, plus the analysis file written when the run ends"""
+    begin = start.timestamp()
+    journal_path = os.path.join(directory, f"focus_session_{start:%Y%m%d_%H%M%S}.jsonl")
+    journal = SessionJournal(journal_path)
+    journal.write("start", goal=goal, dynamic_rules={}, start_time=start.strftime(TIME_FORMAT))
+    work = LogEntry("VS Code", "work", begin, 0.0, True).close(begin + 1200, 1200.0)
+    distraction = LogEntry("youtube.com", "entertainment", begin + 1200, 0.0, False)
+    distraction.close(begin + 1200 + distracted_minutes * 60, distracted_minutes * 60.0)
+    for entry in (work, distraction):
+        journal.write("entry", entry=entry.to_record())
+    if finished:
+        journal.write("end")
+    journal.close()
+
+    if finished:
+        end = start + datetime.timedelta(minutes=30)
+        with open(os.path.join(directory, f"focus_session_{end:%Y%m%d_%H%M%S}.json"), "w") as f:
+            json.dump(JournalReplay(journal_path).analysis(), f)
+
+
+def test_finished_session_is_counted_once(tmp_path):
+    write_session(str(tmp_path), datetime.datetime(2024, 3, 4, 9, 0))
+    result, errors = analyze_many(str(tmp_path))
+    assert errors == {}
+    assert result["files"]["matched"] == 2
+    assert result["files"]["duplicates"] == 1
+    assert result["sessions"] == 1
+    assert result["distractions"] == 1
+    assert result["weekly_trend"][0]["sessions"] == 1
+
+
+def test_interrupted_session_counts_through_its_journal(tmp_path):
+    write_session(str(tmp_path), datetime.datetime(2024, 3, 4, 9, 0))
+    write_session(str(tmp_path), datetime.datetime(2024, 3, 5, 9, 0), finished=False)
+    result, _ = analyze_many(str(tmp_path))
+    assert result["sessions"] == 2
+    assert result["files"]["duplicates"] == 1
+
+
+def test_cached_rerun_gives_the_same_counts(tmp_path):
+    write_session(str(tmp_path), datetime.datetime(2024, 3, 4, 9, 0))
+    first, _ = analyze_many(str(tmp_path))
+    second, _ = analyze_many(str(tmp_path))
+    assert second["files"]["cached"] == 2
+    assert second["sessions"] == first["sessions"] == 1
+
+
+def summary(start, **fields):
+    return dict({"start": start.timestamp(), "goal": "g", "journal": False, "duration_minutes": 60.0,
+                 "productive_minutes": 45.0, "distracted_minutes": 15.0, "distraction_count": 1,
+                 "distraction_hours": {}, "top_distractions": {}}, **fields)
+
+
+def test_weeks_and_heatmap_use_local_time():
+    # Monday just after local midnight: still the previous UTC day east of Greenwich
+    monday = datetime.datetime(2024, 3, 4, 0, 30)
+    sunday = datetime.datetime(2024, 3, 3, 23, 30)
+    result = aggregate([summary(monday, distraction_hours={"0": 1}), summary(sunday)])
+    weeks = {week["week_start"]: week["sessions"] for week in result["weekly_trend"]}
+    assert weeks == {"2024-03-04": 1, "2024-02-26": 1}
+    assert result["heatmap"][0][0] == 1
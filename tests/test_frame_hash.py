@@ -0,0 +1,65 @@
+import pytest
+
+Image = pytest.importorskip("PIL.Image")
+
+from frame_hash import FrameDeduplicator, difference_hash, hamming_distance
+
+
+def gradient(size, brighter_left=True):
+    image = Image.linear_gradient("L").rotate(-90 if brighter_left else 90).resize(size)
+    return image.convert("RGB")
+
+
+def test_hash_of_a_box_matches_the_hash_of_the_cropped_image():
+    # A taskbar whose gradient runs the other way flips the bottom row of bits
+    frame = gradient((640, 400))
+    frame.paste(gradient((640, 40), brighter_left=False), (0, 360))
+    box = (0, 0, 640, 360)
+    box = (0, 0, 640, 380)
+    assert hamming_distance(difference_hash(frame, box=box), difference_hash(frame.crop(box))) <= 1
+    assert difference_hash(frame, box=box) != difference_hash(frame)
+
+
+@pytest.fixture
+def dedup(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr("frame_hash.time.monotonic", lambda: clock[0])
+    dedup = FrameDeduplicator(threshold=5, max_reuse_age=60)
+    dedup.clock = clock
+    return dedup
+
+
+def test_unchanged_screen_reuses_the_stored_result(dedup):
+    frame = gradient((320, 200))
+    cached, key = dedup.lookup(frame)
+    assert cached is None
+    dedup.store("reddit.com", key)
+    assert dedup.lookup(frame.copy())[0] == "reddit.com"
+    # A different screen is a miss
+    assert dedup.lookup(gradient((320, 200), brighter_left=False))[0] is None
+    assert dedup.stats() == {"hits": 1, "misses": 2, "hit_rate": 33.3}
+
+
+def test_threshold_and_max_age_bound_the_reuse(dedup):
+    frame = gradient((320, 200))
+    dedup.store("reddit.com", dedup.lookup(frame)[1])
+    dedup.threshold = -1
+    assert dedup.lookup(frame)[0] is None
+    dedup.threshold = 5
+    dedup.clock[0] += 61
+    assert dedup.lookup(frame)[0] is None
+
+
+def test_result_for_a_frame_seen_before_reset_is_dropped(dedup):
+    frame = gradient((320, 200))
+    _, key = dedup.lookup(frame)
+    dedup.reset()
+    dedup.store("stale answer", key)
+    assert dedup.lookup(frame)[0] is None
+
+
+def test_disabled_deduplicator_never_hashes(dedup, monkeypatch):
+    dedup.enabled = False
+    monkeypatch.setattr("frame_hash.difference_hash", lambda *args: pytest.fail("hashed a frame"))
+    assert dedup.lookup(gradient((32, 20))) == (None, None)
+    dedup.store("ignored", None)
@@ -0,0 +1,82 @@
+import json
+import types
+
+from goal_library import GoalProfiles, GoalRulesCache
+
+RULES = {"allowed_resources": ["docs.python.org"], "blocked_resources": ["reddit.com"], "strictness": 3}
+
+
+class GoalTransport:
+    """Returns the given rules for every goal request"""
+
+    def __init__(self, rules):
+        self.rules = rules
+        self.calls = 0
+
+    def chat(self, **kwargs):
+        self.calls += 1
+        message = types.SimpleNamespace(content=json.dumps(self.rules))
+        return types.SimpleNamespace(choices=[types.SimpleNamespace(message=message)])
+
+
+def test_goal_cache_matches_goals_ignoring_case_and_spacing(tmp_path):
+    cache = GoalRulesCache(str(tmp_path / "goals.json"))
+    cache.put("Learn  asyncio", "model-a", RULES)
+    assert cache.get("learn asyncio ", "model-a") == RULES
+    assert cache.get("learn asyncio", "model-b") is None
+    assert cache.stats() == {"hits": 1, "misses": 1, "entries": 1}
+
+    reloaded = GoalRulesCache(str(tmp_path / "goals.json"))
+    assert reloaded.get("LEARN ASYNCIO", "model-a") == RULES
+
+
+def test_goal_cache_evicts_the_least_recently_used_goal(tmp_path, monkeypatch):
+    now = [1000]
+    monkeypatch.setattr("goal_library.time.time", lambda: now[0])
+    cache = GoalRulesCache(str(tmp_path / "goals.json"), max_entries=2)
+    cache.put("first", "m", RULES)
+    now[0] += 1
+    cache.put("second", "m", RULES)
+    now[0] += 1
+    cache.get("first", "m")
+    now[0] += 1
+    cache.put("third", "m", RULES)
+    assert cache.get("second", "m") is None
+    assert cache.get("first", "m") == RULES and cache.get("third", "m") == RULES
+
+
+def test_goal_cache_survives_a_corrupt_file(tmp_path):
+    path = tmp_path / "goals.json"
+    path.write_text("{not json")
+    cache = GoalRulesCache(str(path))
+    assert cache.entries == {}
+    cache.put("goal", "m", RULES)
+    assert json.loads(path.read_text())["entries"]
+
+
+def test_profiles_are_compiled_on_load_and_saved(tmp_path):
+    path = str(tmp_path / "profiles.json")
+    GoalProfiles(path).save_profile("python", "Learn asyncio", RULES)
+    profiles = GoalProfiles(path)
+    assert profiles.names() == ["python"]
+    goal, rules, engine = profiles.get("python")
+    assert (goal, rules) == ("Learn asyncio", RULES)
+    assert engine.decide({"name": "reddit.com", "content": "r/aww"})["allowed"] is False
+    assert profiles.get("missing") is None
+
+
+def test_no_goal_cache_refreshes_the_cached_rules(guardian, tmp_path):
+    from procrastination_preventer import GOAL_MODEL
+    guardian.goal_cache = GoalRulesCache(str(tmp_path / "goals.json"))
+    guardian.goal_cache.put("Learn asyncio", GOAL_MODEL, {"allowed_resources": ["stale.example"]})
+    guardian.transport = GoalTransport(RULES)
+
+    guardian.parse_user_goal("Learn asyncio")
+    assert (guardian.goal_rules_source, guardian.transport.calls) == ("cache", 0)
+
+    guardian.refresh_goal_rules = True
+    guardian.parse_user_goal("Learn asyncio")
+    assert (guardian.goal_rules_source, guardian.dynamic_rules, guardian.transport.calls) == ("llm", RULES, 1)
+
+    # The fresh rules replaced the bad ones for the next normal run
+    assert GoalRulesCache(str(tmp_path / "goals.json")).get("learn asyncio", GOAL_MODEL) == RULES
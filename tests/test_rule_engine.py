@@ -0,0 +1,101 @@
+import pytest
+
+from rule_engine import DomainTrie, RuleEngine, domain_stem, extract_domain
+
+ML_RULES = {
+    "allowed_resources": ["youtube.com", "VS Code"],
+    "allowed_purposes": {"youtube.com": "machine learning tutorials"},
+    "content_rules": {"youtube.com": "Video titles must contain ML/AI keywords"},
+    "blocked_resources": ["netflix.com", "Steam"],
+    "strictness": 4
+}
+
+
+def decide(rules, name, content=""):
+    return RuleEngine(rules).decide({"name": name, "content": content})
+
+
+@pytest.mark.parametrize("name, domain", [
+    ("https://www.youtube.com/watch?v=1", "youtube.com"),
+    ("m.youtube.com", "m.youtube.com"),
+    ("VS Code - main.py", None),
+    ("Slack", None),
+])
+def test_extract_domain(name, domain):
+    assert extract_domain(name) == domain
+
+
+@pytest.mark.parametrize("domain, stem", [
+    ("twitter.com", "twitter"),
+    ("mobile.twitter.com", "twitter"),
+    ("bbc.co.uk", "bbc"),
+])
+def test_domain_stem(domain, stem):
+    assert domain_stem(domain) == stem
+
+
+def test_domain_trie_matches_longest_suffix():
+    trie = DomainTrie()
+    trie.insert("google.com", "google")
+    trie.insert("docs.google.com", "docs")
+    assert trie.match("docs.google.com") == "docs"
+    assert trie.match("mail.google.com") == "google"
+    assert trie.match("notgoogle.com") is None
+
+
+def test_allowed_app_without_content_rules():
+    assert decide(ML_RULES, "VS Code")["allowed"] is True
+
+
+@pytest.mark.parametrize("content", [
+    "Machine Learning tutorial: transformers explained",
+    "ML tutorial for machine vision",
+])
+def test_content_matching_the_purpose_is_allowed_locally(content):
+    verdict = decide(ML_RULES, "youtube.com", content)
+    assert verdict["allowed"] is True and verdict["local"] is True
+
+
+@pytest.mark.parametrize("content", [
+    "Learning to play guitar",
+    "AI generated funny cats",
+    "",
+])
+def test_a_single_shared_keyword_escalates_to_the_llm(content):
+    assert decide(ML_RULES, "youtube.com", content) is None
+
+
+def test_lenient_goals_allow_any_use_of_an_allowed_resource():
+    assert decide(dict(ML_RULES, strictness=2), "youtube.com", "Learning to play guitar")["allowed"] is True
+
+
+def test_strictness_three_needs_two_keywords():
+    rules = dict(ML_RULES, strictness=3)
+    assert decide(rules, "youtube.com", "Learning to play guitar") is None
+    assert decide(rules, "youtube.com", "Machine learning for musicians")["allowed"] is True
+
+
+def test_blocked_resources_are_denied_locally():
+    assert decide(ML_RULES, "www.netflix.com")["allowed"] is False
+    assert decide(ML_RULES, "Steam")["allowed"] is False
+    assert decide(ML_RULES, "store.steam.com")["allowed"] is False
+
+
+def test_unknown_sites_escalate_instead_of_a_builtin_denylist():
+    assert decide(ML_RULES, "reddit.com") is None
+    assert decide({}, "twitter.com") is None
+
+
+def test_app_name_resource_allows_its_domain():
+    rules = {"allowed_resources": ["Twitter"], "blocked_resources": ["twitter.com"]}
+    assert decide(rules, "twitter.com")["allowed"] is True
+    assert decide(rules, "mobile.twitter.com")["allowed"] is True
+
+
+def test_stats_and_counters_carry_over():
+    engine = RuleEngine(ML_RULES)
+    engine.decide({"name": "VS Code"})
+    engine.decide({"name": "netflix.com"})
+    engine.decide({"name": "reddit.com"})
+    assert engine.stats() == {"local_allows": 1, "local_denies": 1, "escalated": 1, "local_ratio": 66.7}
+    assert RuleEngine({}).take_counters(engine).stats() == engine.stats()
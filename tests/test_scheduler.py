@@ -0,0 +1,97 @@
+import threading
+import time
+
+import pytest
+
+import scheduler
+from scheduler import AdaptiveScheduler, TickScheduler
+
+
+class FakeClock:
+    def __init__(self, now=100.0):
+        self.now = now
+
+    def monotonic(self):
+        return self.now
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(scheduler, "time", clock)
+    return clock
+
+
+def test_first_tick_is_immediate(clock):
+    ticks = TickScheduler(2)
+    assert ticks.next_delay() == 0.0
+    assert ticks.ticks == 1
+
+
+def test_deadlines_advance_from_previous_deadline(clock):
+    ticks = TickScheduler(2)
+    ticks.next_delay()
+    clock.now += 0.5  # Analysis took half a second
+    assert ticks.next_delay() == pytest.approx(1.5)
+    assert ticks.late_ticks == 0
+
+
+def test_progress_fills_while_waiting_for_next_tick(clock):
+    ticks = TickScheduler(2)
+    assert ticks.progress() == 0.0
+    ticks.next_delay()
+    clock.now += 0.5
+    ticks.next_delay()  # What wait() does before sleeping until 102
+    assert ticks.progress() == pytest.approx(0.25)
+    clock.now += 1.0
+    assert ticks.progress() == pytest.approx(0.75)
+    clock.now += 5.0
+    assert ticks.progress() == 1.0
+
+
+def test_overrun_skips_missed_periods(clock):
+    ticks = TickScheduler(1)
+    ticks.next_delay()
+    clock.now += 3.5  # Deadlines at 101, 102 and 103 all passed
+    assert ticks.next_delay() == 0.0
+    assert ticks.late_ticks == 1
+    assert ticks.skipped_ticks == 2
+    assert ticks.stats()["max_lateness_seconds"] == 2.5
+    # Back on the original grid rather than bursting to catch up
+    clock.now += 0.2
+    assert ticks.next_delay() == pytest.approx(0.3)
+
+
+def test_stop_wakes_a_waiter():
+    ticks = TickScheduler(30)
+    ticks.wait()
+    threading.Timer(0.05, ticks.stop).start()
+    started = time.monotonic()
+    assert ticks.wait() is False
+    assert time.monotonic() - started < 5
+    assert ticks.stopped
+
+
+def test_stable_screen_backs_off_to_max_interval(clock):
+    adaptive = AdaptiveScheduler(10, max_interval=40)
+    assert adaptive.observe("vscode", False) == 10  # First frame counts as a change
+    assert adaptive.observe("vscode", False) == 20
+    assert adaptive.observe("vscode", False) == 40
+    assert adaptive.observe("vscode", False) == 40
+    assert adaptive.observe("github", False) == 10
+
+
+def test_distraction_is_confirmed_by_a_burst(clock):
+    adaptive = AdaptiveScheduler(10, burst_interval=2, burst_length=2)
+    assert adaptive.observe("youtube", True) == 2
+    assert not adaptive.distraction_confirmed
+    assert adaptive.observe("youtube", True) == 10
+    assert adaptive.distraction_confirmed
+    adaptive.observe("vscode", False)
+    assert not adaptive.distraction_confirmed
+    assert adaptive.stats()["decisions"] == {
+        "confirming_distraction": 1, "distraction_confirmed": 1, "activity_changed": 1
+    }
@@ -0,0 +1,53 @@
+import base64
+import io
+
+import pytest
+
+Image = pytest.importorskip("PIL.Image")
+
+from screen_encoder import ScreenEncoder, crop_box
+
+
+def screen(size=(2560, 1440)):
+    """A frame with a bright taskbar strip so its presence shows in the output"""
+    image = Image.linear_gradient("L").resize(size).convert("RGB")
+    image.paste((255, 255, 255), (0, int(size[1] * 0.95), size[0], size[1]))
+    return image
+
+
+def decode(data_url):
+    header, payload = data_url.split(",", 1)
+    return header, Image.open(io.BytesIO(base64.b64decode(payload)))
+
+
+def test_crop_box_leaves_out_the_bottom_fraction():
+    assert crop_box((1920, 1080)) == (0, 0, 1920, 1026)
+    assert crop_box((1000, 1000), bottom_fraction=0.1) == (0, 0, 1000, 900)
+
+
+def test_encode_downscales_the_box_without_copying_the_frame(monkeypatch):
+    frame = screen()
+    monkeypatch.setattr(Image.Image, "crop", lambda *args: pytest.fail("cropped a full-size copy"))
+    header, decoded = decode(ScreenEncoder(max_long_edge=1280).encode(frame, crop_box(frame.size)))
+    assert header == "data:image/jpeg;base64"
+    assert decoded.size == (1280, 684)
+    # The taskbar strip was left out
+    assert decoded.convert("L").getpixel((640, 683)) < 250
+
+
+def test_encode_without_downscaling_keeps_the_box_at_full_size():
+    frame = screen((800, 600))
+    _, decoded = decode(ScreenEncoder(image_format="PNG").encode(frame, crop_box(frame.size)))
+    assert decoded.size == (800, 570)
+    _, decoded = decode(ScreenEncoder(image_format="PNG").encode(frame))
+    assert decoded.size == (800, 600)
+
+
+def test_encode_stats():
+    encoder = ScreenEncoder(image_format="webp", max_long_edge=0)
+    encoder.encode(screen((320, 200)))
+    stats = encoder.stats()
+    assert (stats["format"], stats["frames_encoded"]) == ("WEBP", 1)
+    assert stats["avg_payload_kb"] > 0
+    with pytest.raises(ValueError):
+        ScreenEncoder(image_format="BMP")
@@ -0,0 +1,105 @@
+import datetime
+import json
+import time
+
+import pytest
+
+from session_journal import JournalReplay, LogEntry, SessionJournal, TIME_FORMAT
+
+
+def write_records(path, records):
+    with open(path, "w", encoding="utf-8") as f:
+        for record in records:
+            f.write(json.dumps(record) + "\n")
+
+
+def entry_record(name, start, minutes, productive=True):
+    entry = LogEntry(name, "work" if productive else "entertainment", start, 0.0, productive)
+    return {"type": "entry", "t": start + minutes * 60, "entry": entry.close(start + minutes * 60, minutes * 60.0).to_record()}
+
+
+def interrupted_journal(path, now, crashed_minutes_ago=50):
+    """A session started an hour ago that crashed crashed_minutes_ago, with one closed entry"""
+    start = now - 3600
+    crash = now - crashed_minutes_ago * 60
+    write_records(path, [
+        {"type": "start", "t": start, "goal": "Write the report", "dynamic_rules": {"strictness": 3},
+         "start_time": datetime.datetime.fromtimestamp(start).strftime(TIME_FORMAT)},
+        entry_record("VS Code", start, (crash - start) / 60),
+    ])
+    return start, crash
+
+
+def test_log_entry_round_trips_through_a_record():
+    entry = LogEntry("VS Code", "work", 1000.0, 5.0, True).close(1060.0, 65.0)
+    copy = LogEntry.from_record(entry.to_record())
+    assert (copy.name, copy.kind, copy.start, copy.end, copy.duration, copy.productive) == \
+        ("VS Code", "work", 1000.0, 1060.0, 60.0, True)
+
+
+def test_replay_rebuilds_totals_and_skips_torn_records(tmp_path):
+    path = str(tmp_path / "s.jsonl")
+    start = time.time() - 600
+    journal = SessionJournal(path)
+    journal.write("start", goal="Write the report", dynamic_rules={},
+                  start_time=datetime.datetime.fromtimestamp(start).strftime(TIME_FORMAT))
+    for record in (entry_record("VS Code", start, 5)["entry"],
+                   entry_record("youtube.com", start + 300, 2, productive=False)["entry"]):
+        journal.write("entry", entry=record)
+    journal.close()
+    with open(path, "a") as f:
+        f.write('{"type": "entry", "t": 1')  # Crash mid-write
+
+    replay = JournalReplay(path)
+    assert replay.torn_records == 1
+    assert not replay.ended
+    assert replay.totals.entries == 2
+    summary = replay.analysis()
+    assert summary["time_distribution"]["productive_minutes"] == 5.0
+    assert summary["session_summary"]["distraction_count"] == 1
+    assert summary["journal"]["interrupted"] is True
+
+
+def test_replay_excludes_downtime_before_each_resume(tmp_path):
+    path = str(tmp_path / "s.jsonl")
+    now = time.time()
+    start, crash = interrupted_journal(path, now)
+    with open(path, "a") as f:
+        f.write(json.dumps({"type": "resume", "t": now}) + "\n")
+        f.write(json.dumps({"type": "end", "t": now + 600}) + "\n")
+
+    replay = JournalReplay(path)
+    assert replay.paused_seconds == pytest.approx(now - crash)
+    assert replay.last_record_time == now + 600
+    # 70 minutes of wall time minus 50 minutes down
+    assert replay.analysis()["session_summary"]["duration_minutes"] == 20.0
+
+
+def test_profile_switch_record_updates_goal(tmp_path):
+    path = str(tmp_path / "s.jsonl")
+    interrupted_journal(path, time.time())
+    with open(path, "a") as f:
+        f.write(json.dumps({"type": "goal", "t": time.time(), "goal": "Review PRs",
+                            "dynamic_rules": {"strictness": 2}}) + "\n")
+    replay = JournalReplay(path)
+    assert (replay.goal, replay.dynamic_rules) == ("Review PRs", {"strictness": 2})
+
+
+def test_replay_needs_a_start_record(tmp_path):
+    path = str(tmp_path / "s.jsonl")
+    write_records(path, [{"type": "end", "t": time.time()}])
+    with pytest.raises(ValueError):
+        JournalReplay(path)
+
+
+def test_resume_excludes_time_since_the_crash(tmp_path, guardian):
+    path = str(tmp_path / "s.jsonl")
+    interrupted_journal(path, time.time(), crashed_minutes_ago=50)
+
+    guardian.resume_session(path)
+    assert guardian.paused_seconds == pytest.approx(3000, abs=5)
+    analysis = guardian.generate_session_analysis()
+    guardian.journal.close()
+    # An hour since the start, 50 minutes of it down
+    assert analysis["session_summary"]["duration_minutes"] == pytest.approx(10.0, abs=0.2)
+    assert JournalReplay(path).paused_seconds == pytest.approx(3000, abs=5)
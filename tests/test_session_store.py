@@ -0,0 +1,78 @@
+import json
+
+from session_store import SessionStore
+
+
+def legacy_session(start, minutes, distractions=()):
+    return {"start": start, "end": start, "goal": "Write the report", "total_time": minutes * 60,
+            "distractions": [{"time": t, "domains": "youtube.com"} for t in distractions]}
+
+
+def test_migrates_sessions_json_once(tmp_path):
+    legacy = tmp_path / "sessions.json"
+    legacy.write_text(json.dumps([
+        legacy_session("2026-01-01 09:00:00", 30, ["2026-01-01 09:10:00"]),
+        legacy_session("2026-01-02 09:00:00", 60),
+    ]))
+    store = SessionStore(str(tmp_path / "sessions.db"), str(legacy))
+    assert (store.migrated, store.migration_error, store.count()) == (2, None, 2)
+    first = store.session_summaries()[0]
+    assert first["distraction_count"] == 1
+    assert store.distractions(first["id"]) == [{"time": "2026-01-01 09:10:00", "domains": "youtube.com"}]
+    store.close()
+
+    reopened = SessionStore(str(tmp_path / "sessions.db"), str(legacy))
+    assert (reopened.migrated, reopened.count()) == (0, 2)
+    reopened.close()
+
+
+def test_malformed_sessions_json_still_opens_the_database(tmp_path):
+    legacy = tmp_path / "sessions.json"
+    legacy.write_text("[{\"start\": \"2026-01-01 09:00:00\",")
+    store = SessionStore(str(tmp_path / "sessions.db"), str(legacy))
+    assert store.migrated == 0
+    assert isinstance(store.migration_error, ValueError)
+
+    # New sessions are still saved, and the import is retried once the file is fixed
+    session = legacy_session("2026-02-01 09:00:00", 10)
+    store.end_session(store.begin_session(session), session)
+    assert store.count() == 1
+    store.close()
+    legacy.write_text(json.dumps([legacy_session("2026-01-01 09:00:00", 30)]))
+    reopened = SessionStore(str(tmp_path / "sessions.db"), str(legacy))
+    assert (reopened.migrated, reopened.migration_error, reopened.count()) == (1, None, 2)
+    reopened.close()
+
+
+def test_session_missing_its_start_rolls_back_the_whole_import(tmp_path):
+    legacy = tmp_path / "sessions.json"
+    legacy.write_text(json.dumps([legacy_session("2026-01-01 09:00:00", 30), {"end": "2026-01-02 10:00:00"}]))
+    store = SessionStore(str(tmp_path / "sessions.db"), str(legacy))
+    assert isinstance(store.migration_error, KeyError)
+    assert store.count() == 0
+    store.close()
+
+
+def test_aggregates_backfill_from_history_then_update_per_session(tmp_path):
+    legacy = tmp_path / "sessions.json"
+    legacy.write_text(json.dumps([
+        legacy_session("2026-01-01 09:00:00", 40, ["2026-01-01 09:10:00"]),
+        legacy_session("2026-01-02 09:00:00", 35),
+    ]))
+    store = SessionStore(str(tmp_path / "sessions.db"), str(legacy))
+    assert store.aggregates() == {"sessions": 2, "total_focused_time": 75 * 60, "longest_streak": 0,
+                                  "no_distraction_1h": False, "perfect_session": True}
+
+    session = legacy_session("2026-01-03 09:00:00", 70)
+    aggregates = store.end_session(store.begin_session(session), session, streak=4000)
+    assert aggregates == {"sessions": 3, "total_focused_time": 145 * 60, "longest_streak": 4000,
+                          "no_distraction_1h": True, "perfect_session": True}
+
+    # A shorter streak later never lowers the record, and the totals survive a restart
+    session = legacy_session("2026-01-04 09:00:00", 5, ["2026-01-04 09:01:00"])
+    store.end_session(store.begin_session(session), session, streak=60)
+    store.close()
+    reopened = SessionStore(str(tmp_path / "sessions.db"), str(legacy))
+    assert reopened.aggregates()["longest_streak"] == 4000
+    assert reopened.aggregates()["total_focused_time"] == 150 * 60
+    reopened.close()
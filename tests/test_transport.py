@@ -0,0 +1,154 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+pytest.importorskip("groq")
+
+import httpx
+
+from transport import CircuitBreaker, GroqTransport, TransportDegraded, is_retryable, retry_after_seconds
+
+COMPLETION = {
+    "id": "chatcmpl-test", "object": "chat.completion", "created": 0, "model": "m",
+    "choices": [{"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": "{}"}}],
+    "usage": {"prompt_tokens": 7, "completion_tokens": 3, "total_tokens": 10}
+}
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("transport.time.monotonic", lambda: now[0])
+    return now
+
+
+def status_error(status, headers=None):
+    import groq
+    request = httpx.Request("POST", "http://api.test/chat")
+    response = httpx.Response(status, headers=headers or {}, request=request)
+    return groq.APIStatusError("error", response=response, body=None)
+
+
+def test_breaker_opens_after_the_threshold_and_lets_one_probe_through(clock):
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30)
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert (breaker.state, breaker.trips, breaker.allow()) == ("open", 1, False)
+
+    clock[0] += 30
+    assert breaker.state == "half_open"
+    assert breaker.allow()
+    assert not breaker.allow()  # Only one probe at a time
+    breaker.record_success()
+    assert (breaker.state, breaker.allow()) == ("closed", True)
+
+
+def test_failed_probe_reopens_the_breaker(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30)
+    breaker.record_failure()
+    clock[0] += 30
+    assert breaker.allow()
+    breaker.record_failure()
+    assert (breaker.state, breaker.trips) == ("open", 1)
+    clock[0] += 29
+    assert not breaker.allow()
+
+
+def test_abandoned_probe_is_replaced_after_another_cool_down(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30)
+    breaker.record_failure()
+    clock[0] += 30
+    assert breaker.allow()
+    clock[0] += 30
+    assert breaker.allow()
+
+
+def test_retry_policy():
+    import groq
+    request = httpx.Request("POST", "http://api.test/chat")
+    assert is_retryable(groq.APITimeoutError(request))
+    assert is_retryable(status_error(429)) and is_retryable(status_error(503))
+    assert not is_retryable(status_error(400)) and not is_retryable(ValueError())
+    assert retry_after_seconds(status_error(429, {"retry-after": "2"})) == 2.0
+    assert retry_after_seconds(status_error(429, {"retry-after-ms": "250"})) == 0.25
+    assert retry_after_seconds(status_error(429)) is None
+
+
+class ScriptedHandler(BaseHTTPRequestHandler):
+    """Answers each POST with the next (status, headers) from the server's script, then 200"""
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        status, headers = self.server.script.pop(0) if self.server.script else (200, {})
+        body = json.dumps(COMPLETION if status == 200 else {"error": {"message": "scripted"}}).encode()
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        self.server.requests += 1
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def api():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), ScriptedHandler)
+    server.script = []
+    server.requests = 0
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    server.url = f"http://127.0.0.1:{server.server_address[1]}"
+    yield server
+    server.shutdown()
+
+
+def transport_for(api, **kwargs):
+    return GroqTransport(api_key="test", base_url=api.url, timeout=5, backoff_base=0.01, **kwargs)
+
+
+def test_retries_server_errors_then_succeeds(api):
+    api.script = [(500, {}), (429, {"retry-after-ms": "10"})]
+    transport = transport_for(api)
+    response = transport.chat(model="m", messages=[])
+    assert response.choices[0].message.content == "{}"
+    stats = transport.stats()
+    assert (stats["calls"], stats["retries"], stats["failures"], stats["prompt_tokens"]) == (1, 2, 0, 7)
+    assert (api.requests, stats["state"]) == (3, "closed")
+    transport.close()
+
+
+def test_client_errors_are_not_retried_or_held_against_the_api(api):
+    import groq
+    api.script = [(400, {})]
+    transport = transport_for(api, breaker=CircuitBreaker(failure_threshold=1))
+    with pytest.raises(groq.BadRequestError):
+        transport.chat(model="m", messages=[])
+    assert (api.requests, transport.retries, transport.failures, transport.breaker.state) == (1, 0, 1, "closed")
+    transport.close()
+
+
+def test_open_breaker_short_circuits_without_calling_the_api(api):
+    api.script = [(503, {})]
+    transport = transport_for(api, max_retries=0, breaker=CircuitBreaker(failure_threshold=1))
+    with pytest.raises(Exception):
+        transport.chat(model="m", messages=[])
+    with pytest.raises(TransportDegraded):
+        transport.chat(model="m", messages=[])
+    assert (api.requests, transport.short_circuits, transport.degraded) == (1, 1, True)
+    transport.close()
+
+
+def test_async_chat_retries_like_chat(api):
+    import asyncio
+    api.script = [(502, {})]
+    transport = transport_for(api)
+    response = asyncio.run(transport.achat(model="m", messages=[]))
+    assert response.usage.completion_tokens == 3
+    assert (api.requests, transport.retries) == (2, 1)
+    transport.close()
@@ -0,0 +1,73 @@
+import pytest
+
+from verdict_cache import VerdictCache
+
+GOAL = "Learn asyncio"
+RULES = {"allowed_resources": ["docs.python.org"]}
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("verdict_cache.time.time", lambda: now[0])
+    return now
+
+
+def test_key_ignores_case_and_spacing_but_not_the_rules():
+    cache = VerdictCache()
+    key = cache.make_key({"name": "YouTube", "content": "Asyncio  tutorial"}, GOAL, RULES)
+    assert key == cache.make_key({"name": "youtube ", "content": "asyncio tutorial"}, GOAL, RULES)
+    assert key != cache.make_key({"name": "youtube", "content": "asyncio tutorial"}, GOAL, {})
+
+
+def test_entries_expire_after_the_ttl(clock):
+    cache = VerdictCache(ttl=60)
+    cache.put("k", {"allowed": True}, elapsed=0.5)
+    clock[0] += 60
+    assert cache.get("k") == {"allowed": True}
+    clock[0] += 1
+    assert cache.get("k") is None
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+    assert cache.stats()["latency_saved_seconds"] == 0.5
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = VerdictCache(max_entries=2)
+    cache.put("a", {"allowed": True})
+    cache.put("b", {"allowed": False})
+    cache.get("a")
+    cache.put("c", {"allowed": True})
+    assert cache.get("b") is None
+    assert cache.get("a") and cache.get("c")
+
+
+def test_returned_verdicts_are_copies():
+    cache = VerdictCache()
+    cache.put("k", {"allowed": True})
+    cache.get("k")["allowed"] = False
+    assert cache.get("k") == {"allowed": True}
+
+
+def test_persists_and_drops_expired_entries_on_load(tmp_path, clock):
+    path = str(tmp_path / "verdicts.json")
+    cache = VerdictCache(ttl=60, path=path, save_every=2)
+    cache.put("old", {"allowed": False})
+    clock[0] += 30
+    cache.put("new", {"allowed": True})  # Second put triggers the save
+    clock[0] += 45
+    reloaded = VerdictCache(ttl=60, path=path)
+    assert reloaded.get("old") is None
+    assert reloaded.get("new") == {"allowed": True}
+
+
+def test_zero_size_disables_the_cache():
+    cache = VerdictCache(max_entries=0)
+    cache.put("k", {"allowed": True})
+    assert cache.get("k") is None
+    assert cache.misses == 0
+
+
+def test_corrupt_file_starts_empty(tmp_path):
+    path = tmp_path / "verdicts.json"
+    path.write_text("not json")
+    assert VerdictCache(path=str(path)).get("k") is None